@@ -5,7 +5,8 @@ Multi-page Streamlit application for real-time stock analysis
 
 import streamlit as st
 from multiapp import MultiApp
-from apps import home, financeDashboard, prediction
+from apps.utils import start_background_prefetch
+from apps.instrumentation import start_metrics_server
 
 # Configure page layout
 st.set_page_config(
@@ -15,13 +16,20 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Warm the price store for all configured tickers without blocking the first render
+start_background_prefetch()
+
+# Export span and cache metrics on METRICS_PORT (no-op when unset)
+start_metrics_server()
+
 # Initialize the multi-app framework
 app = MultiApp()
 
-# Register all application pages
-app.add_app("Home", home.app)
-app.add_app("Finance Dashboard", financeDashboard.app)
-app.add_app("Prediction", prediction.app)
+# Register all application pages (each module is imported when its page is first opened)
+app.add_app("Home", "apps.home")
+app.add_app("Finance Dashboard", "apps.financeDashboard")
+app.add_app("Prediction", "apps.prediction")
+app.add_app("Screener", "apps.screener")
 
 # Run the application
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""
+Batch Forecasts - Nightly precomputation of Prophet forecasts for all configured tickers
+
+Usage (from the finaltest2 folder):
+    python -m apps.batch_forecast [--tickers GOOG MSFT] [--workers 4] [--max-months 12]
+"""
+
+import os
+import json
+import argparse
+import itertools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from apps.datastore import DATA_DIR, PriceStore, safe_ticker_name
+
+logger = logging.getLogger(__name__)
+
+# Same training window as the Prediction page
+START_DATE = "2015-01-01"
+
+# Longest horizon offered by the Prediction page slider (months of 30 days)
+MAX_FORECAST_MONTHS = 12
+
+# Artifacts older than this are refit even if no new bar has arrived
+MAX_ARTIFACT_AGE = timedelta(hours=36)
+
+SEASONALITY_COMBINATIONS: List[Tuple[bool, bool]] = list(itertools.product([True, False], repeat=2))
+
+
+def artifact_paths(ticker: str, yearly_seasonality: bool, weekly_seasonality: bool,
+                   data_dir: Optional[str] = None) -> Tuple[str, str]:
+    """Paths of the forecast artifact and its metadata for one ticker and flag combination"""
+    name = f"{safe_ticker_name(ticker)}_y{int(yearly_seasonality)}w{int(weekly_seasonality)}"
+    folder = os.path.join(data_dir or DATA_DIR, "forecasts")
+    return os.path.join(folder, f"{name}.parquet"), os.path.join(folder, f"{name}.json")
+
+
+def precompute_forecast(ticker: str, yearly_seasonality: bool, weekly_seasonality: bool,
+                        horizon_days: int, end_date: str, data_dir: Optional[str] = None) -> str:
+    """
+    Fit a model and write a forecast artifact covering the longest horizon
+
+    Shorter horizons are served as prefixes of this artifact. Runs inside a
+    worker process; the fitted model also lands in the on-disk model cache.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        yearly_seasonality (bool): Enable yearly seasonality
+        weekly_seasonality (bool): Enable weekly seasonality
+        horizon_days (int): Number of future days to predict
+        end_date (str): Training data end in YYYY-MM-DD format (exclusive)
+        data_dir (str): Root data folder
+
+    Returns:
+        str: Path of the written artifact
+    """
+    from apps.model_cache import ProphetModelCache, get_or_fit_model
+
+    data = PriceStore(root=data_dir).get_range(ticker, START_DATE, end_date)[['Date', 'Close']]
+    model = get_or_fit_model(ticker, data, yearly_seasonality, weekly_seasonality,
+                             cache=ProphetModelCache(root=data_dir))
+    forecast = model.predict(model.make_future_dataframe(periods=horizon_days))
+
+    # Compact artifact: every forecast column (components included, for plotting) in float32
+    artifact = forecast.astype({column: np.float32 for column in forecast.columns if column != 'ds'})
+
+    path, meta_path = artifact_paths(ticker, yearly_seasonality, weekly_seasonality, data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    artifact.to_parquet(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    with open(meta_path, "w") as f:
+        json.dump({
+            "ticker": ticker,
+            "trained_through": data['Date'].max().strftime("%Y-%m-%d"),
+            "horizon_days": horizon_days,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }, f)
+    return path
+
+
+def load_precomputed_forecast(ticker: str, periods: int, trained_through: str, yearly_seasonality: bool = True,
+                              weekly_seasonality: bool = True, data_dir: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Serve a precomputed forecast if one exists for this exact request and is fresh
+
+    Args:
+        ticker (str): Stock ticker symbol
+        periods (int): Number of days to forecast
+        trained_through (str): Last training date the caller would fit on (YYYY-MM-DD)
+        yearly_seasonality (bool): Enable yearly seasonality
+        weekly_seasonality (bool): Enable weekly seasonality
+        data_dir (str): Root data folder
+
+    Returns:
+        Optional[pd.DataFrame]: Prophet forecast frame, or None if missing or stale
+    """
+    path, meta_path = artifact_paths(ticker, yearly_seasonality, weekly_seasonality, data_dir)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta["trained_through"] != trained_through or periods > meta["horizon_days"]:
+            return None
+        if datetime.now() - datetime.fromisoformat(meta["created_at"]) > MAX_ARTIFACT_AGE:
+            return None
+        artifact = pd.read_parquet(path)
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+
+    n_rows = len(artifact) - meta["horizon_days"] + periods
+    forecast = artifact.iloc[:n_rows]
+    return forecast.astype({column: np.float64 for column in forecast.columns if column != 'ds'})
+
+
+def run_batch(tickers: Iterable[str], max_months: int = MAX_FORECAST_MONTHS, workers: Optional[int] = None,
+              data_dir: Optional[str] = None) -> List[str]:
+    """
+    Precompute forecasts for every ticker x seasonality combination in parallel
+
+    Args:
+        tickers (Iterable[str]): Ticker symbols
+        max_months (int): Longest horizon in months (shorter ones are prefixes)
+        workers (int): Number of worker processes (defaults to all cores)
+        data_dir (str): Root data folder
+
+    Returns:
+        List[str]: Paths of the written artifacts
+    """
+    tickers = list(tickers)
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    PriceStore(root=data_dir).update_many(tickers)
+
+    jobs = [(ticker, yearly, weekly) for ticker in tickers for yearly, weekly in SEASONALITY_COMBINATIONS]
+    written = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {
+            executor.submit(precompute_forecast, ticker, yearly, weekly, max_months * 30, end_date, data_dir): job
+            for ticker, yearly, weekly in jobs
+        }
+        for future in as_completed(futures):
+            ticker, yearly, weekly = futures[future]
+            try:
+                written.append(future.result())
+                logger.info(f"Precomputed {ticker} (yearly={yearly}, weekly={weekly})")
+            except Exception as e:
+                logger.error(f"Batch forecast failed for {ticker} (yearly={yearly}, weekly={weekly}): {str(e)}")
+    return written
+
+
+def main() -> None:
+    from apps.utils import STOCK_TICKER_MAP
+
+    parser = argparse.ArgumentParser(description="Precompute Prophet forecasts for the dashboard")
+    parser.add_argument('--tickers', nargs='+', default=list(STOCK_TICKER_MAP.values()))
+    parser.add_argument('--max-months', type=int, default=MAX_FORECAST_MONTHS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--data-dir', default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    written = run_batch(args.tickers, args.max_months, args.workers, args.data_dir)
+    print(f"Wrote {len(written)} of {len(args.tickers) * len(SEASONALITY_COMBINATIONS)} forecast artifacts")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Compact Frames - Typed array storage for cached OHLCV histories, expanded to DataFrames only when rendered
+
+Per column:
+    prices   float32 holding values rounded to PRICE_DECIMALS (float64 kept when float32 cannot hold them exactly)
+    volumes  integers divided by a common power-of-ten scale, int32 when they fit, else int64
+    colors   boolean mask for two-valued 'red'/'green' columns (True = red)
+    labels   category codes for other text columns
+    dates    int64 epoch days (epoch nanoseconds for intraday timestamps)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Decimal places tried, in order, when storing a float column as float32
+PRICE_DECIMALS = (4, 2)
+
+# Largest power-of-ten divisor tried for integer volume columns
+MAX_VOLUME_SCALE = 10 ** 6
+
+COLOR_VALUES = ('green', 'red')
+
+_NS_PER_DAY = 86_400 * 10 ** 9
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+@dataclass
+class CompactColumn:
+    """
+    One stored column and how to expand it
+
+    Attributes:
+        kind (str): 'float', 'scaled', 'color', 'category' or 'raw'
+        values (np.ndarray): Stored array
+        decimals (int): Rounding applied to 'float' columns (None when stored as float64)
+        scale (int): Multiplier restoring 'scaled' columns
+        categories (tuple): Labels of 'category' codes
+    """
+    kind: str
+    values: np.ndarray
+    decimals: Optional[int] = None
+    scale: int = 1
+    categories: Tuple = ()
+
+    def take(self, lo: int, hi: int) -> "CompactColumn":
+        return CompactColumn(self.kind, self.values[lo:hi], self.decimals, self.scale, self.categories)
+
+    def expand(self) -> np.ndarray:
+        """Rebuild the original-width array"""
+        if self.kind == 'float':
+            values = self.values.astype(np.float64)
+            return values if self.decimals is None else np.round(values, self.decimals)
+        if self.kind == 'scaled':
+            return self.values.astype(np.int64) * self.scale
+        if self.kind == 'color':
+            return np.where(self.values, COLOR_VALUES[1], COLOR_VALUES[0]).astype(object)
+        if self.kind == 'category':
+            return pd.Categorical.from_codes(self.values, self.categories).to_numpy(dtype=object)
+        return self.values
+
+
+def _pack_float(values: np.ndarray) -> CompactColumn:
+    values = values.astype(np.float64, copy=False)
+    for decimals in PRICE_DECIMALS:
+        rounded = np.round(values, decimals)
+        packed = rounded.astype(np.float32)
+        if np.array_equal(np.round(packed.astype(np.float64), decimals), rounded, equal_nan=True):
+            return CompactColumn('float', packed, decimals=decimals)
+    return CompactColumn('float', values)
+
+
+def _pack_integer(values: np.ndarray) -> CompactColumn:
+    values = values.astype(np.int64, copy=False)
+    scale = 1
+    nonzero = values[values != 0]
+    while scale < MAX_VOLUME_SCALE and len(nonzero) and not np.any(nonzero % (scale * 10)):
+        scale *= 10
+    scaled = values // scale
+    fits_int32 = not len(scaled) or (scaled.min() >= -_INT32_MAX and scaled.max() <= _INT32_MAX)
+    return CompactColumn('scaled', scaled.astype(np.int32 if fits_int32 else np.int64), scale=scale)
+
+
+def _pack_column(series: pd.Series) -> CompactColumn:
+    values = series.to_numpy()
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return CompactColumn('raw', values)
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return _pack_integer(values)
+    if pd.api.types.is_float_dtype(series.dtype):
+        # yfinance may return Volume as float64; whole-number volumes are stored as integers
+        if series.name == 'Volume' and len(values) and np.isfinite(values).all() \
+                and np.array_equal(values, np.trunc(values)):
+            return _pack_integer(values)
+        return _pack_float(values)
+    if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+        labels = set(pd.unique(values))
+        if labels and labels <= set(COLOR_VALUES):
+            return CompactColumn('color', values == COLOR_VALUES[1])
+        categorical = pd.Categorical(values)
+        return CompactColumn('category', categorical.codes, categories=tuple(categorical.categories))
+    return CompactColumn('raw', values)
+
+
+@dataclass
+class CompactFrame:
+    """
+    Column-typed copy of an OHLCV frame with a 'Date' column
+
+    Attributes:
+        dates (np.ndarray): int64 epoch days (or nanoseconds, see date_unit)
+        date_unit (str): 'D' or 'ns'
+        columns (Dict[str, CompactColumn]): Stored columns in frame order (excluding 'Date')
+    """
+    dates: np.ndarray
+    date_unit: str = 'D'
+    columns: Dict[str, CompactColumn] = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "CompactFrame":
+        """
+        Pack a frame with a 'Date' column
+
+        Args:
+            frame (pd.DataFrame): OHLCV frame (plus any indicator or color columns)
+
+        Returns:
+            CompactFrame: The compact copy
+        """
+        ns = pd.DatetimeIndex(frame['Date']).asi8
+        if len(ns) and np.any(ns % _NS_PER_DAY):
+            dates, unit = ns.copy(), 'ns'
+        else:
+            dates, unit = ns // _NS_PER_DAY, 'D'
+        columns = {name: _pack_column(frame[name]) for name in frame.columns if name != 'Date'}
+        return cls(dates, unit, columns)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the stored arrays"""
+        return self.dates.nbytes + sum(column.values.nbytes for column in self.columns.values())
+
+    def date_values(self) -> np.ndarray:
+        """Dates as datetime64[ns] (what searchsorted on pandas dates expects)"""
+        ns = self.dates * _NS_PER_DAY if self.date_unit == 'D' else self.dates
+        return ns.astype('datetime64[ns]')
+
+    def searchsorted(self, timestamp: pd.Timestamp) -> int:
+        """Position of the first row at or after `timestamp`"""
+        ns = pd.Timestamp(timestamp).value
+        # Ceiling division, so a timestamp inside a day lands after that day's bar
+        key = -(-ns // _NS_PER_DAY) if self.date_unit == 'D' else ns
+        return int(self.dates.searchsorted(key, side='left'))
+
+    def slice(self, lo: int, hi: int) -> "CompactFrame":
+        """Zero-copy row slice"""
+        columns = {name: column.take(lo, hi) for name, column in self.columns.items()}
+        return CompactFrame(self.dates[lo:hi], self.date_unit, columns)
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Expand to a regular frame with a 'Date' column
+
+        Args:
+            columns (List[str]): Columns to expand (defaults to all)
+
+        Returns:
+            pd.DataFrame: Expanded frame
+        """
+        names = list(self.columns) if columns is None else columns
+        data = {'Date': self.date_values()}
+        data.update({name: self.columns[name].expand() for name in names})
+        return pd.DataFrame(data)
+
+
+def frame_nbytes(frame: pd.DataFrame) -> int:
+    """Deep memory use of a frame, counting the Python strings of object columns"""
+    return int(frame.memory_usage(index=True, deep=True).sum())
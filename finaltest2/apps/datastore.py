@@ -0,0 +1,737 @@
+"""
+Persistent Price Store - On-disk OHLCV history with incremental updates
+
+Daily bars live in prices/<TICKER>.parquet; downloaded intraday intervals get
+their own partitions under prices/<interval>/. Intervals that are not downloaded
+(see apps.resample) are built from a finer one and cached next to it in memory.
+"""
+
+import os
+import json
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import yfinance as yf
+
+from apps.http_client import get_http_client
+from apps.compact import CompactFrame, frame_nbytes
+from apps.instrumentation import count_cache, span
+from apps.resample import DAILY, DOWNLOAD_LOOKBACK, RESAMPLE_SOURCE, check_interval, is_intraday, resample_bars
+
+logger = logging.getLogger(__name__)
+
+# Earliest date kept in the store (matches the dashboard default range)
+HISTORY_START = "2015-01-01"
+
+# Root folder for cached market data, overridable for deployments
+DATA_DIR = os.environ.get("STOCK_DATA_DIR", os.path.join("data", "cache"))
+
+# How long a stored history is considered fresh before the tail is re-fetched
+REFRESH_INTERVAL = timedelta(hours=1)
+
+# Intraday bars go stale much sooner; their tail is re-fetched after this long
+INTRADAY_REFRESH_INTERVAL = timedelta(minutes=5)
+
+# Keep cached histories as CompactFrames (float32 prices, scaled integer volumes, epoch-day dates)
+COMPACT_HISTORY = os.environ.get("COMPACT_HISTORY", "0").lower() in ("1", "true", "yes")
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+
+def safe_ticker_name(ticker: str) -> str:
+    """Map a ticker symbol (e.g. '^GSPC', 'BRK-B') to a file-system safe name"""
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in ticker.upper())
+
+
+def normalize_download(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a yfinance frame to a tz-naive, sorted 'Date' index with OHLCV columns
+
+    Args:
+        data (pd.DataFrame): Frame returned by yf.download for a single ticker
+
+    Returns:
+        pd.DataFrame: Normalized OHLCV frame
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.droplevel(-1, axis=1)
+    data = data[[col for col in PRICE_COLUMNS if col in data.columns]]
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    data = data.set_axis(index.rename('Date'), axis=0)
+    data = data[~data.index.duplicated(keep='last')].sort_index()
+    return data.dropna(how='all')
+
+
+class PriceStore:
+    """Columnar on-disk store keeping the full OHLCV history, one Parquet partition per ticker and interval."""
+
+    def __init__(self, root: Optional[str] = None, history_start: str = HISTORY_START,
+                 refresh_interval: timedelta = REFRESH_INTERVAL):
+        """
+        Initialize the price store
+
+        Args:
+            root (str): Root data folder (defaults to DATA_DIR)
+            history_start (str): Earliest date fetched for a new ticker
+            refresh_interval (timedelta): Age after which the tail is re-fetched
+        """
+        self.root = root or DATA_DIR
+        self.history_start = history_start
+        self.refresh_interval = refresh_interval
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _folder(self, interval: str) -> str:
+        if interval == DAILY:
+            return os.path.join(self.root, "prices")
+        if interval not in DOWNLOAD_LOOKBACK:
+            raise ValueError(f"Interval '{interval}' is built from {RESAMPLE_SOURCE.get(interval)} bars "
+                             f"and has no stored partition")
+        return os.path.join(self.root, "prices", check_interval(interval))
+
+    def partition_path(self, ticker: str, interval: str = DAILY) -> str:
+        """Path of the Parquet partition holding a ticker's history at one interval"""
+        return os.path.join(self._folder(interval), f"{safe_ticker_name(ticker)}.parquet")
+
+    def _meta_path(self, ticker: str, interval: str = DAILY) -> str:
+        return os.path.join(self._folder(interval), f"{safe_ticker_name(ticker)}.json")
+
+    def earliest_start(self, interval: str = DAILY) -> str:
+        """Earliest date a download of this interval can start from (Yahoo serves intraday bars for a limited window)"""
+        lookback = DOWNLOAD_LOOKBACK.get(interval)
+        if lookback is None:
+            return self.history_start
+        return max(self.history_start, (datetime.now() - lookback).strftime("%Y-%m-%d"))
+
+    def refresh_after(self, interval: str = DAILY) -> timedelta:
+        """Age after which a history of this interval is refreshed"""
+        return min(self.refresh_interval, INTRADAY_REFRESH_INTERVAL) if is_intraday(interval) else self.refresh_interval
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.Lock())
+
+    def read(self, ticker: str, interval: str = DAILY) -> Optional[pd.DataFrame]:
+        """
+        Read the stored history of a ticker without touching the network
+
+        Args:
+            ticker (str): Stock ticker symbol
+            interval (str): Bar interval of the partition
+
+        Returns:
+            Optional[pd.DataFrame]: Stored OHLCV frame indexed by Date, or None
+        """
+        path = self.partition_path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable partition {path}: {str(e)}")
+            return None
+
+    def read_meta(self, ticker: str, interval: str = DAILY) -> dict:
+        """Read the bookkeeping metadata (coverage and last fetch time) of a ticker"""
+        try:
+            with open(self._meta_path(ticker, interval)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def write(self, ticker: str, data: pd.DataFrame, covered_from: Optional[str] = None,
+              interval: str = DAILY) -> None:
+        """
+        Atomically replace the stored history of a ticker
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (pd.DataFrame): Normalized OHLCV frame indexed by Date
+            covered_from (str): Earliest date the stored history is complete from
+            interval (str): Bar interval of the partition
+        """
+        path = self.partition_path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        data.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+        meta = self.read_meta(ticker, interval)
+        meta.update({
+            "covered_from": covered_from or meta.get("covered_from") or self.history_start,
+            "last_date": data.index.max().strftime("%Y-%m-%d") if len(data) else None,
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        with open(self._meta_path(ticker, interval), "w") as f:
+            json.dump(meta, f)
+
+    def is_fresh(self, ticker: str, interval: str = DAILY) -> bool:
+        """Check whether the stored tail was fetched within the refresh interval"""
+        fetched_at = self.read_meta(ticker, interval).get("fetched_at")
+        if not fetched_at:
+            return False
+        return datetime.now() - datetime.fromisoformat(fetched_at) < self.refresh_after(interval)
+
+    def _download(self, ticker: str, start: str, end: Optional[str] = None, interval: str = DAILY) -> pd.DataFrame:
+        with span('yfinance.download', 'load'):
+            if interval == DAILY:
+                data = yf.download(ticker, start=start, end=end, progress=False, session=get_http_client().session)
+            else:
+                data = yf.download(ticker, start=start, end=end, interval=interval, progress=False,
+                                   session=get_http_client().session)
+        return normalize_download(data)
+
+    def merge(self, ticker: str, fresh: pd.DataFrame, covered_from: Optional[str] = None,
+              interval: str = DAILY) -> pd.DataFrame:
+        """
+        Merge newly downloaded bars into the stored history and persist the result
+
+        Args:
+            ticker (str): Stock ticker symbol
+            fresh (pd.DataFrame): Normalized bars; overlapping dates replace stored ones
+            covered_from (str): New coverage start, if the merge extended the history backwards
+            interval (str): Bar interval of the partition
+
+        Returns:
+            pd.DataFrame: The merged history
+        """
+        stored = self.read(ticker, interval)
+        if stored is not None and len(stored):
+            merged = pd.concat([stored, fresh])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        else:
+            merged = fresh
+        self.write(ticker, merged, covered_from=covered_from, interval=interval)
+        return merged
+
+    def update(self, ticker: str, start: Optional[str] = None, force: bool = False,
+               interval: str = DAILY) -> pd.DataFrame:
+        """
+        Bring a ticker's stored history up to date, fetching only what is missing
+
+        Only the tail since the last stored bar is downloaded (the last bar is
+        re-fetched because the current session's bar is still moving). A request
+        starting before the stored coverage backfills the missing head once.
+        Intraday partitions start at the oldest bar Yahoo still serves and keep
+        every bar merged since, so they grow past Yahoo's lookback window but are
+        never backfilled.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start (str): Earliest date the caller needs (defaults to history_start)
+            force (bool): Re-fetch the tail even if the store is fresh
+            interval (str): Downloaded bar interval ('1m', '5m', '1h' or '1d')
+
+        Returns:
+            pd.DataFrame: Full stored history indexed by Date
+
+        Raises:
+            ValueError: If no data exists for the ticker, or the interval is not downloaded
+        """
+        earliest = self.earliest_start(interval)
+        start = min(start or self.history_start, self.history_start) if interval == DAILY else earliest
+        label = ticker if interval == DAILY else f"{ticker} {interval}"
+        with self._lock(ticker):
+            stored = self.read(ticker, interval)
+            meta = self.read_meta(ticker, interval)
+            covered_from = meta.get("covered_from")
+
+            if stored is None or not len(stored) or not covered_from:
+                logger.info(f"Fetching full history for {label} from {start}")
+                fresh = self._download(ticker, start, interval=interval)
+                if fresh.empty:
+                    raise ValueError(f"No data found for ticker {ticker}")
+                self.write(ticker, fresh, covered_from=start, interval=interval)
+                return fresh
+
+            # Judge freshness before backfilling, since the head merge stamps a new fetch time
+            stale = force or not self.is_fresh(ticker, interval)
+            try:
+                if start < covered_from:
+                    logger.info(f"Backfilling {label} from {start} to {covered_from}")
+                    head = self._download(ticker, start, covered_from, interval=interval)
+                    stored = self.merge(ticker, head, covered_from=start, interval=interval)
+
+                if stale:
+                    # A tail older than Yahoo's intraday window can only be fetched from the window's start
+                    tail_start = max(stored.index.max().strftime("%Y-%m-%d"), earliest)
+                    logger.info(f"Fetching {label} tail from {tail_start}")
+                    tail = self._download(ticker, tail_start, interval=interval)
+                    stored = self.merge(ticker, tail, interval=interval)
+            except Exception as e:
+                logger.warning(f"Serving stored history for {label}, refresh failed: {str(e)}")
+
+            return stored
+
+    def _download_batch(self, tickers: List[str], start: str) -> Dict[str, pd.DataFrame]:
+        """Download several tickers in one batched request and split per ticker"""
+        with span('yfinance.download_batch', 'load'):
+            data = yf.download(tickers, start=start, group_by='ticker', threads=True, progress=False,
+                               session=get_http_client().session)
+        if data.empty:
+            return {}
+        if not isinstance(data.columns, pd.MultiIndex):
+            # yfinance collapses the ticker level when a single symbol is requested
+            return {tickers[0]: normalize_download(data)}
+
+        frames = {}
+        for ticker in tickers:
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            frame = normalize_download(data[ticker])
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def update_many(self, tickers: Iterable[str], force: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        Bring several tickers up to date with at most two batched downloads
+
+        Tickers missing from the store are fetched together from history_start;
+        stale tickers are fetched together from the oldest of their last bars.
+
+        Args:
+            tickers (Iterable[str]): Stock ticker symbols
+            force (bool): Re-fetch the tail even if the store is fresh
+
+        Returns:
+            Dict[str, pd.DataFrame]: Stored history per ticker (tickers without data are omitted)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        missing, stale, histories = [], {}, {}
+        for ticker in tickers:
+            stored = self.read(ticker)
+            if stored is None or not len(stored) or not self.read_meta(ticker).get("covered_from"):
+                missing.append(ticker)
+            elif force or not self.is_fresh(ticker):
+                stale[ticker] = stored.index.max()
+            else:
+                histories[ticker] = stored
+
+        batches = []
+        if missing:
+            batches.append((missing, self.history_start))
+        if stale:
+            batches.append((list(stale), min(stale.values()).strftime("%Y-%m-%d")))
+
+        for batch, start in batches:
+            logger.info(f"Batch fetching {len(batch)} tickers from {start}")
+            try:
+                frames = self._download_batch(batch, start)
+            except Exception as e:
+                logger.warning(f"Batch download failed for {batch}: {str(e)}")
+                frames = {}
+            for ticker in batch:
+                with self._lock(ticker):
+                    if ticker in frames:
+                        covered_from = self.history_start if ticker in missing else None
+                        histories[ticker] = self.merge(ticker, frames[ticker], covered_from=covered_from)
+                    elif ticker in stale:
+                        histories[ticker] = self.read(ticker)
+                    else:
+                        logger.warning(f"No data found for ticker {ticker}")
+        return histories
+
+    def get_range(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        """
+        Answer a date-range request from the local store
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): Start date in YYYY-MM-DD format (inclusive)
+            end_date (str): End date in YYYY-MM-DD format (exclusive, as in yf.download)
+            interval (str): Bar interval; derived intervals are resampled from their source
+
+        Returns:
+            pd.DataFrame: OHLCV data with a 'Date' column
+
+        Raises:
+            ValueError: If the range holds no data
+        """
+        source = RESAMPLE_SOURCE.get(check_interval(interval), interval)
+        history = self.update(ticker, start=start_date, interval=source)
+        if source != interval:
+            history = resample_bars(history.reset_index(), interval).set_index('Date')
+        index = history.index
+        lo = index.searchsorted(pd.Timestamp(start_date), side='left')
+        hi = index.searchsorted(pd.Timestamp(end_date), side='left')
+        data = history.iloc[lo:hi]
+        if data.empty:
+            raise ValueError(f"No data found for ticker {ticker} between {start_date} and {end_date}")
+        return data.reset_index()
+
+
+class HistoryCache:
+    """
+    In-memory history per ticker and interval that serves any date sub-range as a zero-copy slice.
+
+    Intraday and derived histories are always held as CompactFrames; derived intervals
+    are resampled once from their cached source and rebuilt when the source reloads.
+    """
+
+    def __init__(self, store: PriceStore, service=None, compact: bool = COMPACT_HISTORY, mmap_store=None):
+        """
+        Initialize the history cache
+
+        Args:
+            store (PriceStore): Backing price store used on a miss
+            service (MarketDataService): Optional shared cache consulted before the store, so
+                replicas download each history once
+            compact (bool): Hold histories as CompactFrames and expand only the requested rows
+            mmap_store (MmapPriceStore): Hold histories as read-only mapped column files shared by
+                every process on the host (takes precedence over `compact`)
+        """
+        self.store = store
+        self.service = service
+        self.mmap_store = mmap_store
+        self.compact = compact and mmap_store is None
+        self._entries: Dict[str, dict] = {}
+        self._guard = threading.Lock()
+
+    def put(self, ticker: str, history: Union[pd.DataFrame, CompactFrame, dict], covered_from: Optional[str] = None,
+            loaded_at: Optional[datetime] = None, interval: str = DAILY) -> None:
+        """
+        Install a full history for a ticker
+
+        Args:
+            ticker (str): Stock ticker symbol
+            history (pd.DataFrame | CompactFrame | dict): OHLCV frame indexed by Date or with a 'Date'
+                column (held without copying), an already packed history, or the header of an already
+                written column file
+            covered_from (str): Earliest date the history is complete from
+            loaded_at (datetime): When the history was fetched (defaults to now)
+            interval (str): Bar interval of the history
+
+        Raises:
+            FileNotFoundError: If a column file header refers to a file missing on this host
+        """
+        covered_from = covered_from or self.store.history_start
+        loaded_at = loaded_at or datetime.now()
+        entry = {"covered_from": covered_from, "loaded_at": loaded_at}
+        key = (ticker.upper(), check_interval(interval))
+        if self.mmap_store is not None and interval == DAILY and not isinstance(history, CompactFrame):
+            header = history if isinstance(history, dict) else \
+                self.mmap_store.write(ticker, history, covered_from, loaded_at)
+            arrays = self.mmap_store.map(header)
+            if arrays is None:
+                raise FileNotFoundError(f"Column file {header['file']} for {ticker} is not on this host")
+            entry.update({"arrays": arrays, "dates": arrays['Date']})
+            self._install(key, entry, len(arrays), "mapped")
+            return
+
+        if isinstance(history, CompactFrame):
+            frame, packed = None, history
+        else:
+            # A frame with a Date column is held as is, so a history shared through an
+            # in-process service is kept once rather than copied into the cache
+            frame = history if 'Date' in history.columns else history.reset_index()
+            # Intraday histories run to tens of thousands of bars per ticker, so they are always packed
+            packed = CompactFrame.from_frame(frame) if self.compact or interval != DAILY else None
+
+        if packed is not None:
+            entry.update({"compact": packed})
+            self._install(key, entry, len(packed), "compact")
+        else:
+            entry.update({"frame": frame, "dates": frame['Date'].to_numpy()})
+            self._install(key, entry, len(frame), "frame")
+
+    def _install(self, key: tuple, entry: dict, rows: int, form: str) -> None:
+        logger.debug(f"Cached {key[0]} {key[1]}: {rows} rows ({form})")
+        with self._guard:
+            self._entries[key] = entry
+
+    def _entry(self, ticker: str, start_date: str, interval: str = DAILY) -> dict:
+        if check_interval(interval) in RESAMPLE_SOURCE:
+            return self._resampled_entry(ticker, start_date, interval)
+        key = (ticker.upper(), interval)
+        with self._guard:
+            entry = self._entries.get(key)
+        if entry is not None:
+            is_fresh = datetime.now() - entry["loaded_at"] < self.store.refresh_after(interval)
+            # Intraday bars older than the stored ones cannot be fetched, so any start is covered
+            if is_fresh and (start_date >= entry["covered_from"] or interval != DAILY):
+                count_cache('price_history', hit=True)
+                return entry
+        count_cache('price_history', hit=False)
+
+        start = min(start_date, entry["covered_from"]) if entry else start_date
+        if self.mmap_store is not None and interval == DAILY and self._map_current(ticker, start):
+            with self._guard:
+                return self._entries[key]
+
+        self._install_loaded(ticker, self._load(ticker, start, interval=interval), start, interval)
+        with self._guard:
+            return self._entries[key]
+
+    def _install_loaded(self, ticker: str, loaded: tuple, start: str, interval: str = DAILY) -> None:
+        history, covered_from, loaded_at = loaded
+        try:
+            self.put(ticker, history, covered_from=covered_from, loaded_at=loaded_at, interval=interval)
+        except FileNotFoundError:
+            # The shared header came from a replica on another host; write a local file
+            history, covered_from, loaded_at = self._load(ticker, start, shared=False)
+            self.put(ticker, history, covered_from=covered_from, loaded_at=loaded_at)
+
+    def _resampled_entry(self, ticker: str, start_date: str, interval: str) -> dict:
+        """Entry of a derived interval, resampled from the cached source history when that changed"""
+        source = self._entry(ticker, start_date, RESAMPLE_SOURCE[interval])
+        key = (ticker.upper(), interval)
+        with self._guard:
+            entry = self._entries.get(key)
+        if entry is not None and entry["source"] is source:
+            count_cache('resampled_bars', hit=True)
+            return entry
+        count_cache('resampled_bars', hit=False)
+
+        with span('resample_bars', 'compute'):
+            bars = resample_bars(self._expand(source), interval)
+        entry = {"covered_from": source["covered_from"], "loaded_at": source["loaded_at"], "source": source,
+                 "compact": CompactFrame.from_frame(bars)}
+        self._install(key, entry, len(bars), "compact")
+        return entry
+
+    @staticmethod
+    def _expand(entry: dict) -> pd.DataFrame:
+        """Full history of an entry as a frame with a 'Date' column"""
+        if "compact" in entry:
+            return entry["compact"].to_frame()
+        if "arrays" in entry:
+            return entry["arrays"].to_frame()
+        return entry["frame"]
+
+    def is_cached(self, ticker: str, interval: str = DAILY) -> bool:
+        """Whether a fresh history of the ticker is held"""
+        with self._guard:
+            entry = self._entries.get((ticker.upper(), interval))
+        return entry is not None and datetime.now() - entry["loaded_at"] < self.store.refresh_after(interval)
+
+    def _map_current(self, ticker: str, start: str) -> bool:
+        """Map a column file another process already wrote, if it is fresh and covers `start`"""
+        opened = self.mmap_store.open(ticker)
+        if opened is None:
+            return False
+        header = opened[1]
+        loaded_at = datetime.fromisoformat(header["loaded_at"])
+        if datetime.now() - loaded_at >= self.store.refresh_interval or header["covered_from"] > start:
+            return False
+        self.put(ticker, header, covered_from=header["covered_from"], loaded_at=loaded_at)
+        return True
+
+    def _shared_form(self, ticker: str, history: pd.DataFrame, start: str, interval: str = DAILY) -> tuple:
+        """Package a stored history the way it is shared and cached: (history, covered_from, loaded_at)"""
+        covered_from, loaded_at = min(start, self.store.history_start), datetime.now()
+        if interval != DAILY:
+            history = CompactFrame.from_frame(history.reset_index())
+        elif self.mmap_store is not None:
+            # Only the small header goes through the shared service; the columns live in the file
+            history = self.mmap_store.write(ticker, history, covered_from, loaded_at)
+        elif self.compact:
+            # The shared service holds the packed form too, so no float64 copy stays resident
+            history = CompactFrame.from_frame(history.reset_index())
+        else:
+            # put() holds a frame with a Date column as is, so an in-process service and
+            # the cache share this one frame
+            history = history.reset_index()
+        return history, covered_from, loaded_at
+
+    def _shared_key(self, ticker: str, interval: str = DAILY) -> str:
+        if interval != DAILY:
+            return f"prices:{ticker.upper()}:{interval}"
+        return f"prices:{ticker.upper()}" + (":mmap" if self.mmap_store is not None else
+                                             ":compact" if self.compact else "")
+
+    def _load(self, ticker: str, start: str, shared: bool = True, interval: str = DAILY) -> tuple:
+        def fetch():
+            history = self.store.update(ticker, start=start, interval=interval)
+            return self._shared_form(ticker, history, start, interval)
+
+        if self.service is None or not shared:
+            return fetch()
+        if interval != DAILY:
+            return self.service.get_or_fetch(self._shared_key(ticker, interval), fetch,
+                                             ttl=self.store.refresh_after(interval).total_seconds())
+        return self.service.get_or_fetch(self._shared_key(ticker), fetch,
+                                         ttl=self.store.refresh_interval.total_seconds(),
+                                         accept=lambda value: value[1] <= start)
+
+    def load_many(self, tickers: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Load the daily histories of many tickers, downloading the missing ones in one batch
+
+        Every history is shared under its own key, so warm reads move one ticker at a
+        time and a batch carries only the tickers no replica holds yet. One replica
+        downloads a batch; replicas asking for the same batch meanwhile wait for it
+        and then read the per-ticker results.
+
+        Args:
+            tickers (Iterable[str]): Stock ticker symbols
+
+        Returns:
+            Dict[str, pd.DataFrame]: Full history per ticker with a 'Date' column (read-only);
+                tickers without data are omitted
+        """
+        tickers = list(dict.fromkeys(tickers))
+        start = self.store.history_start
+        ttl = self.store.refresh_interval.total_seconds()
+        covers_start = lambda value: value[1] <= start
+
+        missing = []
+        for ticker in tickers:
+            if self.is_cached(ticker):
+                continue
+            shared = self.service.get(self._shared_key(ticker), covers_start) if self.service is not None else None
+            if shared is not None:
+                self._install_loaded(ticker, shared, start)
+            else:
+                missing.append(ticker)
+
+        if missing:
+            fetched = {}
+
+            def fetch_batch():
+                for ticker, history in self.store.update_many(missing).items():
+                    fetched[ticker] = self._shared_form(ticker, history, start)
+                    if self.service is not None:
+                        self.service.put(self._shared_key(ticker), fetched[ticker], ttl)
+                # Only the names go under the batch key; the histories live under their own keys
+                return sorted(fetched)
+
+            if self.service is None:
+                loaded = fetch_batch()
+            else:
+                loaded = self.service.get_or_fetch(f"universe:{','.join(sorted(missing))}", fetch_batch, ttl=ttl)
+            for ticker in loaded:
+                shared = fetched.get(ticker)
+                if shared is None:
+                    shared = self.service.get(self._shared_key(ticker), covers_start)
+                if shared is not None:
+                    self._install_loaded(ticker, shared, start)
+
+        histories = {}
+        for ticker in tickers:
+            with self._guard:
+                entry = self._entries.get((ticker.upper(), DAILY))
+            if entry is not None:
+                histories[ticker] = self._expand(entry)
+        return histories
+
+    def get_range(self, ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
+        """
+        Serve a date range from memory, loading the ticker's history only on a miss
+
+        The returned frame shares its column buffers with the cached history, so it
+        must be treated as read-only; adding new columns to it is safe. Mapped
+        histories are served as views of the shared column file; compact histories
+        (every intraday and derived interval) expand just the requested rows into a
+        new frame.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (str): Start date in YYYY-MM-DD format (inclusive)
+            end_date (str): End date in YYYY-MM-DD format (exclusive)
+            interval (str): Bar interval (see apps.resample.INTERVALS)
+
+        Returns:
+            pd.DataFrame: OHLCV data with a 'Date' column
+
+        Raises:
+            ValueError: If the range holds no data
+        """
+        entry = self._entry(ticker, start_date, interval)
+        packed = entry.get("compact")
+        if packed is not None:
+            lo, hi = packed.searchsorted(pd.Timestamp(start_date)), packed.searchsorted(pd.Timestamp(end_date))
+        else:
+            dates = entry["dates"]
+            lo = dates.searchsorted(pd.Timestamp(start_date).to_datetime64(), side='left')
+            hi = dates.searchsorted(pd.Timestamp(end_date).to_datetime64(), side='left')
+        if lo >= hi:
+            suffix = "" if interval == DAILY else f" at interval {interval}"
+            raise ValueError(f"No data found for ticker {ticker} between {start_date} and {end_date}{suffix}")
+        if packed is not None:
+            return packed.slice(lo, hi).to_frame()
+        if "arrays" in entry:
+            return entry["arrays"].slice(lo, hi).to_frame()
+        # A fresh DataFrame over the sliced manager detaches it from the cached frame's
+        # copy tracking, so callers can add indicator columns without touching the cache
+        return pd.DataFrame(entry["frame"].iloc[lo:hi], copy=False)
+
+    def get_history(self, ticker: str, interval: str = DAILY) -> pd.DataFrame:
+        """
+        Return the full cached history of a ticker (read-only, with a 'Date' column)
+
+        Args:
+            ticker (str): Stock ticker symbol
+            interval (str): Bar interval
+
+        Returns:
+            pd.DataFrame: Full OHLCV history
+        """
+        return self._expand(self._entry(ticker, self.store.history_start, interval))
+
+    def memory_report(self) -> pd.DataFrame:
+        """
+        Memory held per cached ticker and interval
+
+        Returns:
+            pd.DataFrame: One row per ticker and interval with rows, storage form, bytes held (for mapped
+                histories, the shared file size) and the bytes the same history takes as a
+                regular frame
+        """
+        with self._guard:
+            entries = dict(self._entries)
+        rows = []
+        for (ticker, interval), entry in sorted(entries.items()):
+            if "compact" in entry:
+                nbytes, expanded = entry["compact"].nbytes, frame_nbytes(entry["compact"].to_frame())
+            elif "arrays" in entry:
+                nbytes = expanded = sum(entry["arrays"][name].nbytes for name in entry["arrays"])
+            else:
+                nbytes = expanded = frame_nbytes(entry["frame"])
+            rows.append({
+                "ticker": ticker,
+                "interval": interval,
+                "rows": len(entry["compact"] if "compact" in entry else entry["dates"]),
+                "compact": "compact" in entry,
+                "mapped": "arrays" in entry,
+                "bytes": nbytes,
+                "expanded_bytes": expanded,
+            })
+        return pd.DataFrame(rows, columns=["ticker", "interval", "rows", "compact", "mapped", "bytes", "expanded_bytes"])
+
+    def clear(self) -> None:
+        """Drop every cached history"""
+        with self._guard:
+            self._entries.clear()
+
+
+_store: Optional[PriceStore] = None
+_history_cache: Optional[HistoryCache] = None
+_store_guard = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Return the process-wide price store"""
+    global _store
+    with _store_guard:
+        if _store is None:
+            _store = PriceStore()
+        return _store
+
+
+def get_history_cache() -> HistoryCache:
+    """Return the process-wide history cache shared by all sessions"""
+    global _history_cache
+    store = get_price_store()
+    with _store_guard:
+        if _history_cache is None:
+            from apps.market_data import get_market_data
+            from apps.mmap_store import MMAP_HISTORY, MmapPriceStore
+            mmap_store = MmapPriceStore(store.root) if MMAP_HISTORY else None
+            _history_cache = HistoryCache(store, service=get_market_data(), mmap_store=mmap_store)
+        return _history_cache
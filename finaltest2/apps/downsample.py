@@ -0,0 +1,125 @@
+"""
+Downsampling - Reduce chart payloads to a point budget before they are sent to the browser
+
+OHLCV bars are bucketed into the next coarser intervals of the bar ladder (e.g.
+1-minute bars into 5-minute or hourly candles, daily bars into weekly or monthly
+candles); line series are reduced with Largest-Triangle-Three-Buckets (LTTB),
+which keeps the visual peaks and troughs.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from apps.resample import DAILY, INTERVALS, coarser_intervals, resample_bars
+
+# Default number of points per trace; bars are kept at their own interval when the range fits
+DEFAULT_POINT_BUDGET = 800
+
+# numpy bucketing units accepted by resample_ohlcv, with the interval they stand for
+_UNIT_INTERVALS = {'W': '1wk', 'M': '1mo'}
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    """Numeric x coordinates for triangle areas (datetimes as nanoseconds)"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the indices of the points LTTB keeps
+
+    Args:
+        x (np.ndarray): Increasing x coordinates (numbers or datetimes)
+        y (np.ndarray): Finite y values
+        n_out (int): Number of points to keep (at least 3)
+
+    Returns:
+        np.ndarray: Sorted indices into x/y, including the first and last point
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    xf = _as_float(x)
+    yf = np.asarray(y, dtype=np.float64)
+    # Buckets for all points except the fixed first and last
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xf[next_lo:next_hi].mean()
+        avg_y = yf[next_lo:next_hi].mean()
+        areas = np.abs((xf[a] - avg_x) * (yf[lo:hi] - yf[a]) - (xf[a] - xf[lo:hi]) * (avg_y - yf[a]))
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a line series with LTTB, dropping missing values first
+
+    Args:
+        x (np.ndarray): Increasing x coordinates (numbers or datetimes)
+        y (np.ndarray): Series values (NaN allowed)
+        n_out (int): Point budget (None keeps every point)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Downsampled x and y
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    if n_out is None or len(y) <= n_out:
+        return x, y
+    keep = lttb_indices(x, y, n_out)
+    return x[keep], y[keep]
+
+
+def resample_ohlcv(df: pd.DataFrame, unit: str) -> pd.DataFrame:
+    """
+    Bucket daily OHLCV bars into weekly or monthly candles
+
+    Args:
+        df (pd.DataFrame): Bars with Date, Open, High, Low, Close and Volume columns, sorted by Date
+        unit (str): numpy datetime unit of the buckets ('W' or 'M')
+
+    Returns:
+        pd.DataFrame: One row per bucket, dated by the week's Monday or the month's first day
+    """
+    return resample_bars(df, _UNIT_INTERVALS[unit])
+
+
+def downsample_ohlcv(df: pd.DataFrame, max_points: Optional[int] = DEFAULT_POINT_BUDGET,
+                     interval: str = DAILY) -> Tuple[pd.DataFrame, str]:
+    """
+    Pick the finest candle interval that fits the point budget
+
+    Args:
+        df (pd.DataFrame): OHLCV bars with a Date column
+        max_points (int): Maximum number of candles (None keeps the bars as they are)
+        interval (str): Interval of the input bars
+
+    Returns:
+        Tuple[pd.DataFrame, str]: Candles and their interval label (e.g. 'Daily', 'Hourly' or 'Weekly')
+    """
+    label = INTERVALS[interval]
+    if max_points is None or len(df) <= max_points:
+        return df, label
+    candles = df
+    for coarser in coarser_intervals(interval):
+        candles, label = resample_bars(df, coarser), INTERVALS[coarser]
+        if len(candles) <= max_points:
+            break
+    return candles, label
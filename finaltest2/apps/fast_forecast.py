@@ -0,0 +1,197 @@
+"""
+Fast Forecasts - Vectorized NumPy baseline models as a lightweight alternative to Prophet
+
+Every engine returns the same ds/yhat/yhat_lower/yhat_upper frame as Prophet's
+predict(): the training history followed by `periods` calendar days.
+"""
+
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+# Two-sided 95% normal quantile, matching Prophet's interval_width=0.95
+Z_95 = 1.959963984540054
+
+YEARLY_PERIOD = 365.25
+WEEKLY_PERIOD = 7.0
+YEARLY_ORDER = 10
+WEEKLY_ORDER = 3
+
+# Trading days per week, used as the Holt-Winters season length
+TRADING_WEEK = 5
+
+
+def _future_dates(last_date: pd.Timestamp, periods: int) -> pd.DatetimeIndex:
+    """Calendar days after the last bar, like Prophet's make_future_dataframe"""
+    return pd.date_range(last_date + pd.Timedelta(days=1), periods=periods, freq='D')
+
+
+def _trading_steps(last_date: pd.Timestamp, future: pd.DatetimeIndex) -> np.ndarray:
+    """Number of business days from the last bar to each future date (at least 1)"""
+    start = np.datetime64(last_date.date(), 'D') + 1
+    ends = future.values.astype('datetime64[D]') + 1
+    return np.maximum(np.busday_count(start, ends), 1)
+
+
+def _frame(dates: pd.DatetimeIndex, yhat: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({'ds': dates, 'yhat': yhat, 'yhat_lower': lower, 'yhat_upper': upper})
+
+
+def fourier_terms(days: np.ndarray, period: float, order: int) -> np.ndarray:
+    """
+    Fourier seasonality features for day offsets
+
+    Args:
+        days (np.ndarray): Time in days
+        period (float): Season length in days
+        order (int): Number of sine/cosine pairs
+
+    Returns:
+        np.ndarray: Feature matrix of shape (len(days), 2 * order)
+    """
+    angles = 2 * np.pi * np.outer(days, np.arange(1, order + 1)) / period
+    return np.hstack([np.sin(angles), np.cos(angles)])
+
+
+def linear_fourier_forecast(data: pd.DataFrame, periods: int, yearly_seasonality: bool = True,
+                            weekly_seasonality: bool = True) -> pd.DataFrame:
+    """
+    Linear trend plus Fourier seasonality fitted by least squares
+
+    Args:
+        data (pd.DataFrame): Historical data with 'Date' and 'Close' columns
+        periods (int): Number of calendar days to forecast
+        yearly_seasonality (bool): Include yearly Fourier terms
+        weekly_seasonality (bool): Include weekly Fourier terms
+
+    Returns:
+        pd.DataFrame: ds/yhat/yhat_lower/yhat_upper for history and forecast
+    """
+    dates = pd.DatetimeIndex(data['Date'])
+    y = np.asarray(data['Close'], dtype=np.float64)
+    all_dates = dates.append(_future_dates(dates[-1], periods))
+    days = (all_dates - dates[0]).days.to_numpy(dtype=np.float64)
+
+    scale = max(days[len(y) - 1], 1.0)
+    features = [np.ones_like(days), days / scale]
+    if yearly_seasonality:
+        features.append(fourier_terms(days, YEARLY_PERIOD, YEARLY_ORDER))
+    if weekly_seasonality:
+        features.append(fourier_terms(days, WEEKLY_PERIOD, WEEKLY_ORDER))
+    X = np.column_stack(features)
+
+    coef, *_ = np.linalg.lstsq(X[:len(y)], y, rcond=None)
+    yhat = X @ coef
+    sigma = np.std(y - yhat[:len(y)], ddof=X.shape[1])
+    return _frame(all_dates, yhat, yhat - Z_95 * sigma, yhat + Z_95 * sigma)
+
+
+def _holt_winters_grid(y: np.ndarray, alphas: np.ndarray, betas: np.ndarray, gammas: np.ndarray, season: int):
+    """Run additive Holt-Winters for every parameter combination at once (one column per combination)"""
+    n = len(y)
+    level = np.full(alphas.shape, y[:season].mean())
+    trend = np.full(alphas.shape, (y[season:2 * season].mean() - y[:season].mean()) / season
+                    if n >= 2 * season else 0.0)
+    seasonal = np.tile((y[:season] - y[:season].mean())[:, None], (1, len(alphas)))
+    fitted = np.empty((n, len(alphas)))
+    for t in range(n):
+        s = seasonal[t % season]
+        fitted[t] = level + trend + s
+        prev_level = level
+        level = alphas * (y[t] - s) + (1 - alphas) * (level + trend)
+        trend = betas * (level - prev_level) + (1 - betas) * trend
+        seasonal[t % season] = gammas * (y[t] - level) + (1 - gammas) * s
+    return fitted, level, trend, seasonal
+
+
+def holt_winters_forecast(data: pd.DataFrame, periods: int, yearly_seasonality: bool = True,
+                          weekly_seasonality: bool = True) -> pd.DataFrame:
+    """
+    Additive Holt-Winters on trading-day steps, with parameters picked from a vectorized grid search
+
+    Weekly seasonality uses a five-trading-day season; yearly seasonality is not
+    modelled by this engine.
+
+    Args:
+        data (pd.DataFrame): Historical data with 'Date' and 'Close' columns
+        periods (int): Number of calendar days to forecast
+        yearly_seasonality (bool): Ignored (accepted for a uniform engine signature)
+        weekly_seasonality (bool): Include the trading-week season
+
+    Returns:
+        pd.DataFrame: ds/yhat/yhat_lower/yhat_upper for history and forecast
+    """
+    dates = pd.DatetimeIndex(data['Date'])
+    y = np.asarray(data['Close'], dtype=np.float64)
+    season = TRADING_WEEK if weekly_seasonality else 1
+
+    grid = np.array(np.meshgrid([0.1, 0.3, 0.5, 0.8, 0.95], [0.01, 0.05, 0.1], [0.05, 0.2])).reshape(3, -1)
+    alphas, betas, gammas = grid if weekly_seasonality else (grid[0], grid[1], np.zeros(grid.shape[1]))
+    fitted, level, trend, seasonal = _holt_winters_grid(y, alphas, betas, gammas, season)
+
+    warmup = min(2 * season + 10, len(y) - 1)
+    sse = ((fitted[warmup:] - y[warmup:, None]) ** 2).sum(axis=0)
+    best = int(np.argmin(sse))
+    alpha, beta = alphas[best], betas[best]
+    sigma = np.sqrt(sse[best] / max(len(y) - warmup, 1))
+
+    future = _future_dates(dates[-1], periods)
+    steps = _trading_steps(dates[-1], future)
+    season_index = (len(y) + steps - 1) % season
+    forecast = level[best] + steps * trend[best] + seasonal[season_index, best]
+
+    # Holt's linear-method variance: sigma^2 * (1 + sum_{j<h} (alpha * (1 + j * beta))^2)
+    j = np.arange(1, steps.max())
+    growth = np.concatenate([[0.0], np.cumsum((alpha * (1 + j * beta)) ** 2)])
+    spread = Z_95 * sigma * np.sqrt(1 + growth[steps - 1])
+
+    yhat = np.concatenate([fitted[:, best], forecast])
+    lower = np.concatenate([fitted[:, best] - Z_95 * sigma, forecast - spread])
+    upper = np.concatenate([fitted[:, best] + Z_95 * sigma, forecast + spread])
+    return _frame(dates.append(future), yhat, lower, upper)
+
+
+def drift_forecast(data: pd.DataFrame, periods: int, yearly_seasonality: bool = True,
+                   weekly_seasonality: bool = True, n_paths: int = 1000, seed: int = 0) -> pd.DataFrame:
+    """
+    Random walk with drift on log prices, with intervals from bootstrapped daily returns
+
+    Args:
+        data (pd.DataFrame): Historical data with 'Date' and 'Close' columns
+        periods (int): Number of calendar days to forecast
+        yearly_seasonality (bool): Ignored (accepted for a uniform engine signature)
+        weekly_seasonality (bool): Ignored (accepted for a uniform engine signature)
+        n_paths (int): Number of bootstrap paths
+        seed (int): Random seed for reproducible intervals
+
+    Returns:
+        pd.DataFrame: ds/yhat/yhat_lower/yhat_upper for history and forecast
+    """
+    dates = pd.DatetimeIndex(data['Date'])
+    y = np.asarray(data['Close'], dtype=np.float64)
+    returns = np.diff(np.log(y))
+    drift = returns.mean()
+
+    future = _future_dates(dates[-1], periods)
+    steps = _trading_steps(dates[-1], future)
+    rng = np.random.default_rng(seed)
+    paths = np.cumsum(rng.choice(returns, size=(n_paths, steps.max())), axis=1)
+    lower_q, upper_q = np.quantile(paths[:, steps - 1], [0.025, 0.975], axis=0)
+    forecast = y[-1] * np.exp(drift * steps)
+
+    # In-sample fit is the one-step drift forecast from the previous close
+    fitted = np.concatenate([[y[0]], y[:-1] * np.exp(drift)])
+    one_step = Z_95 * returns.std()
+    yhat = np.concatenate([fitted, forecast])
+    lower = np.concatenate([fitted * np.exp(-one_step), y[-1] * np.exp(lower_q)])
+    upper = np.concatenate([fitted * np.exp(one_step), y[-1] * np.exp(upper_q)])
+    return _frame(dates.append(future), yhat, lower, upper)
+
+
+# Engines offered on the Prediction page next to Prophet
+FAST_ENGINES: Dict[str, Callable[..., pd.DataFrame]] = {
+    'Linear Trend + Fourier Seasonality': linear_fourier_forecast,
+    'Holt-Winters': holt_winters_forecast,
+    'Drift (Bootstrap Intervals)': drift_forecast,
+}
@@ -0,0 +1,111 @@
+"""
+Figure Cache - Built Plotly figures reused across Streamlit reruns
+"""
+
+import json
+import threading
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.utils import PlotlyJSONEncoder
+
+from apps.instrumentation import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Number of figure sets (one page render each) kept in memory
+MAX_CACHED_FIGURE_SETS = 64
+
+
+def data_version(data: pd.DataFrame) -> tuple:
+    """
+    Cheap fingerprint of a price frame that changes whenever a bar is added or revised
+
+    Args:
+        data (pd.DataFrame): Price data with 'Date' and 'Close' columns
+
+    Returns:
+        tuple: (number of rows, last date, last close)
+    """
+    if data.empty:
+        return (0, None, None)
+    return (len(data), pd.Timestamp(data['Date'].iloc[-1]).isoformat(), float(data['Close'].iloc[-1]))
+
+
+def figure_to_spec(fig: go.Figure) -> str:
+    """
+    Serialize a figure the way st.plotly_chart does for a go.Figure (to_dict, then JSON without re-validation)
+
+    This is the cost every rerun still pays for a cached figure, and what the benchmarks measure.
+    """
+    return json.dumps(fig.to_dict(), cls=PlotlyJSONEncoder)
+
+
+class FigureCache:
+    """LRU cache of built figures, keyed by whatever determines the figures' content."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_FIGURE_SETS):
+        """
+        Initialize the figure cache
+
+        Args:
+            max_entries (int): Number of figure sets kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, go.Figure]]" = OrderedDict()
+        self._guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Dict[str, go.Figure]]) -> Dict[str, go.Figure]:
+        """
+        Return the figures for `key`, building them on a miss
+
+        The figures are passed to st.plotly_chart as go.Figure objects, which Streamlit
+        serializes without validating them again, so they must not be mutated after caching.
+
+        Args:
+            key (Hashable): Everything the figures depend on (ticker, range, parameters, data version)
+            build (Callable): Zero-argument function returning named figures
+
+        Returns:
+            Dict[str, go.Figure]: Figure name -> figure
+        """
+        with self._guard:
+            figures = self._entries.get(key)
+            if figures is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                count_cache('figures', hit=True)
+                return figures
+            self.misses += 1
+        count_cache('figures', hit=False)
+
+        figures = build()
+        with self._guard:
+            self._entries[key] = figures
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figures
+
+    def clear(self) -> None:
+        """Drop every cached figure"""
+        with self._guard:
+            self._entries.clear()
+
+
+_cache: Optional[FigureCache] = None
+_cache_guard = threading.Lock()
+
+
+def get_figure_cache() -> FigureCache:
+    """Return the process-wide figure cache"""
+    global _cache
+    with _cache_guard:
+        if _cache is None:
+            _cache = FigureCache()
+        return _cache
@@ -9,9 +9,19 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+from typing import Optional, Union
 import logging
 
 from apps.utils import get_ticker_selection, load_stock_data
+from apps.datastore import get_history_cache
+from apps.indicators import compute_indicators, DEFAULT_INDICATORS
+from apps.streaming import get_indicator_ledger
+from apps.downsample import DEFAULT_POINT_BUDGET, downsample_ohlcv, lttb
+from apps.figure_cache import data_version, get_figure_cache
+from apps.mmap_store import PriceArrays
+from apps.instrumentation import span
+from apps.resample import DAILY, INTERVALS, is_intraday
+from apps.live import render_live_panel
 
 logger = logging.getLogger(__name__)
 
@@ -19,59 +29,113 @@ logger = logging.getLogger(__name__)
 START_DATE = "2015-01-01"
 
 
-def calculate_macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+def _close_series(df) -> pd.Series:
+    """'Close' as a Series, for DataFrames and PriceArrays alike"""
+    if isinstance(df, pd.DataFrame):
+        return df['Close']
+    return pd.Series(np.asarray(df['Close'], dtype=np.float64), copy=False)
+
+
+def calculate_macd(df: Union[pd.DataFrame, PriceArrays], fast: int = 12, slow: int = 26,
+                   signal: int = 9) -> Union[pd.DataFrame, PriceArrays]:
     """
     Calculate MACD (Moving Average Convergence Divergence) indicators
     
     Args:
-        df (pd.DataFrame): Stock data with 'Close' column
+        df (pd.DataFrame | PriceArrays): Stock data with 'Close' column
         fast (int): Fast EMA period (default 12)
         slow (int): Slow EMA period (default 26)
         signal (int): Signal line EMA period (default 9)
     
     Returns:
-        pd.DataFrame: DataFrame with MACD, Signal, and Histogram columns
+        pd.DataFrame | PriceArrays: The input with MACD, Signal, and Histogram columns added
     """
-    df['EMA_fast'] = df['Close'].ewm(span=fast, adjust=False).mean()
-    df['EMA_slow'] = df['Close'].ewm(span=slow, adjust=False).mean()
-    df['MACD'] = df['EMA_fast'] - df['EMA_slow']
-    df['Signal'] = df['MACD'].ewm(span=signal, adjust=False).mean()
-    df['Histogram'] = df['MACD'] - df['Signal']
-    df['Hist-Color'] = np.where(df['Histogram'] < 0, 'red', 'green')
+    close = _close_series(df)
+    ema_fast = close.ewm(span=fast, adjust=False).mean()
+    ema_slow = close.ewm(span=slow, adjust=False).mean()
+    macd_line = ema_fast - ema_slow
+    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+    histogram = (macd_line - signal_line).to_numpy()
+    df['EMA_fast'] = ema_fast.to_numpy()
+    df['EMA_slow'] = ema_slow.to_numpy()
+    df['MACD'] = macd_line.to_numpy()
+    df['Signal'] = signal_line.to_numpy()
+    df['Histogram'] = histogram
+    df['Hist-Color'] = np.where(histogram < 0, 'red', 'green')
     return df
 
 
-def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+def calculate_rsi(df: Union[pd.DataFrame, PriceArrays], period: int = 14) -> Union[pd.DataFrame, PriceArrays]:
     """
     Calculate RSI (Relative Strength Index)
     
     Args:
-        df (pd.DataFrame): Stock data with 'Close' column
+        df (pd.DataFrame | PriceArrays): Stock data with 'Close' column
         period (int): RSI period (default 14)
     
     Returns:
-        pd.DataFrame: DataFrame with RSI column
+        pd.DataFrame | PriceArrays: The input with an RSI column added
     """
-    delta = df['Close'].diff()
+    delta = _close_series(df).diff()
     gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
     loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
     
     rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
+    df['RSI'] = (100 - (100 / (1 + rs))).to_numpy()
     return df
 
 
-def plot_candlestick(df: pd.DataFrame, ticker: str) -> go.Figure:
+def load_indicators(ticker: str, data: pd.DataFrame, interval: str = DAILY) -> pd.DataFrame:
+    """
+    Compute dashboard indicators for a loaded date range
+    
+    For daily bars, when the range starts at the first stored bar, the
+    incrementally maintained full-history series is reused so only newly arrived
+    bars are processed. Otherwise the indicators are computed over the selected
+    range, which works the same at any bar interval.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        data (pd.DataFrame): Stock data with 'Date' and 'Close' columns
+        interval (str): Bar interval of `data`
+    
+    Returns:
+        pd.DataFrame: Indicator block with a leading 'Date' column
+    """
+    indicators = None
+    try:
+        history = get_history_cache().get_history(ticker) if interval == DAILY else None
+        if history is not None and len(history) and data['Date'].iloc[0] == history['Date'].iloc[0]:
+            series = get_indicator_ledger().sync(ticker, history)
+            indicators = series.iloc[:len(data)].reset_index(drop=True)
+            indicators.index = data.index
+    except Exception as e:
+        logger.warning(f"Falling back to full indicator computation for {ticker}: {str(e)}")
+    
+    if indicators is None:
+        indicators = compute_indicators(data, DEFAULT_INDICATORS)
+    indicators.insert(0, 'Date', data['Date'].to_numpy())
+    return indicators
+
+
+def plot_candlestick(df: Union[pd.DataFrame, PriceArrays], ticker: str, max_points: Optional[int] = None,
+                     interval: str = DAILY) -> go.Figure:
     """
     Create candlestick chart with volume subplot
     
     Args:
-        df (pd.DataFrame): Stock OHLCV data
+        df (pd.DataFrame | PriceArrays): Stock OHLCV data
         ticker (str): Stock ticker symbol
+        max_points (int): Candle budget; longer ranges are bucketed into coarser candles
+        interval (str): Bar interval of `df`
     
     Returns:
         go.Figure: Plotly figure object
     """
+    df, frequency = downsample_ohlcv(df, max_points, interval)
+    dates = np.asarray(df['Date'])
+    open_, close = np.asarray(df['Open']), np.asarray(df['Close'])
+    
     fig = make_subplots(
         rows=2, cols=1,
         shared_xaxes=True,
@@ -83,11 +147,11 @@ def plot_candlestick(df: pd.DataFrame, ticker: str) -> go.Figure:
     # Candlestick trace
     fig.add_trace(
         go.Candlestick(
-            x=df['Date'],
-            open=df['Open'],
-            high=df['High'],
-            low=df['Low'],
-            close=df['Close'],
+            x=dates,
+            open=open_,
+            high=np.asarray(df['High']),
+            low=np.asarray(df['Low']),
+            close=close,
             name='OHLC',
             increasing_line_color='green',
             decreasing_line_color='red'
@@ -96,12 +160,11 @@ def plot_candlestick(df: pd.DataFrame, ticker: str) -> go.Figure:
     )
     
     # Volume trace
-    colors = ['red' if df['Close'].iloc[i] < df['Open'].iloc[i] else 'green' 
-              for i in range(len(df))]
+    colors = np.where(close < open_, 'red', 'green')
     fig.add_trace(
         go.Bar(
-            x=df['Date'],
-            y=df['Volume'],
+            x=dates,
+            y=np.asarray(df['Volume']),
             marker=dict(color=colors, line=dict(width=0)),
             name='Volume',
             showlegend=False
@@ -115,7 +178,7 @@ def plot_candlestick(df: pd.DataFrame, ticker: str) -> go.Figure:
     
     fig.update_layout(
         height=600,
-        title_text=f'{ticker} - Candlestick Chart with Volume',
+        title_text=f'{ticker} - Candlestick Chart with Volume' + (f' ({frequency} Candles)' if frequency != 'Daily' else ''),
         hovermode='x unified',
         xaxis_rangeslider_visible=False
     )
@@ -123,39 +186,44 @@ def plot_candlestick(df: pd.DataFrame, ticker: str) -> go.Figure:
     return fig
 
 
-def plot_macd_subplot(df: pd.DataFrame) -> go.Figure:
+def plot_macd_subplot(df: Union[pd.DataFrame, PriceArrays], max_points: Optional[int] = None) -> go.Figure:
     """
     Create MACD subplot
     
     Args:
-        df (pd.DataFrame): Stock data with MACD indicators
+        df (pd.DataFrame | PriceArrays): Stock data with MACD indicators
+        max_points (int): Point budget per trace; longer series are reduced with LTTB
     
     Returns:
         go.Figure: Plotly figure object
     """
     fig = go.Figure()
     
-    # Histogram
+    # Histogram (colors derived from the sign, so they follow the downsampled bars)
+    dates = np.asarray(df['Date'])
+    hist_x, hist_y = lttb(dates, np.asarray(df['Histogram']), max_points)
     fig.add_trace(go.Bar(
-        x=df['Date'],
-        y=df['Histogram'],
-        marker_color=df['Hist-Color'],
+        x=hist_x,
+        y=hist_y,
+        marker_color=np.where(hist_y < 0, 'red', 'green'),
         name='Histogram',
         showlegend=True
     ))
     
     # MACD line
+    macd_x, macd_y = lttb(dates, np.asarray(df['MACD']), max_points)
     fig.add_trace(go.Scatter(
-        x=df['Date'],
-        y=df['MACD'],
+        x=macd_x,
+        y=macd_y,
         name='MACD',
         line=dict(color='darkorange', width=2.5)
     ))
     
     # Signal line
+    signal_x, signal_y = lttb(dates, np.asarray(df['Signal']), max_points)
     fig.add_trace(go.Scatter(
-        x=df['Date'],
-        y=df['Signal'],
+        x=signal_x,
+        y=signal_y,
         name='Signal',
         line=dict(color='cyan', width=2.5)
     ))
@@ -171,12 +239,13 @@ def plot_macd_subplot(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def plot_rsi_subplot(df: pd.DataFrame) -> go.Figure:
+def plot_rsi_subplot(df: Union[pd.DataFrame, PriceArrays], max_points: Optional[int] = None) -> go.Figure:
     """
     Create RSI subplot
     
     Args:
-        df (pd.DataFrame): Stock data with RSI
+        df (pd.DataFrame | PriceArrays): Stock data with RSI
+        max_points (int): Point budget; longer series are reduced with LTTB
     
     Returns:
         go.Figure: Plotly figure object
@@ -184,9 +253,11 @@ def plot_rsi_subplot(df: pd.DataFrame) -> go.Figure:
     fig = go.Figure()
     
     # RSI line
+    rsi = np.asarray(df['RSI'])[30:]
+    rsi_x, rsi_y = lttb(np.asarray(df['Date'])[30:], rsi, max_points)
     fig.add_trace(go.Scatter(
-        x=df['Date'].iloc[30:],
-        y=df['RSI'].iloc[30:],
+        x=rsi_x,
+        y=rsi_y,
         name='RSI',
         line=dict(color='gold', width=2)
     ))
@@ -197,8 +268,11 @@ def plot_rsi_subplot(df: pd.DataFrame) -> go.Figure:
     fig.add_hline(y=30, line_dash='dash', line_color='green',
                   annotation_text='Oversold (30)', annotation_position='right')
     
-    ymin = 25 if df['RSI'].iloc[30:].min() > 25 else df['RSI'].iloc[30:].min() - 5
-    ymax = 75 if df['RSI'].iloc[30:].max() < 75 else df['RSI'].iloc[30:].max() + 5
+    # Ranges of 30 bars or fewer leave no RSI values to fit the axis to
+    ymin, ymax = 25, 75
+    if rsi.size and np.isfinite(rsi).any():
+        ymin = 25 if np.nanmin(rsi) > 25 else np.nanmin(rsi) - 5
+        ymax = 75 if np.nanmax(rsi) < 75 else np.nanmax(rsi) + 5
     
     fig.update_layout(
         title='RSI (Relative Strength Index)',
@@ -212,6 +286,30 @@ def plot_rsi_subplot(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+def build_dashboard_figures(ticker: str, data: pd.DataFrame, max_points: Optional[int] = None,
+                            interval: str = DAILY) -> dict:
+    """
+    Compute indicators and build the page's candlestick, MACD and RSI figures
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        data (pd.DataFrame): Stock OHLCV data with a 'Date' column
+        max_points (int): Point budget per trace (None sends every bar)
+        interval (str): Bar interval of `data`
+    
+    Returns:
+        dict: Figures keyed 'candlestick', 'macd' and 'rsi'
+    """
+    with span('dashboard.indicators', 'compute'):
+        indicators = load_indicators(ticker, data, interval)
+    with span('dashboard.build_figures', 'figure'):
+        return {
+            'candlestick': plot_candlestick(data, ticker, max_points, interval),
+            'macd': plot_macd_subplot(indicators, max_points),
+            'rsi': plot_rsi_subplot(indicators, max_points),
+        }
+
+
 def app():
     """Main finance dashboard app"""
     
@@ -229,8 +327,8 @@ def app():
     # Get user inputs
     ticker = get_ticker_selection()
     
-    # Date range selector
-    col1, col2 = st.columns(2)
+    # Date range and bar interval selectors
+    col1, col2, col3 = st.columns(3)
     with col1:
         start_date = st.date_input(
             "Start Date",
@@ -243,14 +341,26 @@ def app():
             value=datetime.now(),
             help="Select data end date"
         )
+    with col3:
+        interval = st.selectbox(
+            "Bar Interval",
+            list(INTERVALS),
+            index=list(INTERVALS).index(DAILY),
+            format_func=INTERVALS.get,
+            help="Intraday bars reach back as far as Yahoo Finance serves them (7 days of 1-minute bars, "
+                 "60 days of 5-minute bars, 2 years of hourly bars)"
+        )
+    # Intraday ranges include the end date's session
+    range_end = end_date + timedelta(days=1) if is_intraday(interval) else end_date
     
     # Load data
-    with st.spinner(f'Loading {ticker} data...'):
+    with st.spinner(f'Loading {ticker} data...'), span('dashboard.load_prices', 'load'):
         try:
             data = load_stock_data(
                 ticker,
                 start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+                range_end.strftime("%Y-%m-%d"),
+                interval
             )
         except Exception as e:
             st.error(f"Failed to load data: {str(e)}")
@@ -259,38 +369,48 @@ def app():
     # Display data summary
     st.subheader('📊 Data Summary')
     
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Current Price", f"${data['Close'].iloc[-1]:.2f}")
-    with col2:
-        st.metric("High (52w)", f"${data['High'].max():.2f}")
-    with col3:
-        st.metric("Low (52w)", f"${data['Low'].min():.2f}")
-    with col4:
-        st.metric("Avg Volume", f"{data['Volume'].mean():,.0f}")
-    
-    # Display raw data
-    with st.expander("View Raw Data"):
-        st.dataframe(data.head(10), use_container_width=True)
+    with span('dashboard.emit_summary', 'emit'):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Current Price", f"${data['Close'].iloc[-1]:.2f}")
+        with col2:
+            st.metric("High (52w)", f"${data['High'].max():.2f}")
+        with col3:
+            st.metric("Low (52w)", f"${data['Low'].min():.2f}")
+        with col4:
+            st.metric("Avg Volume", f"{data['Volume'].mean():,.0f}")
+        
+        # Display raw data
+        with st.expander("View Raw Data"):
+            st.dataframe(data.head(10), use_container_width=True)
     
     st.markdown("---")
     
-    # Calculate indicators
-    data = calculate_macd(data)
-    data = calculate_rsi(data)
-    
-    # Display charts
-    st.subheader('📈 Price Chart')
-    candlestick_fig = plot_candlestick(data, ticker)
-    st.plotly_chart(candlestick_fig, use_container_width=True)
-    
-    st.subheader('🎯 MACD Indicator')
-    macd_fig = plot_macd_subplot(data)
-    st.plotly_chart(macd_fig, use_container_width=True)
-    
-    st.subheader('📊 RSI Indicator')
-    rsi_fig = plot_rsi_subplot(data)
-    st.plotly_chart(rsi_fig, use_container_width=True)
+    # Long ranges are downsampled to a point budget; narrow the date range to see every bar
+    full_resolution = st.checkbox(
+        'Full-resolution charts',
+        value=False,
+        help=f"Send every bar to the browser. Otherwise ranges longer than {DEFAULT_POINT_BUDGET} bars "
+             "are shown as coarser candles and downsampled indicator lines."
+    )
+    max_points = None if full_resolution else DEFAULT_POINT_BUDGET
+    
+    # Indicators and figures are reused until the ticker, range, parameters or data change
+    figure_key = (ticker, interval, start_date.isoformat(), end_date.isoformat(), max_points,
+                  tuple(DEFAULT_INDICATORS), data_version(data))
+    figures = get_figure_cache().get_or_build(
+        figure_key, lambda: build_dashboard_figures(ticker, data, max_points, interval))
+    
+    # Display charts (st.plotly_chart serializes cached figures without validating them again)
+    with span('dashboard.emit_charts', 'emit'):
+        st.subheader('📈 Price Chart')
+        st.plotly_chart(figures['candlestick'], use_container_width=True)
+        
+        st.subheader('🎯 MACD Indicator')
+        st.plotly_chart(figures['macd'], use_container_width=True)
+        
+        st.subheader('📊 RSI Indicator')
+        st.plotly_chart(figures['rsi'], use_container_width=True)
     
     st.markdown("---")
     st.info(
@@ -298,3 +418,9 @@ def app():
         "- **MACD**: Identifies momentum and trend direction\n"
         "- **RSI**: Measures overbought (>70) and oversold (<30) conditions"
     )
+    
+    # Live mode streams quotes into its own charts below; the rest of the page is not rerun
+    if st.checkbox('Live quotes', value=False,
+                   help="Stream quotes into live price, MACD and RSI charts, updated in place about once a second"):
+        st.subheader(f'🔴 Live {ticker}')
+        render_live_panel(ticker, data, interval)
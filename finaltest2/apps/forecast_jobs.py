@@ -0,0 +1,230 @@
+"""
+Forecast Jobs - Background Prophet fits on a bounded process pool, shared by all sessions
+"""
+
+import os
+import time
+import uuid
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, NamedTuple, Optional
+
+import pandas as pd
+
+from apps.datastore import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent Prophet fits; each fit keeps one core busy
+FORECAST_MAX_WORKERS = int(os.environ.get("FORECAST_MAX_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+
+# How long finished jobs stay available to polling sessions
+FINISHED_JOB_TTL = 600
+
+
+class JobKey(NamedTuple):
+    """Identity used to deduplicate identical forecast requests across sessions"""
+    ticker: str
+    trained_through: str
+    periods: int
+    yearly_seasonality: bool
+    weekly_seasonality: bool
+
+
+@dataclass
+class ForecastJob:
+    """A submitted forecast job and its lifecycle timestamps"""
+    job_id: str
+    key: JobKey
+    future: Future
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+@dataclass
+class JobStatus:
+    """
+    Snapshot of a job for rendering
+
+    Attributes:
+        state (str): 'queued', 'running', 'done', 'failed' or 'unknown'
+        progress (float): Estimated completion in [0, 1]
+        elapsed (float): Seconds since submission
+        error (str): Error message for failed jobs
+    """
+    state: str
+    progress: float = 0.0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def run_forecast_job(ticker: str, data: pd.DataFrame, periods: int, yearly_seasonality: bool,
+                     weekly_seasonality: bool, data_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Fit (or load) a model and predict; runs inside a worker process
+
+    The fitted model is written to the shared on-disk model cache, so the caller
+    can load it without shipping the model back through the pool.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        data (pd.DataFrame): Historical data with 'Date' and 'Close' columns
+        periods (int): Number of days to forecast
+        yearly_seasonality (bool): Enable yearly seasonality
+        weekly_seasonality (bool): Enable weekly seasonality
+        data_dir (str): Root data folder of the model cache
+
+    Returns:
+        pd.DataFrame: Prophet forecast frame
+    """
+    from apps.model_cache import ProphetModelCache, get_or_fit_model
+
+    cache = ProphetModelCache(root=data_dir)
+    model = get_or_fit_model(ticker, data, yearly_seasonality, weekly_seasonality, cache=cache)
+    future = model.make_future_dataframe(periods=periods)
+    return model.predict(future)
+
+
+class ForecastJobQueue:
+    """Process pool accepting forecast jobs, deduplicating identical in-flight requests."""
+
+    def __init__(self, max_workers: int = FORECAST_MAX_WORKERS, data_dir: Optional[str] = None):
+        """
+        Initialize the job queue
+
+        Args:
+            max_workers (int): Maximum number of concurrent worker processes
+            data_dir (str): Root data folder shared with the workers
+        """
+        self.max_workers = max(1, max_workers)
+        self.data_dir = data_dir or DATA_DIR
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._jobs: Dict[str, ForecastJob] = {}
+        self._by_key: Dict[JobKey, str] = {}
+        self._guard = threading.Lock()
+        self._typical_duration = 10.0
+        self._model_cache = None
+
+    def submit(self, ticker: str, data: pd.DataFrame, periods: int, yearly_seasonality: bool = True,
+               weekly_seasonality: bool = True) -> str:
+        """
+        Submit a forecast, or join an identical job that is in flight or recently finished
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (pd.DataFrame): Historical data with 'Date' and 'Close' columns
+            periods (int): Number of days to forecast
+            yearly_seasonality (bool): Enable yearly seasonality
+            weekly_seasonality (bool): Enable weekly seasonality
+
+        Returns:
+            str: Job id to poll with status() and result()
+        """
+        key = JobKey(ticker, pd.Timestamp(data['Date'].max()).strftime("%Y-%m-%d"), int(periods),
+                     bool(yearly_seasonality), bool(weekly_seasonality))
+        with self._guard:
+            self._expire()
+            job_id = self._by_key.get(key)
+            if job_id is not None:
+                job = self._jobs[job_id]
+                if not (job.future.done() and job.future.exception() is not None):
+                    return job_id
+
+            job_id = uuid.uuid4().hex
+            future = self._executor.submit(run_forecast_job, ticker, data[['Date', 'Close']].copy(), int(periods),
+                                           bool(yearly_seasonality), bool(weekly_seasonality), self.data_dir)
+            job = ForecastJob(job_id=job_id, key=key, future=future)
+            future.add_done_callback(lambda _, job=job: self._finish(job))
+            self._jobs[job_id] = job
+            self._by_key[key] = job_id
+            logger.info(f"Queued forecast job {job_id} for {key}")
+            return job_id
+
+    def _finish(self, job: ForecastJob) -> None:
+        job.finished_at = time.time()
+        if job.future.exception() is None and job.started_at is not None:
+            duration = job.finished_at - job.started_at
+            self._typical_duration = 0.8 * self._typical_duration + 0.2 * duration
+
+    def _expire(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > FINISHED_JOB_TTL:
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) == job_id:
+                    del self._by_key[job.key]
+
+    def status(self, job_id: str) -> JobStatus:
+        """
+        Report the state and estimated progress of a job
+
+        Args:
+            job_id (str): Id returned by submit()
+
+        Returns:
+            JobStatus: Current job status
+        """
+        with self._guard:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return JobStatus(state='unknown')
+
+        now = time.time()
+        elapsed = now - job.submitted_at
+        if job.future.done():
+            error = job.future.exception()
+            if error is not None:
+                return JobStatus(state='failed', progress=1.0, elapsed=elapsed, error=str(error))
+            return JobStatus(state='done', progress=1.0, elapsed=elapsed)
+        if job.future.running():
+            if job.started_at is None:
+                job.started_at = now
+            progress = min(0.95, (now - job.started_at) / self._typical_duration)
+            return JobStatus(state='running', progress=progress, elapsed=elapsed)
+        return JobStatus(state='queued', elapsed=elapsed)
+
+    def result(self, job_id: str):
+        """
+        Return the (model, forecast) pair of a finished job
+
+        Args:
+            job_id (str): Id of a job whose status is 'done'
+
+        Returns:
+            tuple: Fitted Prophet model and forecast frame
+
+        Raises:
+            KeyError: If the job is unknown or expired
+        """
+        from apps.model_cache import ModelKey, ProphetModelCache, get_model_cache
+
+        with self._guard:
+            job = self._jobs[job_id]
+        forecast = job.future.result()
+        if self._model_cache is None:
+            self._model_cache = get_model_cache() if self.data_dir == DATA_DIR else ProphetModelCache(self.data_dir)
+        model_key = ModelKey(job.key.ticker, job.key.trained_through,
+                             job.key.yearly_seasonality, job.key.weekly_seasonality)
+        return self._model_cache.get(model_key), forecast
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and release the worker processes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_queue: Optional[ForecastJobQueue] = None
+_queue_guard = threading.Lock()
+
+
+def get_job_queue() -> ForecastJobQueue:
+    """Return the process-wide forecast job queue"""
+    global _queue
+    with _queue_guard:
+        if _queue is None:
+            _queue = ForecastJobQueue()
+        return _queue
@@ -4,11 +4,15 @@ Home Page - Market Trends and Financial News
 
 import streamlit as st
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from typing import Optional
+from typing import Dict, Optional
 import logging
 
+from apps.market_data import get_market_data
+from apps.home_feed import FEED_TIMEOUT, FeedSnapshot, FeedSource, HomeFeed
+from apps.http_client import get_http_client
+from apps.html_parsing import first_table, article_headlines
+from apps.instrumentation import counted_cache, span
+
 logger = logging.getLogger(__name__)
 
 # Website URLs for web scraping
@@ -22,56 +26,112 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 }
 
+# Seconds scraped tables and news stay fresh before a background refresh
+SCRAPE_TTL = 1800
 
-@st.cache_data(ttl=1800)
-def parse_yahoo_finance(url: str) -> Optional[pd.DataFrame]:
+# Longest a cold process waits for its first fetch before rendering placeholders
+FIRST_LOAD_WAIT = 3.0
+
+
+def parse_trend_table(html: str) -> Optional[pd.DataFrame]:
     """
-    Parse Yahoo Finance website for stock market data
+    Extract and clean the top 5 rows of a Yahoo Finance screener table
+    
+    Only the first table's leading rows are parsed; the rest of the page is skipped.
     
     Args:
-        url (str): Yahoo Finance URL
+        html (str): Yahoo Finance page HTML
     
     Returns:
-        Optional[pd.DataFrame]: DataFrame with top 5 stocks or None if error
+        Optional[pd.DataFrame]: DataFrame with top 5 stocks or None if the page has no table
     """
-    try:
-        page = requests.get(url, headers=HEADERS, timeout=10)
-        page.raise_for_status()
-        
-        # Read HTML tables
-        tables = pd.read_html(page.text)
-        if not tables:
-            st.warning("No data found from Yahoo Finance")
-            return None
-        
-        stocks = tables[0].head(5)
-        
-        # Normalize column names
-        stocks.columns = [col.replace(' ', '_').strip() for col in stocks.columns]
-        
-        # Drop commonly problematic columns if they exist
-        cols_to_drop = [
-            col for col in stocks.columns 
-            if any(x in col for x in ['52_Wk', 'P/E', 'Ratio', 'Range'])
-        ]
-        stocks = stocks.drop(columns=cols_to_drop, errors='ignore')
-        
-        return stocks
+    stocks = first_table(html, max_rows=5)
+    if stocks is None:
+        return None
+    
+    # Normalize column names
+    stocks.columns = [str(col).replace(' ', '_').strip() for col in stocks.columns]
+    
+    # Drop commonly problematic columns if they exist
+    cols_to_drop = [
+        col for col in stocks.columns 
+        if any(x in col for x in ['52_Wk', 'P/E', 'Ratio', 'Range'])
+    ]
+    return stocks.drop(columns=cols_to_drop, errors='ignore')
+
+
+def parse_news_headlines(html: str) -> Optional[pd.DataFrame]:
+    """
+    Extract the top 5 headlines from a Google News page
+    
+    Parsing stops once five distinct article headlines have been read.
     
-    except requests.exceptions.RequestException as e:
+    Args:
+        html (str): Google News page HTML
+    
+    Returns:
+        Optional[pd.DataFrame]: DataFrame with a 'Headlines' column or None if none were found
+    """
+    headlines = article_headlines(html, max_headlines=5)
+    if not headlines:
+        return None
+    
+    return pd.DataFrame(headlines, columns=['Headlines'])
+
+
+def fetch_page(url: str) -> Optional[str]:
+    """
+    Fetch a page through the shared HTTP client
+    
+    Args:
+        url (str): Page URL
+    
+    Returns:
+        Optional[str]: Response text or None if the request failed
+    """
+    try:
+        response = get_http_client().get(url, headers=HEADERS, timeout=FEED_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+    except Exception as e:
         logger.error(f"Request failed for {url}: {str(e)}")
         st.error(f"Failed to fetch data: {str(e)}")
         return None
+
+
+def parse_yahoo_finance(url: str) -> Optional[pd.DataFrame]:
+    """
+    Fetch a Yahoo Finance screener page and parse its top 5 stocks
+    
+    The Home page reads these tables from the background feed; this fetches a
+    single page on demand.
+    
+    Args:
+        url (str): Yahoo Finance URL
+    
+    Returns:
+        Optional[pd.DataFrame]: DataFrame with top 5 stocks or None if error
+    """
+    html = fetch_page(url)
+    if html is None:
+        return None
+    try:
+        stocks = parse_trend_table(html)
     except Exception as e:
         logger.error(f"Error parsing Yahoo Finance: {str(e)}")
         st.error(f"Error parsing data: {str(e)}")
         return None
+    if stocks is None:
+        st.warning("No data found from Yahoo Finance")
+    return stocks
 
 
-@st.cache_data(ttl=1800)
 def get_latest_news(url: str) -> Optional[pd.DataFrame]:
     """
-    Scrape latest financial news from Google News
+    Fetch a Google News page and parse its top 5 headlines
+    
+    The Home page reads the news from the background feed; this fetches a
+    single page on demand.
     
     Args:
         url (str): Google News URL
@@ -79,40 +139,47 @@ def get_latest_news(url: str) -> Optional[pd.DataFrame]:
     Returns:
         Optional[pd.DataFrame]: DataFrame with top 5 news headlines or None
     """
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract article headlines (Google News selector may change)
-        articles = soup.find_all('article')
-        headlines = set()
-        
-        for article in articles:
-            try:
-                headline = article.find('h3')
-                if headline:
-                    headlines.add(headline.get_text(strip=True))
-            except Exception as e:
-                logger.warning(f"Error extracting headline: {str(e)}")
-                continue
-        
-        if not headlines:
-            st.info("Unable to fetch current news headlines")
-            return None
-        
-        df = pd.DataFrame(list(headlines)[:5], columns=['Headlines'])
-        return df
-    
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to fetch news: {str(e)}")
-        st.error(f"Failed to fetch news: {str(e)}")
+    html = fetch_page(url)
+    if html is None:
         return None
+    try:
+        news = parse_news_headlines(html)
     except Exception as e:
         logger.error(f"Error fetching news: {str(e)}")
         st.error(f"Error fetching news: {str(e)}")
         return None
+    if news is None:
+        st.info("Unable to fetch current news headlines")
+    return news
+
+
+FEED_SOURCES: Dict[str, FeedSource] = {
+    'most_active': (YAHOO_MOST_ACTIVE, parse_trend_table),
+    'gainers': (YAHOO_GAINERS, parse_trend_table),
+    'losers': (YAHOO_LOSERS, parse_trend_table),
+    'news': (GOOGLE_NEWS_FINANCE, parse_news_headlines),
+}
+
+
+@counted_cache('home_feed_resource', st.cache_resource(show_spinner=False))
+def get_home_feed() -> HomeFeed:
+    """
+    Start the process-wide feed that fetches all Home page sources concurrently
+    
+    Returns:
+        HomeFeed: Feed refreshed in the background on SCRAPE_TTL
+    """
+    feed = HomeFeed(FEED_SOURCES, ttl=SCRAPE_TTL, headers=HEADERS, service=get_market_data())
+    feed.start()
+    return feed
+
+
+def show_updated(snapshot: FeedSnapshot) -> None:
+    """Caption a rendered source with its age, noting a failed revalidation"""
+    caption = f"Updated {snapshot.age / 60:.0f} min ago"
+    if snapshot.error:
+        caption += f" (refresh failed: {snapshot.error})"
+    st.caption(caption)
 
 
 def app():
@@ -131,6 +198,12 @@ def app():
     ___
     ''')
     
+    # All sources are fetched concurrently; a cold process waits briefly for the first results
+    feed = get_home_feed()
+    if all(feed.snapshot(name).fetched_at is None for name in FEED_SOURCES):
+        with span('home.first_load_wait', 'load'):
+            feed.wait(FIRST_LOAD_WAIT)
+    
     # Market Trends Section
     st.header("📈 Latest Market Trends")
     
@@ -149,49 +222,44 @@ def app():
             if st.button("📉 Top Losers", use_container_width=True):
                 st.session_state.trend_selected = "losers"
     
-    # Display selected trend data
+    # Display selected trend data (served from the feed's latest snapshot)
     if 'trend_selected' in st.session_state:
         selected_trend = st.session_state.trend_selected
+        titles = {
+            "most_active": "🔥 Most Active Stocks",
+            "gainers": "📈 Top Gainers",
+            "losers": "📉 Top Losers",
+        }
+        st.subheader(titles[selected_trend])
         
-        if selected_trend == "most_active":
-            st.subheader("🔥 Most Active Stocks")
-            with st.spinner("Loading most active stocks..."):
-                data = parse_yahoo_finance(YAHOO_MOST_ACTIVE)
-                if data is not None:
-                    st.dataframe(data, use_container_width=True)
-        
-        elif selected_trend == "gainers":
-            st.subheader("📈 Top Gainers")
-            with st.spinner("Loading top gainers..."):
-                data = parse_yahoo_finance(YAHOO_GAINERS)
-                if data is not None:
-                    st.dataframe(data, use_container_width=True)
-        
-        elif selected_trend == "losers":
-            st.subheader("📉 Top Losers")
-            with st.spinner("Loading top losers..."):
-                data = parse_yahoo_finance(YAHOO_LOSERS)
-                if data is not None:
-                    st.dataframe(data, use_container_width=True)
+        snapshot = feed.snapshot(selected_trend)
+        if snapshot.value is not None:
+            with span('home.emit_trends', 'emit'):
+                st.dataframe(snapshot.value, use_container_width=True)
+            show_updated(snapshot)
+        elif snapshot.error:
+            st.error(f"Failed to fetch data: {snapshot.error}")
+        else:
+            st.info("Market data is still loading. Please refresh in a moment.")
     
     st.markdown("---")
     
     # Latest News Section
     st.header("📰 Latest Financial News")
     
-    with st.spinner("Fetching latest news..."):
-        news_df = get_latest_news(GOOGLE_NEWS_FINANCE)
-        
-        if news_df is not None:
-            for idx, headline in enumerate(news_df['Headlines'], 1):
+    news = feed.snapshot('news')
+    if news.value is not None:
+        with span('home.emit_news', 'emit'):
+            for idx, headline in enumerate(news.value['Headlines'], 1):
                 st.write(f"{idx}. {headline}")
-            
-            st.markdown(
-                "[📄 Read More Finance News](https://news.google.com/search?q=finance)",
-                unsafe_allow_html=True
-            )
-        else:
-            st.info("Unable to load news at this moment. Please try again later.")
+        show_updated(news)
+        
+        st.markdown(
+            "[📄 Read More Finance News](https://news.google.com/search?q=finance)",
+            unsafe_allow_html=True
+        )
+    else:
+        st.info("Unable to load news at this moment. Please try again later.")
     
     st.markdown("---")
     st.info(
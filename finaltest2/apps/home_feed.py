@@ -0,0 +1,196 @@
+"""
+Home Feed - Concurrent, background-refreshed fetching of the Home page tables and news
+
+Sessions read the latest snapshot of every source without waiting on the
+network; stale sources are refreshed on a thread pool (stale-while-revalidate) through the
+shared HTTP client.
+"""
+
+import time
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from apps.http_client import get_http_client
+from apps.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched source stays fresh
+FEED_TTL = 1800
+
+# Per-request timeout in seconds
+FEED_TIMEOUT = 10
+
+# How often the background refresher checks for stale sources
+REFRESH_CHECK_INTERVAL = 60.0
+
+# Seconds before a source whose refresh failed is tried again
+RETRY_AFTER_FAILURE = 60.0
+
+# A source is (url, parser of the response text returning None when nothing was found)
+FeedSource = Tuple[str, Callable[[str], Optional[pd.DataFrame]]]
+
+
+@dataclass
+class FeedSnapshot:
+    """
+    Latest known state of one source
+
+    Attributes:
+        value (pd.DataFrame): Last successfully parsed value (None until the first success)
+        fetched_at (float): Epoch seconds of that fetch
+        error (str): Message of the most recent failed refresh, cleared on success
+        failed_at (float): Epoch seconds of that failure
+    """
+    value: Optional[pd.DataFrame] = None
+    fetched_at: Optional[float] = None
+    error: Optional[str] = None
+    failed_at: Optional[float] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the value was fetched"""
+        return None if self.fetched_at is None else time.time() - self.fetched_at
+
+
+class HomeFeed:
+    """Snapshots of several web sources, refreshed concurrently in the background."""
+
+    def __init__(self, sources: Dict[str, FeedSource], ttl: float = FEED_TTL, timeout: float = FEED_TIMEOUT,
+                 headers: Optional[Dict[str, str]] = None, session=None, service=None):
+        """
+        Initialize the feed
+
+        Args:
+            sources (Dict[str, FeedSource]): Source name -> (url, parser)
+            ttl (float): Seconds a fetched source stays fresh
+            timeout (float): Per-request timeout in seconds
+            headers (Dict[str, str]): Request headers
+            session: Object with a requests-style get (defaults to the shared HTTP client)
+            service (MarketDataService): Optional shared cache, so replicas fetch each source once
+        """
+        self.sources = dict(sources)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.headers = headers
+        self.session = session or get_http_client()
+        self.service = service
+        self._executor = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="home-feed")
+        self._snapshots: Dict[str, FeedSnapshot] = {name: FeedSnapshot() for name in self.sources}
+        self._inflight: Dict[str, Future] = {}
+        self._guard = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def _download(self, name: str) -> Optional[Tuple[pd.DataFrame, float]]:
+        url, parse = self.sources[name]
+        with span('home_feed.download', 'load'):
+            response = self.session.get(url, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
+        with span('home_feed.parse', 'compute'):
+            value = parse(response.text)
+        return (value, time.time()) if value is not None else None
+
+    def _fetch(self, name: str) -> Optional[Tuple[pd.DataFrame, float]]:
+        if self.service is None:
+            return self._download(name)
+        url, _ = self.sources[name]
+        return self.service.get_or_fetch(f"feed:{url}", lambda: self._download(name), ttl=self.ttl)
+
+    def _refresh_one(self, name: str) -> None:
+        """Fetch one source and record the outcome; runs on the worker pool"""
+        try:
+            result, error = self._fetch(name), None
+        except Exception as e:
+            logger.error(f"Refreshing {name} failed: {str(e)}")
+            result, error = None, str(e)
+        with self._guard:
+            self._inflight.pop(name, None)
+            snapshot = self._snapshots[name]
+            if result is not None:
+                self._snapshots[name] = FeedSnapshot(*result)
+            else:
+                self._snapshots[name] = FeedSnapshot(snapshot.value, snapshot.fetched_at,
+                                                     error or "No data found", time.time())
+
+    def _is_stale(self, snapshot: FeedSnapshot) -> bool:
+        if snapshot.failed_at is not None and time.time() - snapshot.failed_at < RETRY_AFTER_FAILURE:
+            return False
+        return snapshot.fetched_at is None or snapshot.age >= self.ttl
+
+    def refresh(self, names: Optional[Iterable[str]] = None, force: bool = False) -> List[Future]:
+        """
+        Start fetching stale sources concurrently (without waiting for them)
+
+        Args:
+            names (Iterable[str]): Sources to refresh (defaults to all)
+            force (bool): Refresh even fresh sources
+
+        Returns:
+            List[Future]: Pending fetches, including ones already in flight
+        """
+        futures = []
+        with self._guard:
+            for name in names if names is not None else self.sources:
+                future = self._inflight.get(name)
+                if future is None and (force or self._is_stale(self._snapshots[name])):
+                    # The worker records its own result, so a finished future means an updated snapshot
+                    future = self._executor.submit(self._refresh_one, name)
+                    self._inflight[name] = future
+                if future is not None:
+                    futures.append(future)
+        return futures
+
+    def snapshot(self, name: str) -> FeedSnapshot:
+        """
+        Return the latest snapshot immediately, revalidating it in the background if stale
+
+        Args:
+            name (str): Source name
+
+        Returns:
+            FeedSnapshot: Current (possibly stale or empty) snapshot
+        """
+        with self._guard:
+            snapshot = self._snapshots[name]
+        if self._is_stale(snapshot):
+            self.refresh([name])
+        return snapshot
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait up to `timeout` seconds for in-flight fetches
+
+        Args:
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            bool: True if nothing is left in flight
+        """
+        with self._guard:
+            pending = list(self._inflight.values())
+        done, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def start(self, check_interval: float = REFRESH_CHECK_INTERVAL) -> None:
+        """Fetch every source now and keep refreshing them on the TTL from a daemon thread"""
+        if self._refresher is not None:
+            return
+
+        def _loop():
+            while not self._stop.is_set():
+                self.refresh()
+                self._stop.wait(check_interval)
+
+        self._refresher = threading.Thread(target=_loop, name="home-feed-refresher", daemon=True)
+        self._refresher.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher and release the worker threads"""
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
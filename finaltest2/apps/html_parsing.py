@@ -0,0 +1,168 @@
+"""
+HTML Parsing - Targeted lxml parsers that stop as soon as the needed content is extracted
+
+The parsers receive SAX-style events (no tree is built) while the page is fed in
+chunks; once the first table's leading rows or the needed headlines are collected,
+the rest of the page is never tokenized.
+"""
+
+import re
+from typing import List, Optional
+
+import pandas as pd
+from lxml import etree
+
+# Characters fed to the parser per step; parsing stops at the first step after the target is complete
+FEED_CHUNK_SIZE = 16384
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class StopParsing(Exception):
+    """Raised from a parser target once it has everything it needs."""
+
+
+def _clean(parts: List[str]) -> str:
+    return _WHITESPACE.sub(" ", "".join(parts)).strip()
+
+
+class _TableTarget:
+    """Collects the header and first data rows of the first <table> in a page."""
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self.header: List[str] = []
+        self.rows: List[List[str]] = []
+        self._depth = 0
+        self._row: Optional[List[str]] = None
+        self._row_is_header = False
+        self._cell: Optional[List[str]] = None
+
+    def start(self, tag, attrib):
+        if tag == "table":
+            self._depth += 1
+        elif self._depth == 1:
+            if tag == "tr":
+                self._row, self._row_is_header = [], False
+            elif tag in ("td", "th") and self._row is not None:
+                self._cell = []
+                self._row_is_header |= tag == "th"
+
+    def end(self, tag):
+        if tag == "table":
+            self._depth -= 1
+            if self._depth == 0:
+                raise StopParsing()
+        elif self._depth == 1:
+            if tag in ("td", "th") and self._cell is not None and self._row is not None:
+                self._row.append(_clean(self._cell))
+                self._cell = None
+            elif tag == "tr" and self._row is not None:
+                if self._row_is_header and not self.rows and not self.header:
+                    self.header = self._row
+                elif self._row:
+                    self.rows.append(self._row)
+                self._row = None
+                if len(self.rows) >= self.max_rows:
+                    raise StopParsing()
+
+    def data(self, text):
+        if self._cell is not None:
+            self._cell.append(text)
+
+    def close(self):
+        return None
+
+
+class _HeadlineTarget:
+    """Collects the text of <h3> elements inside <article> elements."""
+
+    def __init__(self, max_headlines: int):
+        self.max_headlines = max_headlines
+        self.headlines: List[str] = []
+        self._articles = 0
+        self._text: Optional[List[str]] = None
+
+    def start(self, tag, attrib):
+        if tag == "article":
+            self._articles += 1
+        elif tag == "h3" and self._articles:
+            self._text = []
+
+    def end(self, tag):
+        if tag == "article":
+            self._articles = max(0, self._articles - 1)
+        elif tag == "h3" and self._text is not None:
+            headline = _clean(self._text)
+            self._text = None
+            if headline and headline not in self.headlines:
+                self.headlines.append(headline)
+                if len(self.headlines) >= self.max_headlines:
+                    raise StopParsing()
+
+    def data(self, text):
+        if self._text is not None:
+            self._text.append(text)
+
+    def close(self):
+        return None
+
+
+def _run(target, html: str) -> None:
+    parser = etree.HTMLParser(target=target, recover=True, no_network=True)
+    try:
+        for offset in range(0, len(html), FEED_CHUNK_SIZE):
+            parser.feed(html[offset:offset + FEED_CHUNK_SIZE])
+        parser.close()
+    except StopParsing:
+        pass
+    except etree.XMLSyntaxError:
+        # Recovering parser gave up on malformed trailing markup; keep what was collected
+        pass
+
+
+def _infer_numeric(column: pd.Series) -> pd.Series:
+    """Convert a text column to numbers when every cell parses (thousands separators allowed)"""
+    try:
+        return pd.to_numeric(column.str.replace(",", "", regex=False))
+    except (ValueError, TypeError):
+        return column
+
+
+def first_table(html: str, max_rows: int = 5) -> Optional[pd.DataFrame]:
+    """
+    Extract the first rows of the first table in a page, like pd.read_html(html)[0].head(max_rows)
+
+    Args:
+        html (str): Page HTML
+        max_rows (int): Number of data rows to read
+
+    Returns:
+        Optional[pd.DataFrame]: Rows with header columns and numeric columns converted, or None if no table
+    """
+    target = _TableTarget(max_rows)
+    _run(target, html)
+    if not target.rows:
+        return None
+
+    width = max(len(row) for row in target.rows)
+    header = target.header if len(target.header) == width else list(range(width))
+    rows = [row + [""] * (width - len(row)) for row in target.rows]
+    frame = pd.DataFrame(rows, columns=header)
+    return frame.apply(_infer_numeric)
+
+
+def article_headlines(html: str, max_headlines: int = 5) -> List[str]:
+    """
+    Extract the first distinct <h3> headlines inside <article> elements, in page order
+
+    Args:
+        html (str): Page HTML
+        max_headlines (int): Number of headlines to read
+
+    Returns:
+        List[str]: Headlines (possibly fewer than requested)
+    """
+    target = _HeadlineTarget(max_headlines)
+    _run(target, html)
+    return target.headlines
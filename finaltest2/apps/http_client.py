@@ -0,0 +1,231 @@
+"""
+HTTP Client - Shared pooled session with retries, per-host limits, conditional GETs and circuit breaking
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Hosts kept in the connection pool cache
+HTTP_POOL_HOSTS = 16
+
+# Concurrent connections per host; further requests to that host wait for a free connection
+HTTP_MAX_PER_HOST = int(os.environ.get("HTTP_MAX_PER_HOST", 4))
+
+# Retries on connection errors, 429 and 5xx, with exponential backoff plus random jitter
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_BACKOFF_JITTER = 0.5
+HTTP_BACKOFF_MAX = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+HTTP_TIMEOUT = 10
+
+# Consecutive failed requests that open a host's circuit, and how long it stays open
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 60.0
+
+# Number of responses kept for ETag / Last-Modified revalidation
+MAX_CONDITIONAL_ENTRIES = 256
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without touching the network while a host's circuit is open."""
+
+
+class CircuitBreaker:
+    """Per-host failure counter that fails fast after repeated errors, probing again after a timeout."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        """
+        Initialize the breaker
+
+        Args:
+            threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds before a single probe request is let through
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, bool] = {}
+        self._guard = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        """Whether a request to `host` may be sent now"""
+        with self._guard:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.time() - opened_at < self.reset_timeout or self._probing.get(host):
+                return False
+            self._probing[host] = True
+            return True
+
+    def record_success(self, host: str) -> None:
+        with self._guard:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._probing.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._guard:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold or self._probing.pop(host, False):
+                if host not in self._opened_at:
+                    logger.warning(f"Circuit opened for {host} after {failures} failures")
+                self._opened_at[host] = time.time()
+
+    def is_open(self, host: str) -> bool:
+        with self._guard:
+            return host in self._opened_at
+
+
+class GuardedAdapter(HTTPAdapter):
+    """HTTPAdapter that consults and updates a circuit breaker around every request."""
+
+    def __init__(self, breaker: CircuitBreaker, **kwargs):
+        self.breaker = breaker
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).hostname or ""
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"Circuit open for {host}; not sending request", request=request)
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.RequestException:
+            self.breaker.record_failure(host)
+            raise
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+
+def create_session(max_per_host: int = HTTP_MAX_PER_HOST, retries: int = HTTP_RETRIES,
+                   backoff_factor: float = HTTP_BACKOFF_FACTOR, breaker: Optional[CircuitBreaker] = None,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Build a pooled keep-alive session with retries and circuit breaking
+
+    The connection pool blocks at `max_per_host` connections, which caps
+    concurrent requests per host for every caller sharing the session.
+
+    Args:
+        max_per_host (int): Concurrent connections per host
+        retries (int): Retries on connection errors and RETRY_STATUSES (honouring Retry-After)
+        backoff_factor (float): Base of the exponential backoff in seconds
+        breaker (CircuitBreaker): Breaker shared by the session's adapters
+        headers (Dict[str, str]): Default request headers
+
+    Returns:
+        requests.Session: The configured session
+    """
+    retry = Retry(
+        total=retries,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,
+        backoff_factor=backoff_factor,
+        backoff_jitter=HTTP_BACKOFF_JITTER,
+        backoff_max=HTTP_BACKOFF_MAX,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = GuardedAdapter(breaker or CircuitBreaker(), pool_connections=HTTP_POOL_HOSTS,
+                             pool_maxsize=max_per_host, pool_block=True, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class HttpClient:
+    """Shared outbound HTTP client; GETs are revalidated with ETag / If-Modified-Since when possible."""
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: float = HTTP_TIMEOUT,
+                 max_conditional_entries: int = MAX_CONDITIONAL_ENTRIES):
+        """
+        Initialize the client
+
+        Args:
+            session (requests.Session): Session to use (defaults to create_session())
+            timeout (float): Default request timeout in seconds
+            max_conditional_entries (int): Responses kept for conditional revalidation
+        """
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.max_conditional_entries = max_conditional_entries
+        self._validated: "OrderedDict[str, requests.Response]" = OrderedDict()
+        self._guard = threading.Lock()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+            conditional: bool = True, **kwargs) -> requests.Response:
+        """
+        Send a GET, reusing the previous body when the server answers 304 Not Modified
+
+        Args:
+            url (str): Request URL
+            headers (Dict[str, str]): Extra request headers
+            timeout (float): Request timeout in seconds (defaults to the client's)
+            conditional (bool): Send If-None-Match / If-Modified-Since from the previous response
+            **kwargs: Passed to requests.Session.get
+
+        Returns:
+            requests.Response: The response (the cached one on 304)
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+            requests.exceptions.RequestException: If the request fails after retries
+        """
+        headers = dict(headers or {})
+        cache_key = url if not kwargs.get("params") else f"{url}?{sorted(kwargs['params'].items())}"
+        with self._guard:
+            previous = self._validated.get(cache_key) if conditional else None
+        if previous is not None:
+            if previous.headers.get("ETag"):
+                headers["If-None-Match"] = previous.headers["ETag"]
+            if previous.headers.get("Last-Modified"):
+                headers["If-Modified-Since"] = previous.headers["Last-Modified"]
+
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+
+        if response.status_code == 304 and previous is not None:
+            with self._guard:
+                self._validated.move_to_end(cache_key)
+            return previous
+        if conditional and response.ok and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            response.content  # load the body so the cached response outlives the connection
+            with self._guard:
+                self._validated[cache_key] = response
+                self._validated.move_to_end(cache_key)
+                while len(self._validated) > self.max_conditional_entries:
+                    self._validated.popitem(last=False)
+        return response
+
+
+_client: Optional[HttpClient] = None
+_client_guard = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client"""
+    global _client
+    with _client_guard:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,175 @@
+"""
+Indicator Engine - Fused, non-mutating computation of technical indicators
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series]
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    Description of one indicator to compute
+
+    Attributes:
+        kind (str): 'ema', 'macd' or 'rsi'
+        params (Tuple[int, ...]): (period,) for ema/rsi, (fast, slow, signal) for macd
+    """
+    kind: str
+    params: Tuple[int, ...]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Output column names produced by this spec"""
+        if self.kind == 'ema':
+            return (f'EMA_{self.params[0]}',)
+        if self.kind == 'rsi':
+            return ('RSI',) if self.params == (14,) else (f'RSI_{self.params[0]}',)
+        if self.kind == 'macd':
+            if self.params == (12, 26, 9):
+                return ('MACD', 'Signal', 'Histogram')
+            suffix = '_'.join(str(p) for p in self.params)
+            return (f'MACD_{suffix}', f'Signal_{suffix}', f'Histogram_{suffix}')
+        raise ValueError(f"Unknown indicator kind '{self.kind}'")
+
+
+def ema(period: int) -> IndicatorSpec:
+    """Exponential moving average of Close over `period` bars"""
+    return IndicatorSpec('ema', (period,))
+
+
+def macd(fast: int = 12, slow: int = 26, signal: int = 9) -> IndicatorSpec:
+    """MACD line, signal line and histogram"""
+    return IndicatorSpec('macd', (fast, slow, signal))
+
+
+def rsi(period: int = 14) -> IndicatorSpec:
+    """Relative Strength Index using simple moving averages of gains and losses"""
+    return IndicatorSpec('rsi', (period,))
+
+
+# Indicators shown on the Finance Dashboard
+DEFAULT_INDICATORS: List[IndicatorSpec] = [macd(), rsi(), ema(20), ema(50), ema(200)]
+
+
+def ema_array(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    EMA along axis 0 with pandas' adjust=False recursion, for 1-D or 2-D (date x ticker) input
+
+    Args:
+        values (np.ndarray): Price array
+        span (int): EMA span
+
+    Returns:
+        np.ndarray: EMA array with the same shape as `values`
+    """
+    if values.ndim == 1:
+        return pd.Series(values, copy=False).ewm(span=span, adjust=False).mean().to_numpy()
+    return pd.DataFrame(values, copy=False).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def rolling_mean_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing simple moving average along axis 0 via a cumulative sum (NaN until the window fills)
+
+    Args:
+        values (np.ndarray): Input array without NaNs
+        window (int): Window length
+
+    Returns:
+        np.ndarray: Rolling mean with the same shape as `values`
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    csum = np.cumsum(values, axis=0)
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    out[window - 1:] /= window
+    return out
+
+
+def rsi_array(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI along axis 0, matching calculate_rsi (simple rolling means of gains and losses)
+
+    Args:
+        close (np.ndarray): Close prices, 1-D or 2-D (date x ticker)
+        period (int): RSI period
+
+    Returns:
+        np.ndarray: RSI values with the same shape as `close`
+    """
+    delta = np.zeros_like(close)
+    delta[1:] = close[1:] - close[:-1]
+    delta = np.nan_to_num(delta, nan=0.0)
+    gain = rolling_mean_array(np.where(delta > 0, delta, 0.0), period)
+    loss = rolling_mean_array(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def compute_indicator_arrays(close: np.ndarray, specs: Iterable[IndicatorSpec]) -> Dict[str, np.ndarray]:
+    """
+    Compute several indicators in one pass over a Close array
+
+    EMAs shared between specs (e.g. EMA_26 and the MACD slow line) are computed
+    once, and no intermediate series is kept in the result.
+
+    Args:
+        close (np.ndarray): Close prices, 1-D or 2-D (date x ticker)
+        specs (Iterable[IndicatorSpec]): Indicators to compute
+
+    Returns:
+        Dict[str, np.ndarray]: Output arrays keyed by column name
+    """
+    close = np.asarray(close, dtype=np.float64)
+    specs = list(specs)
+
+    spans = set()
+    for spec in specs:
+        if spec.kind == 'ema':
+            spans.add(spec.params[0])
+        elif spec.kind == 'macd':
+            spans.update(spec.params[:2])
+    emas = {span: ema_array(close, span) for span in sorted(spans)}
+
+    results: Dict[str, np.ndarray] = {}
+    for spec in specs:
+        columns = spec.columns
+        if spec.kind == 'ema':
+            results[columns[0]] = emas[spec.params[0]]
+        elif spec.kind == 'rsi':
+            results[columns[0]] = rsi_array(close, spec.params[0])
+        elif spec.kind == 'macd':
+            fast, slow, signal = spec.params
+            line = emas[fast] - emas[slow]
+            signal_line = ema_array(line, signal)
+            results[columns[0]] = line
+            results[columns[1]] = signal_line
+            results[columns[2]] = line - signal_line
+    return results
+
+
+def compute_indicators(data: Union[pd.DataFrame, Mapping[str, ArrayLike]],
+                       specs: Iterable[IndicatorSpec] = DEFAULT_INDICATORS) -> pd.DataFrame:
+    """
+    Compute indicators for one ticker without modifying the input
+
+    Args:
+        data (pd.DataFrame): Stock data with a 'Close' column (or any mapping of arrays)
+        specs (Iterable[IndicatorSpec]): Indicators to compute
+
+    Returns:
+        pd.DataFrame: Compact float64 block with one column per indicator output,
+            aligned with the input rows
+    """
+    close = np.asarray(data['Close'], dtype=np.float64)
+    index = data.index if isinstance(data, pd.DataFrame) else None
+    return pd.DataFrame(compute_indicator_arrays(close, specs), index=index)
@@ -0,0 +1,453 @@
+"""
+Instrumentation - Timing spans, cache counters and metrics export for every rerun
+
+Hot paths are wrapped in span(name, stage). A span is added to the trace of the
+rerun running on the current thread (shown by the developer sidebar panel) and
+to process-wide latency histograms. Caches count their hits and misses. The
+totals are exported as Prometheus text or JSON, to a file (METRICS_FILE) and/or
+an HTTP endpoint (METRICS_PORT).
+"""
+
+import os
+import json
+import time
+import uuid
+import functools
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Metrics file rewritten after every rerun (".json" for JSON, anything else for Prometheus text)
+METRICS_FILE = os.environ.get("METRICS_FILE", "")
+
+# Port of the metrics endpoint (/metrics and /metrics.json); 0 disables it
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0") or 0)
+
+DEV_PANEL = os.environ.get("DEV_PANEL", "0").lower() in ("1", "true", "yes")
+
+# Stages a rerun's time is broken down into; whole reruns are recorded with stage 'page'
+STAGES = ('load', 'compute', 'figure', 'emit')
+PAGE_STAGE = 'page'
+
+# Upper bounds (seconds) of the latency histogram buckets
+SPAN_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "stockdash"
+
+
+@dataclass
+class SpanRecord:
+    """One timed block of a rerun, with times in seconds"""
+    name: str
+    stage: str
+    start: float
+    duration: float
+    self_time: float
+    depth: int
+
+
+@dataclass
+class RerunTrace:
+    """Spans recorded while one page rerun executed"""
+    page: str
+    started: float = field(default_factory=time.perf_counter)
+    duration: Optional[float] = None
+    spans: List[SpanRecord] = field(default_factory=list)
+    # Seconds spent in untraced() blocks, left out of the duration and span offsets
+    excluded: float = 0.0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Spans in completion order, in milliseconds"""
+        return pd.DataFrame({
+            'Span': ['  ' * span.depth + span.name for span in self.spans],
+            'Stage': [span.stage for span in self.spans],
+            'Start ms': [span.start * 1000 for span in self.spans],
+            'ms': [span.duration * 1000 for span in self.spans],
+            'Self ms': [span.self_time * 1000 for span in self.spans],
+        })
+
+    def breakdown(self) -> pd.DataFrame:
+        """
+        Time per stage, counting each span's own time once (nested spans are not double counted)
+
+        Returns:
+            pd.DataFrame: Stage, ms and share of the rerun; 'other' is page time outside any span
+        """
+        totals = {stage: 0.0 for stage in STAGES}
+        for span in self.spans:
+            totals[span.stage] = totals.get(span.stage, 0.0) + span.self_time
+        elapsed = self.duration if self.duration is not None else time.perf_counter() - self.started - self.excluded
+        totals['other'] = max(elapsed - sum(totals.values()), 0.0)
+        return pd.DataFrame({
+            'Stage': list(totals),
+            'ms': [seconds * 1000 for seconds in totals.values()],
+            'Share %': [seconds / elapsed * 100 if elapsed else 0.0 for seconds in totals.values()],
+        })
+
+
+class _Histogram:
+    """Cumulative latency histogram of one span"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(SPAN_BUCKETS)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(SPAN_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """Process-wide span histograms and cache hit/miss counters."""
+
+    def __init__(self):
+        """Initialize empty metrics"""
+        self._spans: Dict[Tuple[str, str], _Histogram] = {}
+        self._caches: Dict[str, List[int]] = {}
+        self._guard = threading.Lock()
+
+    def observe(self, name: str, stage: str, seconds: float) -> None:
+        """
+        Record one execution of a span
+
+        Args:
+            name (str): Span name, e.g. 'dashboard.load_prices'
+            stage (str): One of STAGES, or PAGE_STAGE for a whole rerun
+            seconds (float): Duration
+        """
+        with self._guard:
+            histogram = self._spans.get((name, stage))
+            if histogram is None:
+                histogram = self._spans[(name, stage)] = _Histogram()
+            histogram.observe(seconds)
+
+    def count_cache(self, cache: str, hit: bool) -> None:
+        """
+        Count one lookup of a cache
+
+        Args:
+            cache (str): Cache name, e.g. 'figures'
+            hit (bool): Whether the lookup was served from the cache
+        """
+        with self._guard:
+            counts = self._caches.setdefault(cache, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Copy of every metric
+
+        Returns:
+            dict: {'spans': [{name, stage, count, sum, max, buckets}], 'caches': {name: {hits, misses}}}
+        """
+        with self._guard:
+            spans = [{
+                'name': name,
+                'stage': stage,
+                'count': histogram.count,
+                'sum': histogram.total,
+                'max': histogram.max,
+                'buckets': dict(zip(map(str, SPAN_BUCKETS), histogram.buckets)),
+            } for (name, stage), histogram in sorted(self._spans.items())]
+            caches = {cache: {'hits': hits, 'misses': misses} for cache, (hits, misses) in sorted(self._caches.items())}
+        return {'spans': spans, 'caches': caches}
+
+    def cache_frame(self) -> pd.DataFrame:
+        """Cache counters with hit rates, one row per cache"""
+        caches = self.snapshot()['caches']
+        return pd.DataFrame({
+            'Cache': list(caches),
+            'Hits': [counts['hits'] for counts in caches.values()],
+            'Misses': [counts['misses'] for counts in caches.values()],
+            'Hit %': [counts['hits'] / max(counts['hits'] + counts['misses'], 1) * 100 for counts in caches.values()],
+        })
+
+    def to_json(self) -> str:
+        """Metrics as a JSON document"""
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        name = f"{METRIC_PREFIX}_span_seconds"
+        lines = [f"# HELP {name} Duration of instrumented blocks.", f"# TYPE {name} histogram"]
+        for span in snapshot['spans']:
+            labels = f'span="{_label(span["name"])}",stage="{_label(span["stage"])}"'
+            for bound, count in span['buckets'].items():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {span["count"]}')
+            lines.append(f'{name}_sum{{{labels}}} {span["sum"]:.6f}')
+            lines.append(f'{name}_count{{{labels}}} {span["count"]}')
+
+        name = f"{METRIC_PREFIX}_cache_requests_total"
+        lines += [f"# HELP {name} Cache lookups by result.", f"# TYPE {name} counter"]
+        for cache, counts in snapshot['caches'].items():
+            lines.append(f'{name}{{cache="{_label(cache)}",result="hit"}} {counts["hits"]}')
+            lines.append(f'{name}{{cache="{_label(cache)}",result="miss"}} {counts["misses"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Atomically replace a metrics file
+
+        Args:
+            path (str): Target file; JSON if it ends in '.json', Prometheus text otherwise
+        """
+        text = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def reset(self) -> None:
+        """Drop every recorded metric"""
+        with self._guard:
+            self._spans.clear()
+            self._caches.clear()
+
+
+_metrics: Optional[Metrics] = None
+_metrics_guard = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics"""
+    global _metrics
+    with _metrics_guard:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
+
+
+# Streamlit runs each session's script on its own thread, so the current trace is per thread
+_local = threading.local()
+
+
+def current_trace() -> Optional[RerunTrace]:
+    """Trace of the rerun executing on this thread, if any"""
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def trace_rerun(page: str, metrics: Optional[Metrics] = None) -> Iterator[RerunTrace]:
+    """
+    Collect the spans of one page rerun on this thread
+
+    The rerun is recorded as a 'page' span even when the page stops or reruns early.
+
+    Args:
+        page (str): Page title
+        metrics (Metrics): Metrics to record into (defaults to the process-wide metrics)
+
+    Yields:
+        RerunTrace: The trace being collected
+    """
+    previous, trace = current_trace(), RerunTrace(page)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+        trace.duration = time.perf_counter() - trace.started - trace.excluded
+        (metrics or get_metrics()).observe(page, PAGE_STAGE, trace.duration)
+
+
+@contextmanager
+def untraced() -> Iterator[None]:
+    """
+    Leave a long-running block (e.g. the live quote loop) out of the current rerun's trace
+
+    The block's time is not counted in the rerun's page duration, and spans inside
+    it are recorded in the histograms only.
+    """
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    _local.trace = None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.excluded += time.perf_counter() - start
+        _local.trace = trace
+
+
+@contextmanager
+def span(name: str, stage: str, metrics: Optional[Metrics] = None) -> Iterator[None]:
+    """
+    Time a block into the span histograms and the current rerun's trace
+
+    Args:
+        name (str): Span name, e.g. 'dashboard.load_prices'
+        stage (str): One of STAGES
+        metrics (Metrics): Metrics to record into (defaults to the process-wide metrics)
+    """
+    stack = _local.__dict__.setdefault('stack', [])
+    trace = current_trace()
+    # Each open span accumulates the time of its children to derive its own time
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += duration
+        (metrics or get_metrics()).observe(name, stage, duration)
+        if trace is not None:
+            trace.spans.append(SpanRecord(name, stage, start - trace.started - trace.excluded, duration,
+                                          max(duration - children, 0.0), len(stack)))
+
+
+def timed(name: str, stage: str) -> Callable:
+    """Decorator timing every call of a function as a span"""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count_cache(cache: str, hit: bool) -> None:
+    """Count one lookup of a cache in the process-wide metrics"""
+    get_metrics().count_cache(cache, hit)
+
+
+def counted_cache(cache: str, decorator: Callable) -> Callable:
+    """
+    Apply a caching decorator (st.cache_resource, lru_cache, ...) and count its hits and misses
+
+    A call is a miss when the cached function body actually ran.
+
+    Args:
+        cache (str): Cache name in the metrics
+        decorator (Callable): The caching decorator, e.g. st.cache_resource(show_spinner=False)
+
+    Returns:
+        Callable: Decorator producing the counted, cached function
+    """
+    def decorate(func: Callable) -> Callable:
+        calls = threading.local()
+
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            calls.missed = True
+            return func(*args, **kwargs)
+
+        cached = decorator(body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            calls.missed = False
+            result = cached(*args, **kwargs)
+            count_cache(cache, hit=not calls.missed)
+            return result
+
+        wrapper.clear = getattr(cached, 'clear', None) or getattr(cached, 'cache_clear', None)
+        return wrapper
+    return decorate
+
+
+def export_metrics(path: str = METRICS_FILE) -> None:
+    """Rewrite the metrics file, if one is configured"""
+    if not path:
+        return
+    try:
+        get_metrics().write(path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics to {path}: {str(e)}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/metrics':
+            body, content_type = get_metrics().to_prometheus(), 'text/plain; version=0.0.4'
+        elif path == '/metrics.json':
+            body, content_type = get_metrics().to_json(), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics request: {format % args}")
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_guard = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics (Prometheus text) and /metrics.json on a background thread, once per process
+
+    Args:
+        port (int): Port to listen on; 0 disables the endpoint
+        host (str): Interface to bind
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The running server, or None if disabled or the port is taken
+    """
+    global _server
+    with _server_guard:
+        if _server is not None or not port:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            # Another server process on this host already exports its metrics on the port
+            logger.warning(f"Metrics endpoint not started on port {port}: {str(e)}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info(f"Serving metrics on port {port}")
+        return _server
+
+
+def render_dev_panel(trace: Optional[RerunTrace]) -> None:
+    """
+    Sidebar panel with the span breakdown of a rerun and the process's cache counters
+
+    Args:
+        trace (RerunTrace): The finished rerun, or None if the rerun was never traced
+    """
+    if trace is None:
+        return
+    # Imported here so batch jobs and workers can record metrics without loading Streamlit
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Rerun timings", expanded=True):
+        st.caption(f"{trace.page}: {(trace.duration or 0.0) * 1000:.0f} ms")
+        st.dataframe(trace.breakdown().round(1), hide_index=True, use_container_width=True)
+        if trace.spans:
+            st.dataframe(trace.to_frame().round(1), hide_index=True, use_container_width=True)
+        caches = get_metrics().cache_frame()
+        if len(caches):
+            st.dataframe(caches.round(1), hide_index=True, use_container_width=True)
@@ -0,0 +1,706 @@
+"""
+Live Quotes - Streaming quote mode for the Finance Dashboard
+
+A quote source runs on its own thread and pushes ticks into a bounded buffer that
+coalesces them per symbol into short windows. The page drains the buffer on a
+fixed refresh cadence, folds the quotes into bars at the chart's interval,
+advances the indicator states only over the new bars, and appends just the new
+points to its charts. A fast feed therefore costs the browser at most one small
+update per refresh, however many ticks arrive.
+
+The source is chosen with LIVE_QUOTE_SOURCE:
+    replay:<path>   ticks replayed from a CSV or JSON-lines file (timestamp, symbol, price[, volume])
+    ws://host:port  JSON ticks from a WebSocket server (requires the 'websocket-client' package)
+    (unset)         replay of a seeded random walk starting at the last close, for demos and tests
+"""
+
+import os
+import copy
+import json
+import time
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from apps.indicators import DEFAULT_INDICATORS, IndicatorSpec
+from apps.instrumentation import span, untraced
+from apps.resample import DAILY, bucket_starts, interval_step, is_intraday
+from apps.streaming import IndicatorState
+
+logger = logging.getLogger(__name__)
+
+LIVE_QUOTE_SOURCE = os.environ.get("LIVE_QUOTE_SOURCE", "")
+
+# Seconds between chart updates sent to the browser
+LIVE_REFRESH_SECONDS = float(os.environ.get("LIVE_REFRESH_SECONDS", "1.0"))
+
+# A live session stops after this long, so idle browser tabs do not keep sources running
+LIVE_MAX_SECONDS = float(os.environ.get("LIVE_MAX_SECONDS", "900"))
+
+# Ticks of one symbol within one window are merged into a single quote (windows never straddle a bar)
+COALESCE_SECONDS = 1.0
+
+# Coalesced quotes held across all symbols before sources are held back or merged harder
+BUFFER_CAPACITY = 600
+
+# Most price points appended to the tick chart per refresh
+MAX_POINTS_PER_REFRESH = 60
+
+# Bars shown in the live charts before the first update
+LIVE_SEED_BARS = 120
+
+# Columns of the live bars, in frame order
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_NS_PER_DAY = 86_400 * 10 ** 9
+_NS_PER_MINUTE = 60 * 10 ** 9
+
+
+@dataclass
+class Tick:
+    """One trade or quote update"""
+    symbol: str
+    timestamp: pd.Timestamp
+    price: float
+    volume: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Tick":
+        """
+        Build a tick from a decoded message or file row
+
+        Args:
+            data (dict): Mapping with symbol, timestamp (ISO string or epoch seconds), price and optional volume
+
+        Returns:
+            Tick: The tick
+
+        Raises:
+            ValueError: If a required field is missing
+        """
+        try:
+            raw_time = data['timestamp']
+            timestamp = pd.Timestamp(raw_time, unit='s') if isinstance(raw_time, (int, float)) else pd.Timestamp(raw_time)
+            return cls(str(data['symbol']).upper(), timestamp, float(data['price']), float(data.get('volume') or 0.0))
+        except KeyError as e:
+            raise ValueError(f"Tick is missing the {e} field: {data}") from e
+
+
+@dataclass
+class QuoteBatch:
+    """
+    Ticks of one symbol coalesced over one window, as an OHLCV aggregate
+
+    Attributes:
+        symbol (str): Ticker symbol
+        window (int): Index of the coalescing window (epoch nanoseconds // window width)
+        start_ns (int): Timestamp of the first tick
+        end_ns (int): Timestamp of the last tick
+        open, high, low, close (float): Prices over the window
+        volume (float): Summed tick volume
+        ticks (int): Number of ticks merged
+    """
+    symbol: str
+    window: int
+    start_ns: int
+    end_ns: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    ticks: int = 1
+
+    @classmethod
+    def from_tick(cls, tick: Tick, window: int) -> "QuoteBatch":
+        ns = tick.timestamp.value
+        return cls(tick.symbol, window, ns, ns, tick.price, tick.price, tick.price, tick.price, tick.volume)
+
+    def add(self, tick: Tick) -> None:
+        """Merge a later tick of the same symbol"""
+        self.end_ns = max(self.end_ns, tick.timestamp.value)
+        self.high = max(self.high, tick.price)
+        self.low = min(self.low, tick.price)
+        self.close = tick.price
+        self.volume += tick.volume
+        self.ticks += 1
+
+    @property
+    def end(self) -> pd.Timestamp:
+        return pd.Timestamp(self.end_ns)
+
+
+class TickBuffer:
+    """
+    Bounded per-symbol queue of coalesced quotes between a quote source thread and the page
+
+    Ticks falling in the window of their symbol's newest quote are merged into it.
+    When the buffer is full, `put` waits up to `timeout` for the page to drain it;
+    if it is still full, the tick is merged into the symbol's newest quote anyway
+    (losing time resolution, never price or volume), or dropped when the symbol
+    has no pending quote.
+    """
+
+    def __init__(self, capacity: int = BUFFER_CAPACITY, window_seconds: float = COALESCE_SECONDS):
+        """
+        Initialize the buffer
+
+        Args:
+            capacity (int): Coalesced quotes held across all symbols
+            window_seconds (float): Coalescing window; should divide a minute evenly
+        """
+        self.capacity = capacity
+        self.window_ns = int(window_seconds * 10 ** 9)
+        self.stats = {'ticks': 0, 'coalesced': 0, 'overflow_merged': 0, 'dropped': 0, 'drained': 0}
+        self._pending: Dict[str, List[QuoteBatch]] = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._size
+
+    def put(self, tick: Tick, timeout: Optional[float] = 0.0) -> bool:
+        """
+        Add a tick
+
+        Args:
+            tick (Tick): The tick
+            timeout (float): Seconds to wait for room when full (None waits until drained or closed)
+
+        Returns:
+            bool: False if the tick was dropped or the buffer is closed
+        """
+        window = tick.timestamp.value // self.window_ns
+        with self._cond:
+            if self._closed:
+                return False
+            self.stats['ticks'] += 1
+            pending = self._pending.setdefault(tick.symbol, [])
+            if pending and pending[-1].window == window:
+                pending[-1].add(tick)
+                self.stats['coalesced'] += 1
+                return True
+            if self._size >= self.capacity:
+                self._cond.wait_for(lambda: self._size < self.capacity or self._closed, timeout)
+                if self._closed:
+                    return False
+                pending = self._pending.setdefault(tick.symbol, [])
+            if self._size >= self.capacity:
+                if not pending:
+                    self.stats['dropped'] += 1
+                    return False
+                pending[-1].add(tick)
+                self.stats['overflow_merged'] += 1
+                return True
+            pending.append(QuoteBatch.from_tick(tick, window))
+            self._size += 1
+            return True
+
+    def drain(self) -> Dict[str, List[QuoteBatch]]:
+        """Take every pending quote, per symbol in time order, and wake waiting sources"""
+        with self._cond:
+            pending, self._pending = self._pending, {}
+            self.stats['drained'] += self._size
+            self._size = 0
+            self._cond.notify_all()
+        return pending
+
+    def close(self) -> None:
+        """Reject further ticks and release any source waiting for room"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class QuoteSource:
+    """
+    Base class of quote feeds: `_produce` runs on a daemon thread and emits ticks until stopped
+
+    Sources that can be paused (replays) wait for room in the buffer, which holds
+    them back to the page's pace; live feeds cannot wait, so their ticks are
+    merged harder instead.
+    """
+
+    blocking = False
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[str] = None
+
+    def start(self, buffer: TickBuffer) -> "QuoteSource":
+        """
+        Start feeding ticks into a buffer
+
+        Args:
+            buffer (TickBuffer): Destination buffer
+
+        Returns:
+            QuoteSource: self
+        """
+        timeout = None if self.blocking else 0.0
+
+        def emit(tick: Tick) -> None:
+            buffer.put(tick, timeout=timeout)
+
+        def run():
+            try:
+                self._produce(emit)
+            except Exception as e:
+                self.error = str(e)
+                logger.warning(f"Quote source {type(self).__name__} failed: {str(e)}")
+
+        self._buffer = buffer
+        self._thread = threading.Thread(target=run, name=f"quotes-{type(self).__name__}", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the feed and wait for its thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._buffer.close()
+            self._thread.join(timeout)
+
+    def _produce(self, emit: Callable[[Tick], None]) -> None:
+        raise NotImplementedError
+
+
+def load_ticks(path: str) -> pd.DataFrame:
+    """
+    Read recorded ticks from a CSV or JSON-lines file
+
+    Args:
+        path (str): File with timestamp, symbol, price and optional volume columns
+
+    Returns:
+        pd.DataFrame: Ticks sorted by timestamp
+
+    Raises:
+        ValueError: If a required column is missing
+    """
+    if path.endswith((".jsonl", ".json")):
+        ticks = pd.read_json(path, lines=True, convert_dates=False)
+    else:
+        ticks = pd.read_csv(path)
+    missing = {'timestamp', 'symbol', 'price'} - set(ticks.columns)
+    if missing:
+        raise ValueError(f"Tick file {path} lacks column(s) {', '.join(sorted(missing))}")
+    raw = ticks['timestamp']
+    ticks['timestamp'] = pd.to_datetime(raw, unit='s') if pd.api.types.is_numeric_dtype(raw) else pd.to_datetime(raw)
+    ticks['symbol'] = ticks['symbol'].astype(str).str.upper()
+    if 'volume' not in ticks:
+        ticks['volume'] = 0.0
+    return ticks.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+class ReplaySource(QuoteSource):
+    """Replays recorded ticks with their original spacing, optionally shifted to start now"""
+
+    blocking = True
+
+    def __init__(self, ticks: pd.DataFrame, speed: float = 1.0, loop: bool = False, rebase: bool = True):
+        """
+        Initialize the replay
+
+        Args:
+            ticks (pd.DataFrame): Ticks with timestamp, symbol, price and volume columns, in time order
+            speed (float): Replay speed multiplier (0 replays as fast as the buffer accepts)
+            loop (bool): Start over at the end, continuing from the last replayed price time
+            rebase (bool): Shift timestamps so the first tick is stamped with the start time
+        """
+        super().__init__()
+        self.ticks = ticks
+        self.speed = speed
+        self.loop = loop
+        self.rebase = rebase
+
+    @classmethod
+    def from_file(cls, path: str, symbols: Optional[Iterable[str]] = None, **kwargs) -> "ReplaySource":
+        """
+        Replay a tick file, optionally limited to some symbols
+
+        Raises:
+            ValueError: If the file holds no ticks of the requested symbols
+        """
+        ticks = load_ticks(path)
+        if symbols is not None:
+            wanted = {symbol.upper() for symbol in symbols}
+            ticks = ticks[ticks['symbol'].isin(wanted)].reset_index(drop=True)
+            if ticks.empty:
+                raise ValueError(f"Tick file {path} has no ticks for {', '.join(sorted(wanted))}")
+        return cls(ticks, **kwargs)
+
+    @classmethod
+    def random_walk(cls, symbol: str, last_price: float, ticks: int = 20_000, ticks_per_second: float = 20.0,
+                    seed: int = 0, **kwargs) -> "ReplaySource":
+        """
+        Replay a seeded random walk of trades starting at `last_price`
+
+        Args:
+            symbol (str): Ticker symbol stamped on the ticks
+            last_price (float): Starting price
+            ticks (int): Ticks per pass
+            ticks_per_second (float): Average tick rate
+            seed (int): Random seed
+        """
+        rng = np.random.default_rng(seed)
+        gaps = rng.exponential(1.0 / ticks_per_second, ticks)
+        frame = pd.DataFrame({
+            'timestamp': pd.Timestamp.now().floor('s') + pd.to_timedelta(np.cumsum(gaps), unit='s'),
+            'symbol': symbol.upper(),
+            'price': np.round(last_price * np.exp(np.cumsum(rng.normal(0, 2e-4, ticks))), 4),
+            'volume': rng.integers(1, 50, ticks) * 100.0,
+        })
+        return cls(frame, **kwargs)
+
+    def _produce(self, emit: Callable[[Tick], None]) -> None:
+        times = self.ticks['timestamp'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        symbols = self.ticks['symbol'].to_numpy()
+        prices = self.ticks['price'].to_numpy(dtype=np.float64)
+        volumes = self.ticks['volume'].to_numpy(dtype=np.float64)
+        if not len(times):
+            return
+
+        shift = pd.Timestamp.now().value - times[0] if self.rebase else 0
+        span_ns = times[-1] - times[0]
+        while not self._stop.is_set():
+            started = time.monotonic()
+            for i in range(len(times)):
+                if self.speed:
+                    delay = (times[i] - times[0]) / 1e9 / self.speed - (time.monotonic() - started)
+                    if delay > 0 and self._stop.wait(delay):
+                        return
+                elif self._stop.is_set():
+                    return
+                emit(Tick(symbols[i], pd.Timestamp(int(times[i] + shift)), prices[i], volumes[i]))
+            if not self.loop:
+                return
+            # The next pass continues after this one, one second later
+            shift += span_ns + 10 ** 9
+
+
+class WebSocketSource(QuoteSource):
+    """
+    JSON ticks from a WebSocket server, e.g. a local stand-in replaying a recorded session
+
+    Each message is one tick object or a list of them (see Tick.from_dict). The
+    symbols are sent on connect as {"subscribe": [...]}. Dropped connections are
+    retried with a doubling delay.
+    """
+
+    def __init__(self, url: str, symbols: Iterable[str], reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 30.0, connect: Optional[Callable] = None):
+        """
+        Initialize the source
+
+        Args:
+            url (str): ws:// or wss:// URL
+            symbols (Iterable[str]): Symbols to subscribe to
+            reconnect_delay (float): First retry delay in seconds
+            max_reconnect_delay (float): Longest retry delay
+            connect (Callable): Connection factory taking (url, timeout) (defaults to websocket.create_connection)
+
+        Raises:
+            ImportError: If no factory is given and the websocket-client package is not installed
+        """
+        super().__init__()
+        # Receive timeouts only give the loop a chance to notice stop()
+        self._timeouts: tuple = (TimeoutError,)
+        if connect is None:
+            try:
+                import websocket
+            except ImportError as e:
+                raise ImportError("LIVE_QUOTE_SOURCE=ws:// requires the 'websocket-client' package") from e
+            connect = lambda url, timeout: websocket.create_connection(url, timeout=timeout)
+            self._timeouts += (websocket.WebSocketTimeoutException,)
+        self.url = url
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._connect = connect
+
+    def _produce(self, emit: Callable[[Tick], None]) -> None:
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                connection = self._connect(self.url, 1.0)
+            except Exception as e:
+                logger.warning(f"Quote feed {self.url} unreachable, retrying in {delay:.0f}s: {str(e)}")
+                if self._stop.wait(delay):
+                    return
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+            delay = self.reconnect_delay
+            try:
+                connection.send(json.dumps({"subscribe": self.symbols}))
+                while not self._stop.is_set():
+                    try:
+                        message = connection.recv()
+                    except self._timeouts:
+                        continue
+                    if not message:
+                        break
+                    payload = json.loads(message)
+                    for item in payload if isinstance(payload, list) else [payload]:
+                        tick = Tick.from_dict(item)
+                        if tick.symbol in self.symbols:
+                            emit(tick)
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning(f"Quote feed {self.url} dropped: {str(e)}")
+            finally:
+                connection.close()
+
+
+def make_quote_source(spec: str, ticker: str, last_price: float) -> QuoteSource:
+    """
+    Build the quote source described by a LIVE_QUOTE_SOURCE value
+
+    Args:
+        spec (str): 'replay:<path>', a ws:// or wss:// URL, or '' for a random-walk replay
+        ticker (str): Ticker symbol to stream
+        last_price (float): Latest known close, where the random walk starts
+
+    Returns:
+        QuoteSource: The (not yet started) source
+
+    Raises:
+        ValueError: If the spec is not understood
+    """
+    if not spec:
+        return ReplaySource.random_walk(ticker, last_price, seed=sum(map(ord, ticker)), loop=True)
+    if spec.startswith("replay:"):
+        return ReplaySource.from_file(spec[len("replay:"):], symbols=[ticker])
+    if spec.startswith(("ws://", "wss://")):
+        return WebSocketSource(spec, [ticker])
+    raise ValueError(f"Unknown LIVE_QUOTE_SOURCE '{spec}', expected replay:<path> or a ws:// URL")
+
+
+@dataclass
+class LiveUpdate:
+    """
+    What one batch of quotes changed
+
+    Attributes:
+        closed (pd.DataFrame): Bars (with indicators) completed by this batch, indexed by Date
+        current (pd.Series): The still-forming last bar with provisional indicators
+        late (int): Quotes older than the last bar, which were ignored
+    """
+    closed: pd.DataFrame
+    current: pd.Series
+    late: int = 0
+
+
+class LiveSeries:
+    """
+    Bars of one ticker at one interval, extended quote by quote with incrementally updated indicators
+
+    Like the indicator ledger, the indicator state is checkpointed before the
+    forming last bar: revisions of that bar restart from the checkpoint, and the
+    checkpoint only advances when a bar completes, so each quote costs O(1)
+    whatever the history length. Bars are kept in preallocated arrays that double
+    when full, so appending does not copy the history.
+    """
+
+    def __init__(self, history: pd.DataFrame, interval: str = DAILY,
+                 specs: Iterable[IndicatorSpec] = DEFAULT_INDICATORS):
+        """
+        Initialize from the loaded history
+
+        Args:
+            history (pd.DataFrame): OHLCV bars with a 'Date' column, in time order (at least one bar)
+            interval (str): Bar interval of the history and of the bars built from quotes
+            specs (Iterable[IndicatorSpec]): Indicators to maintain
+        """
+        self.interval = interval
+        self._n = len(history)
+        capacity = max(64, 2 * self._n)
+        self._dates = np.empty(capacity, dtype=np.int64)
+        self._dates[:self._n] = np.asarray(history['Date'], dtype='datetime64[ns]').astype(np.int64)
+        self._bars = {}
+        for name in BAR_COLUMNS:
+            self._bars[name] = np.empty(capacity)
+            self._bars[name][:self._n] = np.asarray(history[name], dtype=np.float64)
+
+        close = self._bars['Close'][:self._n]
+        state = IndicatorState(specs)
+        head = state.update(close[:-1])
+        self._checkpoint = state
+        tail = copy.deepcopy(state).update(close[-1:])
+        self.columns = list(tail)
+        self._indicators = {}
+        for name in self.columns:
+            self._indicators[name] = np.empty(capacity)
+            self._indicators[name][:self._n - 1] = head[name]
+            self._indicators[name][self._n - 1] = tail[name][0]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _grow(self) -> None:
+        for arrays in (self._bars, self._indicators):
+            for name, values in arrays.items():
+                arrays[name] = np.concatenate([values, np.empty(len(values))])
+        self._dates = np.concatenate([self._dates, np.empty(len(self._dates), dtype=np.int64)])
+
+    def bar_start(self, ns: int) -> int:
+        """
+        Start of the bar a quote at `ns` belongs to
+
+        Intraday bars continue the last bar's grid within its session; a new session
+        opens at the minute of its first quote. Longer bars follow the calendar.
+        """
+        if not is_intraday(self.interval):
+            return int(bucket_starts(np.array([ns], dtype='datetime64[ns]'), self.interval)[0])
+        last = int(self._dates[self._n - 1])
+        if ns >= last and ns // _NS_PER_DAY == last // _NS_PER_DAY:
+            step = interval_step(self.interval)
+            return last + (ns - last) // step * step
+        return ns // _NS_PER_MINUTE * _NS_PER_MINUTE
+
+    def apply(self, batches: Iterable[QuoteBatch]) -> LiveUpdate:
+        """
+        Fold coalesced quotes into the bars and update the indicators of the changed bars
+
+        Args:
+            batches (Iterable[QuoteBatch]): Quotes of this ticker in time order
+
+        Returns:
+            LiveUpdate: Bars completed by the quotes and the forming last bar
+        """
+        bars, first_closed, late = self._bars, self._n - 1, 0
+        for batch in batches:
+            start = self.bar_start(batch.start_ns)
+            last = self._n - 1
+            if start < self._dates[last]:
+                late += 1
+                continue
+            if start == self._dates[last]:
+                bars['High'][last] = max(bars['High'][last], batch.high)
+                bars['Low'][last] = min(bars['Low'][last], batch.low)
+                bars['Close'][last] = batch.close
+                bars['Volume'][last] += batch.volume
+                continue
+
+            # The forming bar is complete: advance the checkpoint past it, fixing its indicators
+            final = self._checkpoint.update(bars['Close'][last:last + 1])
+            for name in self.columns:
+                self._indicators[name][last] = final[name][0]
+            if self._n == len(self._dates):
+                self._grow()
+                bars = self._bars
+            self._dates[self._n] = start
+            for name, value in zip(BAR_COLUMNS, (batch.open, batch.high, batch.low, batch.close, batch.volume)):
+                bars[name][self._n] = value
+            self._n += 1
+
+        last = self._n - 1
+        provisional = copy.deepcopy(self._checkpoint).update(self._bars['Close'][last:last + 1])
+        for name in self.columns:
+            self._indicators[name][last] = provisional[name][0]
+        frame = self.frame(first_closed)
+        return LiveUpdate(closed=frame.iloc[:-1], current=frame.iloc[-1], late=late)
+
+    def frame(self, start: int = 0) -> pd.DataFrame:
+        """
+        Bars and indicators from row `start` on, indexed by Date
+
+        Args:
+            start (int): First row (negative counts from the end)
+
+        Returns:
+            pd.DataFrame: OHLCV and indicator columns
+        """
+        start = start + self._n if start < 0 else start
+        start = max(0, start)
+        data = {name: self._bars[name][start:self._n] for name in BAR_COLUMNS}
+        data.update({name: self._indicators[name][start:self._n] for name in self.columns})
+        index = pd.DatetimeIndex(self._dates[start:self._n].astype('datetime64[ns]'), name='Date')
+        return pd.DataFrame(data, index=index)
+
+
+def render_live_panel(ticker: str, data: pd.DataFrame, interval: str = DAILY, source: Optional[QuoteSource] = None,
+                      refresh_seconds: float = LIVE_REFRESH_SECONDS, max_seconds: float = LIVE_MAX_SECONDS) -> None:
+    """
+    Stream quotes into live price, MACD and RSI charts until the session ends or the page reruns
+
+    The charts are created once; each refresh only appends new points with
+    add_rows and replaces the small metrics block, so no part of the page is
+    rerun or recomputed. The streaming loop is left out of the rerun's trace, and
+    the bars built from quotes stay in this session: the history cache only
+    holds downloaded bars.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        data (pd.DataFrame): Loaded OHLCV bars with a 'Date' column
+        interval (str): Bar interval of `data`
+        source (QuoteSource): Quote feed (defaults to the one configured by LIVE_QUOTE_SOURCE)
+        refresh_seconds (float): Seconds between updates sent to the browser
+        max_seconds (float): Length of the live session
+    """
+    series = LiveSeries(data, interval)
+    if source is None:
+        source = make_quote_source(LIVE_QUOTE_SOURCE, ticker, float(data['Close'].iloc[-1]))
+    buffer = TickBuffer()
+
+    status = st.empty()
+    # One placeholder per metric, so a refresh replaces four small elements and no layout
+    metrics = [column.empty() for column in st.columns(4)]
+    seed = series.frame(-LIVE_SEED_BARS)
+    # The last bar is still forming; the indicator charts get it from update.closed once it completes
+    completed = seed.iloc[:-1]
+    st.caption('Last price (one point per coalesced quote)')
+    price_chart = st.line_chart(seed[['Close']].rename(columns={'Close': 'Price'}), height=250)
+    st.caption('MACD (completed bars)')
+    macd_chart = st.line_chart(completed[['MACD', 'Signal']], height=200)
+    st.caption('RSI (completed bars)')
+    rsi_chart = st.line_chart(completed[['RSI']], height=200)
+
+    source.start(buffer)
+    symbol = ticker.upper()
+    deadline = time.monotonic() + max_seconds
+    # The loop runs for up to max_seconds; it is not part of the page rerun's time
+    with untraced():
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(refresh_seconds)
+                with span('live.refresh', 'emit'):
+                    batches = buffer.drain().get(symbol, [])
+                    if batches:
+                        update = series.apply(batches)
+                        points = batches[-MAX_POINTS_PER_REFRESH:]
+                        price_chart.add_rows(pd.DataFrame(
+                            {'Price': [batch.close for batch in points]},
+                            index=pd.DatetimeIndex([batch.end_ns for batch in points], name='Date')))
+                        if len(update.closed):
+                            macd_chart.add_rows(update.closed[['MACD', 'Signal']])
+                            rsi_chart.add_rows(update.closed[['RSI']])
+                        current = update.current
+                        metrics[0].metric("Last Price", f"${current['Close']:.2f}")
+                        metrics[1].metric("Bar High / Low", f"${current['High']:.2f} / ${current['Low']:.2f}")
+                        metrics[2].metric("RSI", f"{current['RSI']:.1f}")
+                        metrics[3].metric("MACD", f"{current['MACD']:.3f}")
+                    stats = buffer.stats
+                    status.caption(f"🔴 Live {symbol} · {stats['ticks']:,} ticks coalesced into {stats['drained']:,} quotes"
+                                   f" · {len(series):,} bars" + (f" · {stats['dropped']:,} dropped" if stats['dropped'] else ""))
+                if not source.running and not len(buffer):
+                    if source.error:
+                        status.error(f"Quote feed stopped: {source.error}")
+                    else:
+                        status.info("Quote replay finished")
+                    return
+            status.info("Live session ended; rerun the page to resume")
+        finally:
+            source.stop()
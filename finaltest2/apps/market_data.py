@@ -0,0 +1,327 @@
+"""
+Market Data Service - Cross-session and cross-replica cache for prices, scraped tables and news
+
+The backend is chosen with MARKET_DATA_BACKEND:
+    memory  in-process dictionary (default; one copy per process)
+    disk    pickle files under DATA_DIR/shared (one copy per host or shared volume)
+    redis   any Redis-compatible server at MARKET_DATA_REDIS_URL (one copy for all replicas)
+"""
+
+import os
+import time
+import math
+import uuid
+import pickle
+import hashlib
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from apps.datastore import DATA_DIR
+from apps.instrumentation import count_cache
+
+logger = logging.getLogger(__name__)
+
+MARKET_DATA_BACKEND = os.environ.get("MARKET_DATA_BACKEND", "memory").lower()
+MARKET_DATA_REDIS_URL = os.environ.get("MARKET_DATA_REDIS_URL", "redis://localhost:6379/0")
+
+# A fetch holding the cross-replica lock longer than this is presumed dead
+FETCH_LOCK_TTL = 60.0
+
+# How long a replica waits for another replica's fetch before fetching itself
+FETCH_WAIT_TIMEOUT = 30.0
+FETCH_POLL_INTERVAL = 0.2
+
+# Seconds between sweeps of expired values out of the in-process backend
+MEMORY_SWEEP_INTERVAL = 60.0
+
+
+class MemoryBackend:
+    """In-process store with per-key expiry; expired values are dropped when read and swept on writes."""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._locks: Dict[str, float] = {}
+        self._guard = threading.Lock()
+        self._next_sweep = time.time() + MEMORY_SWEEP_INTERVAL
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._guard:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            if item[0] < time.time():
+                del self._values[key]
+                return None
+            return item[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        with self._guard:
+            self._values[key] = (now + ttl, value)
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        """Drop every expired value and lock (caller holds the guard)"""
+        self._values = {key: item for key, item in self._values.items() if item[0] >= now}
+        self._locks = {key: expires_at for key, expires_at in self._locks.items() if expires_at > now}
+        self._next_sweep = now + MEMORY_SWEEP_INTERVAL
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        with self._guard:
+            if self._locks.get(key, 0.0) > time.time():
+                return False
+            self._locks[key] = time.time() + ttl
+            return True
+
+    def release(self, key: str) -> None:
+        with self._guard:
+            self._locks.pop(key, None)
+
+
+class DiskBackend:
+    """Pickle files with an expiry header, shared by every process that mounts the folder."""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the disk backend
+
+        Args:
+            root (str): Root data folder (defaults to DATA_DIR)
+        """
+        self.folder = os.path.join(root or DATA_DIR, "shared")
+        os.makedirs(self.folder, exist_ok=True)
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.folder, hashlib.sha1(key.encode()).hexdigest() + suffix)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key, ".pkl"), "rb") as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {str(e)}")
+            return None
+        return value if expires_at >= time.time() else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        path = self._path(key, ".pkl")
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((time.time() + ttl, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        path = self._path(key, ".lock")
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return True
+            except FileExistsError:
+                try:
+                    if os.path.getmtime(path) + ttl > time.time():
+                        return False
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        return False
+
+    def release(self, key: str) -> None:
+        try:
+            os.remove(self._path(key, ".lock"))
+        except FileNotFoundError:
+            pass
+
+
+class RedisBackend:
+    """Redis-compatible store; values are pickled, so the server must only be shared with trusted replicas."""
+
+    def __init__(self, client: Any = None, url: str = MARKET_DATA_REDIS_URL, prefix: str = "stockdash:"):
+        """
+        Initialize the Redis backend
+
+        Args:
+            client: Object with Redis get/set/delete semantics (a redis.Redis client or a stand-in)
+            url (str): Server URL used when no client is given (requires the redis package)
+            prefix (str): Key namespace
+
+        Raises:
+            ImportError: If no client is given and the redis package is not installed
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("MARKET_DATA_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                        ex=max(1, math.ceil(ttl)))
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        return bool(self.client.set(self.prefix + "lock:" + key, b"1", nx=True, ex=max(1, math.ceil(ttl))))
+
+    def release(self, key: str) -> None:
+        self.client.delete(self.prefix + "lock:" + key)
+
+
+def create_backend(name: str = MARKET_DATA_BACKEND):
+    """
+    Build the backend named by MARKET_DATA_BACKEND
+
+    Args:
+        name (str): 'memory', 'disk' or 'redis'
+
+    Returns:
+        MemoryBackend | DiskBackend | RedisBackend: The backend
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == "memory":
+        return MemoryBackend()
+    if name == "disk":
+        return DiskBackend()
+    if name == "redis":
+        return RedisBackend()
+    raise ValueError(f"Unknown MARKET_DATA_BACKEND: '{name}'")
+
+
+class MarketDataService:
+    """Read-through cache in front of upstream fetches, with single-flight deduplication of misses."""
+
+    def __init__(self, backend=None):
+        """
+        Initialize the service
+
+        Args:
+            backend: Storage backend (defaults to the one selected by MARKET_DATA_BACKEND)
+        """
+        self.backend = backend if backend is not None else create_backend()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key: str, accept: Optional[Callable[[Any], bool]]) -> Optional[Any]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Market data backend read failed for {key}: {str(e)}")
+            return None
+        if value is not None and (accept is None or accept(value)):
+            return value
+        return None
+
+    def get(self, key: str, accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        Return the shared value for `key` without fetching it
+
+        Args:
+            key (str): Cache key
+            accept (Callable): Optional check that rejects a cached value
+
+        Returns:
+            Any: The cached value, or None if it is missing, expired or rejected
+        """
+        value = self._lookup(key, accept)
+        count_cache('market_data', hit=value is not None)
+        return value
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Share a value fetched outside get_or_fetch, such as one ticker of a batch download
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to share
+            ttl (float): Seconds the value stays valid
+        """
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"Market data backend write failed for {key}: {str(e)}")
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any], ttl: float,
+                     accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return the shared value for `key`, fetching it at most once across threads and replicas
+
+        Concurrent misses in this process wait on one fetch; other replicas wait for
+        the holder of the backend lock and read its result. A fetch returning None
+        is not cached.
+
+        Args:
+            key (str): Cache key
+            fetch (Callable): Zero-argument function producing the value
+            ttl (float): Seconds the value stays valid
+            accept (Callable): Optional check that rejects a cached value (e.g. too short a history)
+
+        Returns:
+            Any: The cached or freshly fetched value
+        """
+        value = self._lookup(key, accept)
+        if value is not None:
+            count_cache('market_data', hit=True)
+            return value
+
+        with self._key_lock(key):
+            value = self._lookup(key, accept)
+            if value is not None:
+                count_cache('market_data', hit=True)
+                return value
+
+            try:
+                owner = self.backend.acquire(key, FETCH_LOCK_TTL)
+            except Exception as e:
+                logger.warning(f"Market data backend lock failed for {key}: {str(e)}")
+                owner = True
+            if not owner:
+                deadline = time.time() + FETCH_WAIT_TIMEOUT
+                while time.time() < deadline:
+                    time.sleep(FETCH_POLL_INTERVAL)
+                    value = self._lookup(key, accept)
+                    if value is not None:
+                        count_cache('market_data', hit=True)
+                        return value
+                logger.warning(f"Timed out waiting for another replica to fetch {key}")
+
+            count_cache('market_data', hit=False)
+            try:
+                value = fetch()
+                if value is not None:
+                    self.put(key, value, ttl)
+                return value
+            finally:
+                if owner:
+                    try:
+                        self.backend.release(key)
+                    except Exception as e:
+                        logger.warning(f"Market data backend unlock failed for {key}: {str(e)}")
+
+
+_service: Optional[MarketDataService] = None
+_service_guard = threading.Lock()
+
+
+def get_market_data() -> MarketDataService:
+    """Return the process-wide market data service"""
+    global _service
+    with _service_guard:
+        if _service is None:
+            _service = MarketDataService()
+            logger.info(f"Market data backend: {type(_service.backend).__name__}")
+        return _service
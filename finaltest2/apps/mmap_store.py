@@ -0,0 +1,221 @@
+"""
+Memory-Mapped Price Arrays - Fixed-layout column files shared by every server process on a host
+
+Each ticker's history is written once as a binary file of contiguous 8-byte
+columns (Date as int64 epoch nanoseconds, then the OHLCV columns) described by
+a small JSON header. Processes open the file read-only with np.memmap, so they
+all read the same page-cached copy, and date ranges are zero-copy views.
+"""
+
+import os
+import glob
+import json
+import uuid
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from apps.datastore import DATA_DIR, safe_ticker_name
+
+logger = logging.getLogger(__name__)
+
+MMAP_HISTORY = os.environ.get("MMAP_HISTORY", "0").lower() in ("1", "true", "yes")
+
+# Stored width of numeric columns by dtype kind; other columns are not written
+_COLUMN_DTYPES = {'i': '<i8', 'u': '<i8', 'f': '<f8'}
+
+
+class PriceArrays:
+    """
+    Named, equal-length column arrays that the indicator and plotting functions accept in place of a DataFrame
+
+    Like a DataFrame, len() is the number of rows and iteration yields column names.
+    Columns assigned after construction are held in memory and never written back.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Initialize the arrays
+
+        Args:
+            columns (Dict[str, np.ndarray]): Column name -> 1-D array, 'Date' as datetime64[ns]
+        """
+        self._columns = dict(columns)
+        lengths = {len(values) for values in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __setitem__(self, name: str, values) -> None:
+        values = np.asarray(values)
+        if values.ndim == 0:
+            values = np.full(len(self), values)
+        if len(self._columns) and len(values) != len(self):
+            raise ValueError(f"Column '{name}' has {len(values)} rows, expected {len(self)}")
+        self._columns[name] = values
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def slice(self, lo: int, hi: int) -> "PriceArrays":
+        """Zero-copy row slice"""
+        return PriceArrays({name: values[lo:hi] for name, values in self._columns.items()})
+
+    def get_range(self, start_date: str, end_date: str) -> "PriceArrays":
+        """
+        Zero-copy view of the rows in [start_date, end_date)
+
+        Args:
+            start_date (str): Start date (inclusive)
+            end_date (str): End date (exclusive)
+
+        Returns:
+            PriceArrays: The rows in range
+        """
+        dates = self._columns['Date']
+        lo = dates.searchsorted(pd.Timestamp(start_date).to_datetime64(), side='left')
+        hi = dates.searchsorted(pd.Timestamp(end_date).to_datetime64(), side='left')
+        return self.slice(lo, hi)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame whose columns share memory with the arrays (read-only where they are mapped)"""
+        return pd.DataFrame(self._columns, copy=False)
+
+
+class MmapPriceStore:
+    """Writes histories as fixed-layout column files and maps them read-only."""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the store
+
+        Args:
+            root (str): Root data folder (defaults to DATA_DIR)
+        """
+        self.folder = os.path.join(root or DATA_DIR, "mmap")
+        os.makedirs(self.folder, exist_ok=True)
+
+    def _header_path(self, ticker: str) -> str:
+        return os.path.join(self.folder, f"{safe_ticker_name(ticker)}.json")
+
+    def read_header(self, ticker: str) -> Optional[dict]:
+        """Read the header of a ticker's current column file, or None"""
+        try:
+            with open(self._header_path(ticker)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write(self, ticker: str, history: pd.DataFrame, covered_from: str,
+              loaded_at: Optional[datetime] = None) -> dict:
+        """
+        Write a history as a new column file and make it the ticker's current one
+
+        The data file gets a unique name and the header is replaced atomically, so
+        readers see either the old or the new file; processes still mapping an old
+        file keep their pages until they remap.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            history (pd.DataFrame): OHLCV frame indexed by Date (or with a 'Date' column)
+            covered_from (str): Earliest date the history is complete from
+            loaded_at (datetime): When the history was fetched (defaults to now)
+
+        Returns:
+            dict: Header describing the written file
+        """
+        frame = history if 'Date' in history.columns else history.reset_index()
+        arrays = {'Date': pd.DatetimeIndex(frame['Date']).asi8}
+        for name in frame.columns:
+            if name != 'Date' and frame[name].dtype.kind in _COLUMN_DTYPES:
+                arrays[name] = frame[name].to_numpy(dtype=_COLUMN_DTYPES[frame[name].dtype.kind])
+
+        name = os.path.join(safe_ticker_name(ticker), f"{uuid.uuid4().hex}.bin")
+        os.makedirs(os.path.join(self.folder, safe_ticker_name(ticker)), exist_ok=True)
+        with open(os.path.join(self.folder, name), "wb") as f:
+            for values in arrays.values():
+                f.write(np.ascontiguousarray(values).tobytes())
+
+        header = {
+            "file": name,
+            "rows": len(frame),
+            "columns": [[column, values.dtype.str] for column, values in arrays.items()],
+            "covered_from": covered_from,
+            "loaded_at": (loaded_at or datetime.now()).isoformat(),
+        }
+        tmp_path = f"{self._header_path(ticker)}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(header, f)
+        os.replace(tmp_path, self._header_path(ticker))
+        self._remove_old_files(ticker, keep=name)
+        return header
+
+    def _remove_old_files(self, ticker: str, keep: str) -> None:
+        for path in glob.glob(os.path.join(self.folder, safe_ticker_name(ticker), "*.bin")):
+            if os.path.relpath(path, self.folder) != keep:
+                try:
+                    # Existing mappings stay valid after unlink on POSIX
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def map(self, header: dict) -> Optional[PriceArrays]:
+        """
+        Map the file described by a header
+
+        Args:
+            header (dict): Header from write() or read_header()
+
+        Returns:
+            Optional[PriceArrays]: Read-only mapped columns, or None if the file is gone
+        """
+        path = os.path.join(self.folder, header["file"])
+        rows, columns, offset = header["rows"], {}, 0
+        try:
+            raw = np.memmap(path, dtype=np.uint8, mode='r') if rows else np.empty(0, dtype=np.uint8)
+        except (FileNotFoundError, ValueError) as e:
+            logger.debug(f"Column file {path} unavailable: {str(e)}")
+            return None
+        for name, dtype in header["columns"]:
+            size = rows * np.dtype(dtype).itemsize
+            # Every column is 8 bytes wide, so each view stays aligned within the page-aligned mapping
+            values = raw[offset:offset + size].view(dtype)
+            columns[name] = values.view('datetime64[ns]') if name == 'Date' else values
+            offset += size
+        return PriceArrays(columns)
+
+    def open(self, ticker: str) -> Optional[tuple]:
+        """
+        Map a ticker's current column file
+
+        Args:
+            ticker (str): Stock ticker symbol
+
+        Returns:
+            Optional[tuple]: (PriceArrays, header), or None if nothing usable is stored
+        """
+        for _ in range(2):
+            # A concurrent write may replace the file between reading the header and mapping it
+            header = self.read_header(ticker)
+            if header is None:
+                return None
+            arrays = self.map(header)
+            if arrays is not None:
+                return arrays, header
+        return None
+
@@ -0,0 +1,273 @@
+"""
+Prophet Model Cache - Serialized fitted models with warm-started refits
+"""
+
+import os
+import glob
+import threading
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+import pandas as pd
+
+from apps.datastore import DATA_DIR, safe_ticker_name
+from apps.instrumentation import count_cache, counted_cache, span
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+logger = logging.getLogger(__name__)
+
+# Number of fitted models kept deserialized in memory
+MAX_MODELS_IN_MEMORY = 16
+
+
+class ModelKey(NamedTuple):
+    """Identity of a fitted model: same ticker, training data end and seasonality flags"""
+    ticker: str
+    trained_through: str
+    yearly_seasonality: bool
+    weekly_seasonality: bool
+
+    @property
+    def family(self) -> str:
+        """File name prefix shared by all models of a ticker with the same flags"""
+        return f"{safe_ticker_name(self.ticker)}_y{int(self.yearly_seasonality)}w{int(self.weekly_seasonality)}"
+
+    @property
+    def filename(self) -> str:
+        return f"{self.family}_{self.trained_through}.json"
+
+
+@counted_cache('prophet_import', lru_cache(maxsize=None))
+def load_prophet():
+    """
+    Import Prophet on first use, since the import alone takes seconds
+
+    Returns:
+        SimpleNamespace: Prophet, model_to_json, model_from_json and plot_plotly
+    """
+    try:
+        from prophet import Prophet
+        from prophet.serialize import model_to_json, model_from_json
+        from prophet.plot import plot_plotly
+    except ImportError:
+        from fbprophet import Prophet
+        from fbprophet.serialize import model_to_json, model_from_json
+        from fbprophet.plot import plot_plotly
+    return SimpleNamespace(Prophet=Prophet, model_to_json=model_to_json,
+                           model_from_json=model_from_json, plot_plotly=plot_plotly)
+
+
+def build_prophet_model(yearly_seasonality: bool = True, weekly_seasonality: bool = True) -> "Prophet":
+    """Create an unfitted Prophet model with the dashboard's settings"""
+    return load_prophet().Prophet(
+        yearly_seasonality=yearly_seasonality,
+        weekly_seasonality=weekly_seasonality,
+        daily_seasonality=False,
+        interval_width=0.95,
+        changepoint_prior_scale=0.05
+    )
+
+
+def warm_start_params(model: "Prophet") -> dict:
+    """
+    Extract fitted parameters to initialize the optimizer of a refit
+
+    Args:
+        model (Prophet): A fitted model with the same seasonality flags
+
+    Returns:
+        dict: Initial values for k, m, sigma_obs, delta and beta
+    """
+    params = {name: model.params[name][0][0] for name in ['k', 'm', 'sigma_obs']}
+    params.update({name: model.params[name][0] for name in ['delta', 'beta']})
+    return params
+
+
+class ProphetModelCache:
+    """Fitted Prophet models kept in memory (LRU) and serialized on disk, keyed by ModelKey."""
+
+    def __init__(self, root: Optional[str] = None, max_in_memory: int = MAX_MODELS_IN_MEMORY):
+        """
+        Initialize the model cache
+
+        Args:
+            root (str): Root data folder (defaults to DATA_DIR)
+            max_in_memory (int): Number of deserialized models kept in memory
+        """
+        self.folder = os.path.join(root or DATA_DIR, "models")
+        self.max_in_memory = max_in_memory
+        self._models: "OrderedDict[ModelKey, Prophet]" = OrderedDict()
+        self._guard = threading.Lock()
+
+    def _path(self, key: ModelKey) -> str:
+        return os.path.join(self.folder, key.filename)
+
+    def get(self, key: ModelKey) -> Optional["Prophet"]:
+        """
+        Look up a fitted model in memory, then on disk
+
+        Args:
+            key (ModelKey): Model identity
+
+        Returns:
+            Optional[Prophet]: The fitted model, or None on a miss
+        """
+        with self._guard:
+            if key in self._models:
+                self._models.move_to_end(key)
+                count_cache('prophet_models', hit=True)
+                return self._models[key]
+        try:
+            with open(self._path(key)) as f:
+                model = load_prophet().model_from_json(f.read())
+        except FileNotFoundError:
+            count_cache('prophet_models', hit=False)
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable model {key.filename}: {str(e)}")
+            count_cache('prophet_models', hit=False)
+            return None
+        count_cache('prophet_models', hit=True)
+        self._remember(key, model)
+        return model
+
+    def get_loaded(self, key: ModelKey) -> Optional["Prophet"]:
+        """
+        Look up a model already deserialized in memory, without reading the disk or importing Prophet
+
+        Args:
+            key (ModelKey): Model identity
+
+        Returns:
+            Optional[Prophet]: The fitted model, or None if it is not in memory
+        """
+        with self._guard:
+            if key not in self._models:
+                return None
+            self._models.move_to_end(key)
+            return self._models[key]
+
+    def put(self, key: ModelKey, model: "Prophet") -> None:
+        """
+        Store a fitted model, replacing older models of the same family on disk
+
+        Args:
+            key (ModelKey): Model identity
+            model (Prophet): Fitted model
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(key)
+        with open(f"{path}.tmp", "w") as f:
+            f.write(load_prophet().model_to_json(model))
+        os.replace(f"{path}.tmp", path)
+        for old_path in glob.glob(os.path.join(self.folder, f"{key.family}_*.json")):
+            if old_path != path:
+                os.remove(old_path)
+        self._remember(key, model)
+
+    def latest(self, key: ModelKey) -> Optional["Prophet"]:
+        """
+        Find the most recent model of the same family trained before `key`, for warm starts
+
+        Args:
+            key (ModelKey): Identity of the model about to be fitted
+
+        Returns:
+            Optional[Prophet]: The previous fitted model, or None
+        """
+        candidates = sorted(glob.glob(os.path.join(self.folder, f"{key.family}_*.json")))
+        for path in reversed(candidates):
+            trained_through = os.path.basename(path)[len(key.family) + 1:-len(".json")]
+            if trained_through < key.trained_through:
+                return self.get(key._replace(trained_through=trained_through))
+        return None
+
+    def _remember(self, key: ModelKey, model: "Prophet") -> None:
+        with self._guard:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_in_memory:
+                self._models.popitem(last=False)
+
+
+def fit_prophet_model(data: pd.DataFrame, yearly_seasonality: bool = True, weekly_seasonality: bool = True,
+                      init: Optional[dict] = None) -> "Prophet":
+    """
+    Fit a Prophet model on Date/Close data
+
+    Args:
+        data (pd.DataFrame): Historical data with 'Date' and 'Close' columns
+        yearly_seasonality (bool): Enable yearly seasonality
+        weekly_seasonality (bool): Enable weekly seasonality
+        init (dict): Optional warm-start parameters from warm_start_params
+
+    Returns:
+        Prophet: The fitted model
+    """
+    df_train = data[['Date', 'Close']].rename(columns={'Date': 'ds', 'Close': 'y'})
+    model = build_prophet_model(yearly_seasonality, weekly_seasonality)
+    with span('prophet.fit', 'compute'):
+        if init is not None:
+            model.fit(df_train, init=init)
+        else:
+            model.fit(df_train)
+    return model
+
+
+def get_or_fit_model(ticker: str, data: pd.DataFrame, yearly_seasonality: bool = True,
+                     weekly_seasonality: bool = True, cache: Optional[ProphetModelCache] = None) -> "Prophet":
+    """
+    Return a cached model for this ticker, training end and flags, fitting it on a miss
+
+    A miss warm-starts the optimizer from the ticker's previous model with the
+    same flags (e.g. when one new day of data has arrived).
+
+    Args:
+        ticker (str): Stock ticker symbol
+        data (pd.DataFrame): Historical data with 'Date' and 'Close' columns
+        yearly_seasonality (bool): Enable yearly seasonality
+        weekly_seasonality (bool): Enable weekly seasonality
+        cache (ProphetModelCache): Cache to use (defaults to the process-wide cache)
+
+    Returns:
+        Prophet: The fitted model
+    """
+    cache = cache or get_model_cache()
+    trained_through = pd.Timestamp(data['Date'].max()).strftime("%Y-%m-%d")
+    key = ModelKey(ticker, trained_through, bool(yearly_seasonality), bool(weekly_seasonality))
+
+    model = cache.get(key)
+    if model is not None:
+        logger.info(f"Model cache hit for {key.filename}")
+        return model
+
+    previous = cache.latest(key)
+    init = None
+    if previous is not None:
+        try:
+            init = warm_start_params(previous)
+        except (AttributeError, KeyError, TypeError) as e:
+            logger.warning(f"Cannot warm-start {key.filename}: {str(e)}")
+
+    logger.info(f"Fitting {key.filename} ({'warm' if init else 'cold'} start)")
+    model = fit_prophet_model(data, yearly_seasonality, weekly_seasonality, init=init)
+    cache.put(key, model)
+    return model
+
+
+_cache: Optional[ProphetModelCache] = None
+_cache_guard = threading.Lock()
+
+
+def get_model_cache() -> ProphetModelCache:
+    """Return the process-wide model cache"""
+    global _cache
+    with _cache_guard:
+        if _cache is None:
+            _cache = ProphetModelCache()
+        return _cache
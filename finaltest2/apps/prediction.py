@@ -5,78 +5,83 @@ Prediction Page - Stock Price Forecasting using Prophet
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+import time
 import logging
-
-try:
-    from prophet import Prophet
-    from prophet.plot import plot_plotly
-except ImportError:
-    from fbprophet import Prophet
-    from fbprophet.plot import plot_plotly
+from typing import Optional
 
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from apps.utils import get_ticker_selection, load_stock_data
+from apps.model_cache import ModelKey, get_model_cache, get_or_fit_model, fit_prophet_model, load_prophet
+from apps.fast_forecast import FAST_ENGINES
+from apps.forecast_jobs import get_job_queue
+from apps.batch_forecast import load_precomputed_forecast
+from apps.instrumentation import count_cache, span
 
 logger = logging.getLogger(__name__)
 
 START_DATE = "2015-01-01"
 
+# Seconds between reruns while a background forecast job is pending
+JOB_POLL_INTERVAL = 1.0
+
+PROPHET_ENGINE = 'Prophet'
+
 
-@st.cache_data(ttl=3600)
 def load_data_for_prophet(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    """Load historical data for Prophet model"""
-    data = load_stock_data(ticker, start_date, end_date)
-    return data[['Date', 'Close']].copy()
+    """Load historical data for Prophet model (a view over the shared history cache)"""
+    return load_stock_data(ticker, start_date, end_date)
 
 
 def plot_raw_data(data: pd.DataFrame, ticker: str) -> None:
     """Plot raw stock data with open and close prices"""
-    fig = go.Figure()
+    with span('prediction.raw_figure', 'figure'):
+        fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=data['Date'],
-        y=data['Open'],
-        name='Open Price',
-        line=dict(color='blue')
-    ))
+        fig.add_trace(go.Scatter(
+            x=data['Date'],
+            y=data['Open'],
+            name='Open Price',
+            line=dict(color='blue')
+        ))
     
-    fig.add_trace(go.Scatter(
-        x=data['Date'],
-        y=data['Close'],
-        name='Close Price',
-        line=dict(color='orange')
-    ))
+        fig.add_trace(go.Scatter(
+            x=data['Date'],
+            y=data['Close'],
+            name='Close Price',
+            line=dict(color='orange')
+        ))
     
-    fig.update_layout(
-        title=f'{ticker} - Historical Price Data',
-        xaxis_title='Date',
-        yaxis_title='Price (USD)',
-        height=500,
-        hovermode='x unified',
-        xaxis_rangeslider_visible=True
-    )
+        fig.update_layout(
+            title=f'{ticker} - Historical Price Data',
+            xaxis_title='Date',
+            yaxis_title='Price (USD)',
+            height=500,
+            hovermode='x unified',
+            xaxis_rangeslider_visible=True
+        )
     
-    st.plotly_chart(fig, use_container_width=True)
+    with span('prediction.raw_chart', 'emit'):
+        st.plotly_chart(fig, use_container_width=True)
 
 
-def create_prophet_forecast(data: pd.DataFrame, periods: int, yearly_seasonality: bool = True, weekly_seasonality: bool = True) -> tuple:
-    """Create Prophet model and generate forecast"""
+def create_prophet_forecast(data: pd.DataFrame, periods: int, yearly_seasonality: bool = True, weekly_seasonality: bool = True, ticker: Optional[str] = None) -> tuple:
+    """
+    Create Prophet model and generate forecast
+    
+    With a ticker, the fitted model is taken from the model cache (keyed by ticker,
+    last training date and seasonality flags), so a new horizon only runs predict.
+    """
     try:
-        df_train = data.rename(columns={'Date': 'ds', 'Close': 'y'})
-        
-        model = Prophet(
-            yearly_seasonality=yearly_seasonality,
-            weekly_seasonality=weekly_seasonality,
-            daily_seasonality=False,
-            interval_width=0.95,
-            changepoint_prior_scale=0.05
-        )
-        
         with st.spinner('Training Prophet model...'):
-            model.fit(df_train)
+            if ticker:
+                model = get_or_fit_model(ticker, data, yearly_seasonality, weekly_seasonality)
+            else:
+                model = fit_prophet_model(data, yearly_seasonality, weekly_seasonality)
         
-        future = model.make_future_dataframe(periods=periods)
-        forecast = model.predict(future)
+        with span('prophet.predict', 'compute'):
+            future = model.make_future_dataframe(periods=periods)
+            forecast = model.predict(future)
         
         return model, forecast
     
@@ -85,6 +90,132 @@ def create_prophet_forecast(data: pd.DataFrame, periods: int, yearly_seasonality
         raise
 
 
+def load_precomputed_forecast_with_model(ticker: str, data: pd.DataFrame, periods: int, yearly_seasonality: bool, weekly_seasonality: bool) -> Optional[tuple]:
+    """
+    Return (model, forecast) from the batch artifacts, or None when missing or stale
+    
+    The artifact is served on its own; the fitted model is included only when it is
+    already in memory, so this path never loads or imports Prophet.
+    """
+    trained_through = pd.Timestamp(data['Date'].max()).strftime("%Y-%m-%d")
+    forecast = load_precomputed_forecast(ticker, periods, trained_through, yearly_seasonality, weekly_seasonality)
+    count_cache('precomputed_forecasts', hit=forecast is not None)
+    if forecast is None:
+        return None
+    model = get_model_cache().get_loaded(ModelKey(ticker, trained_through, yearly_seasonality, weekly_seasonality))
+    return model, forecast
+
+
+def plot_forecast(data: pd.DataFrame, forecast: pd.DataFrame) -> go.Figure:
+    """Plot actual closes with a forecast and its uncertainty band (for engines without a Prophet model)"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=forecast['ds'],
+        y=forecast['yhat_upper'],
+        line=dict(width=0),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=forecast['ds'],
+        y=forecast['yhat_lower'],
+        fill='tonexty',
+        fillcolor='rgba(0, 114, 178, 0.2)',
+        line=dict(width=0),
+        name='95% Interval'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=forecast['ds'],
+        y=forecast['yhat'],
+        name='Forecast',
+        line=dict(color='#0072B2', width=2)
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=data['Date'],
+        y=data['Close'],
+        name='Actual',
+        mode='markers',
+        marker=dict(color='black', size=3)
+    ))
+    
+    return fig
+
+
+def plot_forecast_components(forecast: pd.DataFrame) -> Optional[go.Figure]:
+    """Plot the trend and seasonal columns of a Prophet forecast without the model (None if it has none)"""
+    components = [column for column in ('trend', 'yearly', 'weekly') if column in forecast]
+    if not components:
+        return None
+    
+    fig = make_subplots(rows=len(components), cols=1, shared_xaxes=True, subplot_titles=components)
+    for row, column in enumerate(components, 1):
+        fig.add_trace(go.Scatter(
+            x=forecast['ds'],
+            y=forecast[column],
+            name=column,
+            line=dict(color='#0072B2', width=2)
+        ), row=row, col=1)
+    fig.update_layout(height=250 * len(components), showlegend=False)
+    return fig
+
+
+def render_forecast(model, forecast: pd.DataFrame, data: pd.DataFrame, ticker: str, n_months: int, yearly_seasonality: bool, weekly_seasonality: bool) -> None:
+    """Render forecast tables, charts and summary metrics (model is None for fast engines)"""
+    st.success('✅ Forecast generated successfully!')
+    
+    st.subheader('📈 Forecast Results')
+    forecast_display = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy()
+    forecast_display.columns = ['Date', 'Forecast', 'Lower Bound', 'Upper Bound']
+    forecast_display = forecast_display[forecast_display['Date'] > data['Date'].max()]
+    
+    st.dataframe(forecast_display.tail(20), use_container_width=True, hide_index=True)
+    
+    st.subheader('🎯 Forecast Visualization')
+    with span('prediction.forecast_figure', 'figure'):
+        fig = load_prophet().plot_plotly(model, forecast) if model is not None else plot_forecast(data, forecast)
+        fig.update_layout(title=f'{ticker} - {n_months} Month Price Forecast', xaxis_title='Date', yaxis_title='Price (USD)', height=600, hovermode='x unified')
+    with span('prediction.forecast_chart', 'emit'):
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader('📊 Forecast Summary')
+    col1, col2, col3, col4 = st.columns(4)
+    
+    last_price = data['Close'].iloc[-1]
+    forecast_price = forecast['yhat'].iloc[-1]
+    lower_bound = forecast['yhat_lower'].iloc[-1]
+    upper_bound = forecast['yhat_upper'].iloc[-1]
+    price_change = forecast_price - last_price
+    percent_change = (price_change / last_price) * 100
+    
+    with col1:
+        st.metric("Current Price", f"${last_price:.2f}")
+    with col2:
+        st.metric("Forecasted Price", f"${forecast_price:.2f}", f"{percent_change:+.2f}%")
+    with col3:
+        st.metric("Lower Bound (95%)", f"${lower_bound:.2f}")
+    with col4:
+        st.metric("Upper Bound (95%)", f"${upper_bound:.2f}")
+    
+    if model is not None and (yearly_seasonality or weekly_seasonality):
+        st.subheader('🔍 Forecast Components')
+        with span('prediction.components_figure', 'figure'):
+            fig_components = model.plot_components(forecast)
+        with span('prediction.components_chart', 'emit'):
+            st.pyplot(fig_components)
+    elif yearly_seasonality or weekly_seasonality:
+        # Precomputed forecasts carry their components even when the model is not loaded
+        with span('prediction.components_figure', 'figure'):
+            fig_components = plot_forecast_components(forecast)
+        if fig_components is not None:
+            st.subheader('🔍 Forecast Components')
+            with span('prediction.components_chart', 'emit'):
+                st.plotly_chart(fig_components, use_container_width=True)
+
+
 def app():
     """Main prediction app"""
     
@@ -93,7 +224,8 @@ def app():
     st.markdown('''
     ---
     ### AI-Powered Price Prediction
-    Forecast future stock prices using Facebook's Prophet time-series forecasting model.
+    Forecast future stock prices using Facebook's Prophet time-series forecasting model,
+    or one of the fast baseline engines for instant results.
     
     **Note**: Forecasts are based on historical patterns and should not be considered investment advice.
     ___
@@ -107,7 +239,7 @@ def app():
     with col2:
         period_days = n_months * 30
     
-    with st.spinner(f'Loading historical data for {ticker}...'):
+    with st.spinner(f'Loading historical data for {ticker}...'), span('prediction.load_prices', 'load'):
         try:
             today = datetime.now()
             end_date = today.strftime("%Y-%m-%d")
@@ -129,51 +261,56 @@ def app():
         with col2:
             weekly_seasonality = st.checkbox('Enable Weekly Seasonality', value=True, help="Account for weekly patterns in stock price")
     
+    engine = st.radio(
+        'Forecast Engine',
+        [PROPHET_ENGINE, *FAST_ENGINES],
+        horizontal=True,
+        help="Fast engines are vectorized baseline models that return in milliseconds"
+    )
+    
+    request = (ticker, period_days, yearly_seasonality, weekly_seasonality)
     if st.button('Generate Forecast', use_container_width=True):
+        st.session_state.pop('forecast_job', None)
         try:
-            model, forecast = create_prophet_forecast(data, period_days, yearly_seasonality=yearly_seasonality, weekly_seasonality=weekly_seasonality)
-            
-            st.success('✅ Forecast generated successfully!')
-            
-            st.subheader('📈 Forecast Results')
-            forecast_display = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy()
-            forecast_display.columns = ['Date', 'Forecast', 'Lower Bound', 'Upper Bound']
-            forecast_display = forecast_display[forecast_display['Date'] > data['Date'].max()]
-            
-            st.dataframe(forecast_display.tail(20), use_container_width=True, hide_index=True)
-            
-            st.subheader('🎯 Forecast Visualization')
-            fig = plot_plotly(model, forecast)
-            fig.update_layout(title=f'{ticker} - {n_months} Month Price Forecast', xaxis_title='Date', yaxis_title='Price (USD)', height=600, hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.subheader('📊 Forecast Summary')
-            col1, col2, col3, col4 = st.columns(4)
-            
-            last_price = data['Close'].iloc[-1]
-            forecast_price = forecast['yhat'].iloc[-1]
-            lower_bound = forecast['yhat_lower'].iloc[-1]
-            upper_bound = forecast['yhat_upper'].iloc[-1]
-            price_change = forecast_price - last_price
-            percent_change = (price_change / last_price) * 100
-            
-            with col1:
-                st.metric("Current Price", f"${last_price:.2f}")
-            with col2:
-                st.metric("Forecasted Price", f"${forecast_price:.2f}", f"{percent_change:+.2f}%")
-            with col3:
-                st.metric("Lower Bound (95%)", f"${lower_bound:.2f}")
-            with col4:
-                st.metric("Upper Bound (95%)", f"${upper_bound:.2f}")
-            
-            if yearly_seasonality or weekly_seasonality:
-                st.subheader('🔍 Forecast Components')
-                fig_components = model.plot_components(forecast)
-                st.pyplot(fig_components)
-        
+            if engine != PROPHET_ENGINE:
+                with span('forecast.fast_engine', 'compute'):
+                    forecast = FAST_ENGINES[engine](data, period_days, yearly_seasonality, weekly_seasonality)
+                render_forecast(None, forecast, data, ticker, n_months, yearly_seasonality, weekly_seasonality)
+            else:
+                # Serve the nightly precomputed forecast when it matches this request
+                with span('forecast.precomputed', 'load'):
+                    precomputed = load_precomputed_forecast_with_model(ticker, data, period_days, yearly_seasonality, weekly_seasonality)
+                if precomputed is not None:
+                    render_forecast(*precomputed, data, ticker, n_months, yearly_seasonality, weekly_seasonality)
+                else:
+                    job_id = get_job_queue().submit(ticker, data, period_days, yearly_seasonality, weekly_seasonality)
+                    st.session_state.forecast_job = {'job_id': job_id, 'request': request}
         except Exception as e:
             logger.error(f"Error generating forecast: {str(e)}")
             st.error(f"❌ Error generating forecast: {str(e)}")
     
+    # Poll the background job for this session's current request
+    job = st.session_state.get('forecast_job')
+    if job is not None and job['request'] == request:
+        queue = get_job_queue()
+        status = queue.status(job['job_id'])
+        
+        if status.state in ('queued', 'running'):
+            label = 'Waiting for a free forecast worker' if status.state == 'queued' else 'Training Prophet model'
+            st.progress(status.progress, text=f"{label}... ({status.elapsed:.0f}s)")
+            time.sleep(JOB_POLL_INTERVAL)
+            st.rerun()
+        elif status.state == 'failed':
+            st.error(f"❌ Error generating forecast: {status.error}")
+        elif status.state == 'done':
+            try:
+                model, forecast = queue.result(job['job_id'])
+                render_forecast(model, forecast, data, ticker, n_months, yearly_seasonality, weekly_seasonality)
+            except Exception as e:
+                logger.error(f"Error generating forecast: {str(e)}")
+                st.error(f"❌ Error generating forecast: {str(e)}")
+        else:
+            del st.session_state['forecast_job']
+    
     st.markdown("---")
     st.warning("⚠️ **Disclaimer**: This forecast is based on historical patterns and machine learning algorithms. It should not be used as investment advice. Always conduct your own research and consult with financial advisors.")
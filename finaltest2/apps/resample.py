@@ -0,0 +1,175 @@
+"""
+Bar Resampling - Interval-aware OHLCV bars and vectorized resampling to coarser resolutions
+
+Intervals use yfinance names and form one ladder, finest first:
+
+    1m -> 5m -> 15m -> 30m -> 1h -> 1d -> 1wk -> 1mo
+
+Only some intervals are downloaded (each as far back as Yahoo serves it); the
+others are built from a finer downloaded interval. Intraday buckets are anchored
+at each session's first bar, so hourly bars of a 09:30 open start at 09:30 as
+Yahoo's do; daily and longer buckets follow the calendar (weeks start on Monday).
+Every bucket is dated by its start.
+"""
+
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DAILY = '1d'
+
+# Every supported interval, finest first, with its display label
+INTERVALS: Dict[str, str] = {
+    '1m': '1-Minute',
+    '5m': '5-Minute',
+    '15m': '15-Minute',
+    '30m': '30-Minute',
+    '1h': 'Hourly',
+    '1d': 'Daily',
+    '1wk': 'Weekly',
+    '1mo': 'Monthly',
+}
+
+# Intervals downloaded from Yahoo, with how far back one request may reach (None = full history)
+DOWNLOAD_LOOKBACK: Dict[str, Optional[timedelta]] = {
+    '1m': timedelta(days=7),
+    '5m': timedelta(days=59),
+    '1h': timedelta(days=729),
+    '1d': None,
+}
+
+# Interval each derived interval is built from
+RESAMPLE_SOURCE: Dict[str, str] = {
+    '15m': '5m',
+    '30m': '5m',
+    '1wk': '1d',
+    '1mo': '1d',
+}
+
+# How each OHLCV column is aggregated into a bucket; other columns are dropped
+AGGREGATIONS: Dict[str, str] = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Adj Close': 'last',
+    'Volume': 'sum',
+}
+
+_NS_PER_DAY = 86_400 * 10 ** 9
+
+# Fixed bucket widths of the intraday intervals
+_INTRADAY_STEPS: Dict[str, int] = {
+    '1m': 60 * 10 ** 9,
+    '5m': 5 * 60 * 10 ** 9,
+    '15m': 15 * 60 * 10 ** 9,
+    '30m': 30 * 60 * 10 ** 9,
+    '1h': 3600 * 10 ** 9,
+}
+
+
+def is_intraday(interval: str) -> bool:
+    """Whether bars of this interval are shorter than a day"""
+    return interval in _INTRADAY_STEPS
+
+
+def interval_step(interval: str) -> int:
+    """Width of an intraday interval's buckets in nanoseconds"""
+    if not is_intraday(interval):
+        raise ValueError(f"Interval '{interval}' follows the calendar and has no fixed width")
+    return _INTRADAY_STEPS[interval]
+
+
+def check_interval(interval: str) -> str:
+    """
+    Validate an interval name
+
+    Args:
+        interval (str): yfinance interval name
+
+    Returns:
+        str: The interval
+
+    Raises:
+        ValueError: If the interval is not supported
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Unsupported interval '{interval}', expected one of {', '.join(INTERVALS)}")
+    return interval
+
+
+def coarser_intervals(interval: str) -> List[str]:
+    """Intervals coarser than `interval`, finest first"""
+    names = list(INTERVALS)
+    return names[names.index(check_interval(interval)) + 1:]
+
+
+def bucket_starts(dates: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Start of the `interval` bucket holding each timestamp
+
+    Args:
+        dates (np.ndarray): Sorted timestamps (datetime64)
+        interval (str): Target interval
+
+    Returns:
+        np.ndarray: int64 epoch nanoseconds of each timestamp's bucket start
+    """
+    ns = np.asarray(dates, dtype='datetime64[ns]').astype(np.int64)
+    days = ns // _NS_PER_DAY
+    if is_intraday(interval):
+        # Anchor buckets at each session's first bar rather than at midnight
+        step = interval_step(interval)
+        session_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        anchors = np.repeat(ns[session_starts], np.diff(np.r_[session_starts, len(ns)]))
+        return anchors + (ns - anchors) // step * step
+    if interval == '1d':
+        return days * _NS_PER_DAY
+    if interval == '1wk':
+        # Epoch day 0 was a Thursday; shift to the preceding Monday
+        return (days - (days + 3) % 7) * _NS_PER_DAY
+    if interval == '1mo':
+        months = ns.astype('datetime64[ns]').astype('datetime64[M]')
+        return months.astype('datetime64[ns]').astype(np.int64)
+    raise ValueError(f"Unsupported interval '{interval}', expected one of {', '.join(INTERVALS)}")
+
+
+def resample_bars(df, interval: str) -> pd.DataFrame:
+    """
+    Aggregate sorted OHLCV bars into coarser `interval` bars in one vectorized pass
+
+    Args:
+        df (pd.DataFrame | PriceArrays): Bars with a 'Date' column and any of Open, High, Low,
+            Close, Adj Close and Volume, sorted by Date
+        interval (str): Target interval (coarser than or equal to the input's)
+
+    Returns:
+        pd.DataFrame: One row per non-empty bucket, dated by the bucket start
+    """
+    names = [name for name in AGGREGATIONS if name in df]
+    dates = np.asarray(df['Date'], dtype='datetime64[ns]')
+    if len(dates) == 0:
+        return pd.DataFrame({name: np.asarray(df[name]) for name in ['Date'] + names})
+
+    buckets = bucket_starts(dates, interval)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(dates)] - 1
+
+    columns = {'Date': buckets[starts].astype('datetime64[ns]')}
+    for name in names:
+        values = np.asarray(df[name])
+        how = AGGREGATIONS[name]
+        if how == 'first':
+            columns[name] = values[starts]
+        elif how == 'last':
+            columns[name] = values[ends]
+        elif how == 'max':
+            # fmax/fmin skip the empty (NaN) bars Yahoo reports around halts
+            columns[name] = np.fmax.reduceat(values, starts)
+        elif how == 'min':
+            columns[name] = np.fmin.reduceat(values, starts)
+        else:
+            columns[name] = np.add.reduceat(values, starts)
+    return pd.DataFrame(columns)
@@ -0,0 +1,247 @@
+"""
+Screener Page - RSI / MACD / EMA cross signals across a whole ticker universe
+
+Close prices of every ticker are aligned into one (date x ticker) matrix, and the
+indicators are computed in one vectorized pass per group of tickers trading on the
+same dates, so a holiday of one exchange never enters another ticker's recurrences.
+"""
+
+import os
+import logging
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from apps.indicators import compute_indicator_arrays, ema, macd, rsi
+from apps.utils import STOCK_TICKER_MAP, load_universe
+from apps.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+# Default universe file: a CSV with a Symbol (or Ticker) column, e.g. the S&P 500 constituents
+UNIVERSE_CSV = os.environ.get("SCREENER_UNIVERSE", os.path.join("data", "universe.csv"))
+
+SYMBOL_COLUMNS = ('symbol', 'ticker')
+
+# Indicators computed for the screen
+SCREEN_INDICATORS = [macd(), rsi(), ema(50), ema(200)]
+
+# Label -> row filter over the screen results
+SIGNALS: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    'RSI < 30 (oversold)': lambda df: df['RSI'] < 30,
+    'RSI > 70 (overbought)': lambda df: df['RSI'] > 70,
+    'MACD bullish cross today': lambda df: df['MACD Bullish Cross'],
+    'MACD bearish cross today': lambda df: df['MACD Bearish Cross'],
+    'Golden cross today (EMA 50 over EMA 200)': lambda df: df['Golden Cross'],
+    'Death cross today (EMA 50 under EMA 200)': lambda df: df['Death Cross'],
+    'Close above EMA 200': lambda df: df['Close'] > df['EMA_200'],
+}
+
+
+def read_universe(source) -> List[str]:
+    """
+    Read ticker symbols from a universe CSV
+
+    The Symbol/Ticker column is used when present, otherwise the first column.
+    Class-share dots are mapped to Yahoo's dashes (BRK.B -> BRK-B).
+
+    Args:
+        source: Path or file-like object of the CSV
+
+    Returns:
+        List[str]: Distinct symbols in file order
+
+    Raises:
+        ValueError: If the file holds no symbols
+    """
+    frame = pd.read_csv(source, dtype=str)
+    column = next((col for col in frame.columns if col.strip().lower() in SYMBOL_COLUMNS), frame.columns[0])
+    symbols = frame[column].dropna().str.strip().str.upper().str.replace('.', '-', regex=False)
+    symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol]
+    if not symbols:
+        raise ValueError("The universe file holds no ticker symbols")
+    return symbols
+
+
+def align_closes(histories: Mapping[str, pd.DataFrame],
+                 lookback: Optional[int] = None) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Align Close prices of many tickers on the union of their dates
+
+    Dates a ticker has no bar for (holidays of its exchange, halts, before its
+    first bar) stay NaN rather than being filled, see screen().
+
+    Args:
+        histories (Mapping[str, pd.DataFrame]): Ticker -> history with a 'Date' column or indexed by Date
+        lookback (int): Keep only the last `lookback` dates
+
+    Returns:
+        Tuple[np.ndarray, List[str], np.ndarray]: Dates, tickers and the (date x ticker) Close matrix
+    """
+    tickers = [ticker for ticker, history in histories.items() if history is not None and len(history)]
+    if not tickers:
+        return np.array([], dtype='datetime64[ns]'), [], np.empty((0, 0))
+
+    indexes = [np.asarray(histories[ticker]['Date'] if 'Date' in histories[ticker] else histories[ticker].index,
+                          dtype='datetime64[ns]') for ticker in tickers]
+    dates = np.unique(np.concatenate(indexes))
+    close = np.full((len(dates), len(tickers)), np.nan)
+    for column, (ticker, index) in enumerate(zip(tickers, indexes)):
+        close[dates.searchsorted(index), column] = histories[ticker]['Close'].to_numpy(dtype=np.float64)
+
+    if lookback is not None and len(dates) > lookback:
+        dates, close = dates[-lookback:], close[-lookback:]
+    return dates, tickers, close
+
+
+def screen(dates: np.ndarray, tickers: List[str], close: np.ndarray) -> pd.DataFrame:
+    """
+    Compute the latest indicator values and today's cross signals for every ticker
+
+    Each ticker's indicators run over its own bars only: tickers with the same
+    valid rows (same exchange calendar and history) are computed together, and
+    "today" is the ticker's last bar, compared with its previous bar.
+
+    Args:
+        dates (np.ndarray): Row dates of the Close matrix
+        tickers (List[str]): Column tickers of the Close matrix
+        close (np.ndarray): (date x ticker) Close prices, NaN where a ticker has no bar
+
+    Returns:
+        pd.DataFrame: One row per ticker with Close, change, RSI, MACD, EMAs and signal flags
+    """
+    columns = ['Ticker', 'Close', 'Change %', 'RSI', 'MACD', 'Signal', 'Histogram', 'EMA_50', 'EMA_200',
+               'MACD Bullish Cross', 'MACD Bearish Cross', 'Golden Cross', 'Death Cross']
+    if len(dates) < 2 or not tickers:
+        return pd.DataFrame(columns=columns)
+
+    # Last two bars of every ticker on its own rows: (2 x ticker) per output column
+    outputs = ['Close', 'MACD', 'Signal', 'Histogram', 'EMA_50', 'EMA_200', 'RSI']
+    last = {name: np.full((2, len(tickers)), np.nan) for name in outputs}
+    valid = ~np.isnan(close)
+    groups: Dict[bytes, List[int]] = {}
+    for column in range(len(tickers)):
+        groups.setdefault(valid[:, column].tobytes(), []).append(column)
+    for group in groups.values():
+        block = close[valid[:, group[0]]][:, group]
+        if len(block) < 2:
+            continue
+        values = compute_indicator_arrays(block, SCREEN_INDICATORS)
+        values['Close'] = block
+        for name in outputs:
+            last[name][:, group] = values[name][-2:]
+
+    histogram, trend = last['Histogram'], last['EMA_50'] - last['EMA_200']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = (last['Close'][1] / last['Close'][0] - 1) * 100
+
+    return pd.DataFrame({
+        'Ticker': tickers,
+        'Close': last['Close'][1],
+        'Change %': change,
+        'RSI': last['RSI'][1],
+        'MACD': last['MACD'][1],
+        'Signal': last['Signal'][1],
+        'Histogram': histogram[1],
+        'EMA_50': last['EMA_50'][1],
+        'EMA_200': last['EMA_200'][1],
+        'MACD Bullish Cross': (histogram[0] <= 0) & (histogram[1] > 0),
+        'MACD Bearish Cross': (histogram[0] >= 0) & (histogram[1] < 0),
+        'Golden Cross': (trend[0] <= 0) & (trend[1] > 0),
+        'Death Cross': (trend[0] >= 0) & (trend[1] < 0),
+    }, columns=columns)
+
+
+def screen_histories(histories: Mapping[str, pd.DataFrame], lookback: Optional[int] = None) -> pd.DataFrame:
+    """
+    Align histories and screen them in one pass
+
+    Args:
+        histories (Mapping[str, pd.DataFrame]): Ticker -> history with a 'Date' column or indexed by Date
+        lookback (int): Dates used for the indicators (defaults to the full history)
+
+    Returns:
+        pd.DataFrame: Screen results, see screen()
+    """
+    dates, tickers, close = align_closes(histories, lookback)
+    return screen(dates, tickers, close)
+
+
+def apply_signals(results: pd.DataFrame, signals: List[str]) -> pd.DataFrame:
+    """
+    Keep the rows matching every selected signal
+
+    Args:
+        results (pd.DataFrame): Screen results
+        signals (List[str]): Keys of SIGNALS
+
+    Returns:
+        pd.DataFrame: Matching rows
+    """
+    mask = pd.Series(True, index=results.index)
+    for signal in signals:
+        mask &= SIGNALS[signal](results).fillna(False).astype(bool)
+    return results[mask]
+
+
+def get_universe_selection() -> List[str]:
+    """
+    Universe source widgets: an uploaded CSV, the configured universe file, or the built-in tickers
+
+    Returns:
+        List[str]: Ticker symbols to screen
+    """
+    uploaded = st.file_uploader("Universe CSV (Symbol column)", type=['csv'],
+                                help="For example the S&P 500 constituents list")
+    try:
+        if uploaded is not None:
+            return read_universe(uploaded)
+        if os.path.exists(UNIVERSE_CSV):
+            st.caption(f"Universe: {UNIVERSE_CSV}")
+            return read_universe(UNIVERSE_CSV)
+    except Exception as e:
+        st.error(f"Could not read the universe file: {str(e)}")
+    st.caption("Universe: dashboard tickers (upload a CSV to screen more)")
+    return list(STOCK_TICKER_MAP.values())
+
+
+def app():
+    """Main screener app"""
+
+    st.title('🔎 Stock Screener')
+
+    st.markdown('''
+    ---
+    ### Technical Signals Across a Ticker Universe
+    Screen every ticker of a universe for oversold/overbought RSI, MACD crosses and EMA 50/200 crosses.
+    ___
+    ''')
+
+    tickers = get_universe_selection()
+
+    with st.spinner(f'Loading {len(tickers)} tickers...'), span('screener.load_universe', 'load'):
+        try:
+            histories = load_universe(tickers)
+        except Exception as e:
+            st.error(f"Failed to load data: {str(e)}")
+            st.stop()
+    missing = sorted(set(tickers) - set(histories))
+    if missing:
+        st.warning(f"No data for {len(missing)} tickers: {', '.join(missing[:20])}{' ...' if len(missing) > 20 else ''}")
+
+    with span('screener.screen', 'compute'):
+        results = screen_histories(histories)
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        signals = st.multiselect('Signals (all must match)', list(SIGNALS))
+    with col2:
+        sort_by = st.selectbox('Sort by', ['RSI', 'Change %', 'Histogram', 'Close', 'Ticker'])
+    ascending = st.checkbox('Ascending', value=sort_by in ('RSI', 'Ticker'))
+
+    matches = apply_signals(results, signals).sort_values(sort_by, ascending=ascending, na_position='last')
+    st.subheader(f'📋 {len(matches)} of {len(results)} tickers')
+    with span('screener.emit_table', 'emit'):
+        st.dataframe(matches, use_container_width=True, hide_index=True)
@@ -0,0 +1,355 @@
+"""
+Streaming Indicators - Stateful EMA/MACD/RSI updated incrementally as new bars arrive
+"""
+
+import os
+import json
+import copy
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: syncs are only serialized within the process
+    fcntl = None
+
+from apps.datastore import PriceStore, get_price_store
+from apps.indicators import IndicatorSpec, DEFAULT_INDICATORS
+from apps.instrumentation import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Appended ledger segments per ticker before they are compacted into one
+LEDGER_MAX_SEGMENTS = 64
+
+
+class EMAState:
+    """Exponential moving average with pandas' adjust=False recursion."""
+
+    def __init__(self, span: int, value: Optional[float] = None):
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.value = value
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        """
+        Consume new values and return the EMA after each of them (NaN inputs are skipped)
+
+        Args:
+            values (np.ndarray): New observations
+
+        Returns:
+            np.ndarray: EMA values aligned with `values`
+        """
+        out = np.empty(len(values))
+        alpha, value = self.alpha, self.value
+        for i, x in enumerate(values):
+            if x == x:
+                value = x if value is None else value + alpha * (x - value)
+            out[i] = np.nan if value is None else value
+        self.value = value
+        return out
+
+    def to_dict(self) -> dict:
+        return {"span": self.span, "value": self.value}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "EMAState":
+        return cls(state["span"], state["value"])
+
+
+class MACDState:
+    """MACD line, signal line and histogram built from three EMA states."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+
+    def update(self, close: np.ndarray) -> List[np.ndarray]:
+        """Consume new closes and return [MACD, Signal, Histogram] arrays"""
+        line = self.fast.update(close) - self.slow.update(close)
+        signal_line = self.signal.update(line)
+        return [line, signal_line, line - signal_line]
+
+    def to_dict(self) -> dict:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "MACDState":
+        obj = cls.__new__(cls)
+        obj.fast = EMAState.from_dict(state["fast"])
+        obj.slow = EMAState.from_dict(state["slow"])
+        obj.signal = EMAState.from_dict(state["signal"])
+        return obj
+
+
+class RSIState:
+    """RSI over simple rolling means of gains and losses, matching calculate_rsi."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.last_close: Optional[float] = None
+        self.gains: deque = deque(maxlen=period)
+        self.losses: deque = deque(maxlen=period)
+
+    def update(self, close: np.ndarray) -> np.ndarray:
+        """
+        Consume new closes and return the RSI after each of them
+
+        Args:
+            close (np.ndarray): New close prices
+
+        Returns:
+            np.ndarray: RSI values (NaN until `period` bars have been seen)
+        """
+        out = np.full(len(close), np.nan)
+        for i, x in enumerate(close):
+            # The first bar has no previous close and counts as a zero move
+            if self.last_close is None or x != x:
+                delta = 0.0
+            else:
+                delta = x - self.last_close
+            if x == x:
+                self.last_close = x
+            self.gains.append(delta if delta > 0 else 0.0)
+            self.losses.append(-delta if delta < 0 else 0.0)
+            if len(self.gains) == self.period:
+                gain = sum(self.gains) / self.period
+                loss = sum(self.losses) / self.period
+                if loss:
+                    out[i] = 100 - 100 / (1 + gain / loss)
+                elif gain:
+                    out[i] = 100.0
+        return out
+
+    def to_dict(self) -> dict:
+        return {"period": self.period, "last_close": self.last_close,
+                "gains": list(self.gains), "losses": list(self.losses)}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "RSIState":
+        obj = cls(state["period"])
+        obj.last_close = state["last_close"]
+        obj.gains.extend(state["gains"])
+        obj.losses.extend(state["losses"])
+        return obj
+
+
+class IndicatorState:
+    """Bundle of streaming states producing the same columns as compute_indicators."""
+
+    def __init__(self, specs: Iterable[IndicatorSpec] = DEFAULT_INDICATORS):
+        self.specs = list(specs)
+        self.states = [self._new_state(spec) for spec in self.specs]
+
+    @staticmethod
+    def _new_state(spec: IndicatorSpec):
+        if spec.kind == 'ema':
+            return EMAState(spec.params[0])
+        if spec.kind == 'macd':
+            return MACDState(*spec.params)
+        if spec.kind == 'rsi':
+            return RSIState(spec.params[0])
+        raise ValueError(f"Unknown indicator kind '{spec.kind}'")
+
+    def update(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Append new closes; costs O(len(close)) regardless of the history length
+
+        Args:
+            close (np.ndarray): New close prices in time order
+
+        Returns:
+            Dict[str, np.ndarray]: Indicator values for the new bars, keyed by column name
+        """
+        close = np.asarray(close, dtype=np.float64)
+        results: Dict[str, np.ndarray] = {}
+        for spec, state in zip(self.specs, self.states):
+            outputs = state.update(close)
+            if isinstance(outputs, np.ndarray):
+                outputs = [outputs]
+            results.update(zip(spec.columns, outputs))
+        return results
+
+    def to_dict(self) -> dict:
+        return {
+            "specs": [[spec.kind, list(spec.params)] for spec in self.specs],
+            "states": [state.to_dict() for state in self.states],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        obj = cls.__new__(cls)
+        obj.specs = [IndicatorSpec(kind, tuple(params)) for kind, params in data["specs"]]
+        loaders = {'ema': EMAState, 'macd': MACDState, 'rsi': RSIState}
+        obj.states = [loaders[spec.kind].from_dict(state) for spec, state in zip(obj.specs, data["states"])]
+        return obj
+
+
+class IndicatorLedger:
+    """
+    Persisted full-history indicator series plus the streaming state that produced them
+
+    The state is checkpointed before the last bar, because the store re-fetches
+    the current session's bar and its close may still change. The series is kept
+    on disk as append-only segments: each sync writes only the rows from the
+    provisional bar onwards, and the JSON state (written last) lists the segments
+    that make up the series. Segments are compacted into one every
+    LEDGER_MAX_SEGMENTS syncs. Syncs of a ticker hold a file lock, so processes
+    sharing the data folder append and compact one at a time.
+    """
+
+    def __init__(self, store: PriceStore, specs: Iterable[IndicatorSpec] = DEFAULT_INDICATORS):
+        self.store = store
+        self.specs = list(specs)
+        self._memory: Dict[str, dict] = {}
+        self._guard = threading.Lock()
+
+    def _paths(self, ticker: str):
+        base = os.path.splitext(self.store.partition_path(ticker))[0]
+        return f"{base}.indicators", f"{base}.indicators.json"
+
+    @contextmanager
+    def _file_lock(self, ticker: str):
+        """Serialize syncs of one ticker across processes sharing the data folder"""
+        segment_dir, _ = self._paths(ticker)
+        os.makedirs(segment_dir, exist_ok=True)
+        with open(os.path.join(segment_dir, "sync.lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _load(self, ticker: str) -> Optional[dict]:
+        segment_dir, state_path = self._paths(ticker)
+        try:
+            with open(state_path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning(f"Discarding unreadable indicator state for {ticker}: {str(e)}")
+            return None
+        if meta.get("specs") != IndicatorState(self.specs).to_dict()["specs"] or "generation" not in meta:
+            return None
+
+        # Another process may have synced since this one last did; the generation tells
+        entry = self._memory.get(ticker.upper())
+        if entry is not None and entry["generation"] == meta["generation"]:
+            return entry
+        try:
+            series = None
+            for name in meta["segments"]:
+                segment = pd.read_parquet(os.path.join(segment_dir, name))
+                # A segment starts at the bar that was provisional when it was written
+                series = segment if series is None else pd.concat([series[series.index < segment.index[0]], segment])
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning(f"Discarding unreadable indicator series for {ticker}: {str(e)}")
+            return None
+        return {"series": series, "checkpoint": IndicatorState.from_dict(meta),
+                "first_date": pd.Timestamp(meta["first_date"]), "last_date": pd.Timestamp(meta["last_date"]),
+                "last_close": meta.get("last_close"), "segments": meta["segments"],
+                "generation": meta["generation"]}
+
+    def _save(self, ticker: str, entry: dict, block: pd.DataFrame, previous: Optional[dict]) -> None:
+        """Persist a sync by appending `block` as a segment, or by compacting the whole series"""
+        segment_dir, state_path = self._paths(ticker)
+        generation = previous["generation"] + 1 if previous is not None else 0
+        compact = previous is None or len(previous["segments"]) >= LEDGER_MAX_SEGMENTS
+        # Segments are named by the state generation that first lists them
+        name = f"{generation:09d}.parquet"
+        path = os.path.join(segment_dir, name)
+        (entry["series"] if compact else block).to_parquet(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+        entry["segments"] = [name] if compact else previous["segments"] + [name]
+        entry["generation"] = generation
+        meta = entry["checkpoint"].to_dict()
+        meta["first_date"] = entry["first_date"].strftime("%Y-%m-%d")
+        meta["last_date"] = entry["last_date"].strftime("%Y-%m-%d")
+        meta["last_close"] = float(entry["last_close"])
+        meta["segments"] = entry["segments"]
+        meta["generation"] = generation
+        with open(f"{state_path}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{state_path}.tmp", state_path)
+        self._memory[ticker.upper()] = entry
+
+        # Only segments older than the oldest one the committed state lists can go
+        if compact:
+            for stale in os.listdir(segment_dir):
+                if stale.endswith((".parquet", ".parquet.tmp")) and stale[:9] < name[:9]:
+                    os.remove(os.path.join(segment_dir, stale))
+
+    def sync(self, ticker: str, history: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return indicators for a ticker's full history, processing only bars not yet seen
+
+        Args:
+            ticker (str): Stock ticker symbol
+            history (pd.DataFrame): Full OHLCV history with a 'Date' column or Date index
+
+        Returns:
+            pd.DataFrame: Indicator series indexed by Date, one row per history bar
+        """
+        dates = pd.DatetimeIndex(history['Date'] if 'Date' in history else history.index)
+        close = np.asarray(history['Close'], dtype=np.float64)
+
+        with self._guard, self._file_lock(ticker):
+            entry = self._load(ticker)
+            if entry is not None and (entry["first_date"] != dates[0] or entry["last_date"] not in dates):
+                logger.info(f"History of {ticker} was rewritten, rebuilding indicator state")
+                entry = None
+
+            if entry is None:
+                state, kept, start = IndicatorState(self.specs), None, 0
+            else:
+                # Resume from the checkpoint, which precedes the provisional last bar
+                state = copy.deepcopy(entry["checkpoint"])
+                start = dates.get_loc(entry["last_date"])
+                kept = entry["series"].iloc[:start]
+                current = entry["series"]
+                if start + 1 == len(dates) and len(current) == len(dates) and \
+                        entry.get("last_close") == close[-1]:
+                    count_cache('indicator_ledger', hit=True)
+                    return current
+            count_cache('indicator_ledger', hit=False)
+
+            head = state.update(close[start:-1]) if len(dates) - start > 1 else {}
+            checkpoint = copy.deepcopy(state)
+            tail = state.update(close[-1:])
+            new_rows = {
+                column: np.concatenate([head[column], tail[column]]) if head else tail[column]
+                for column in tail
+            }
+            block = pd.DataFrame(new_rows, index=pd.DatetimeIndex(dates[start:], name='Date'))
+            series = block if kept is None or kept.empty else pd.concat([kept, block])
+
+            previous = entry
+            entry = {"series": series, "checkpoint": checkpoint, "first_date": dates[0],
+                     "last_date": dates[-1], "last_close": close[-1]}
+            self._save(ticker, entry, block, previous)
+            return series
+
+
+_ledger: Optional[IndicatorLedger] = None
+_ledger_guard = threading.Lock()
+
+
+def get_indicator_ledger() -> IndicatorLedger:
+    """Return the process-wide indicator ledger"""
+    global _ledger
+    with _ledger_guard:
+        if _ledger is None:
+            _ledger = IndicatorLedger(get_price_store())
+        return _ledger
@@ -0,0 +1,324 @@
+"""
+Ticker Catalog - Indexed symbol / company-name search over large listing files
+
+The listing CSV (Symbol, Name and optionally Exchange columns) is converted once
+into a compact NumPy archive holding the records, sorted prefix keys and a CSR
+trigram index, so later processes load it without rebuilding anything.
+"""
+
+import os
+import threading
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from apps.datastore import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Listing file with one row per symbol
+TICKER_LISTING = os.environ.get("TICKER_LISTING", os.path.join("data", "listing.csv"))
+
+# Compact index built from the listing
+CATALOG_PATH = os.path.join(DATA_DIR, "catalog.npz")
+
+CATALOG_FORMAT_VERSION = 1
+
+# Results returned by a search
+DEFAULT_SEARCH_LIMIT = 25
+
+# Ranks, best first
+_EXACT, _SYMBOL_PREFIX, _NAME_PREFIX, _SUBSTRING = range(4)
+
+
+def _trigrams(text: bytes) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _encode(values: Iterable[str]) -> np.ndarray:
+    """UTF-8 byte strings (a quarter of the size of NumPy's fixed-width unicode)"""
+    return np.array([value.encode('utf-8') for value in values], dtype=bytes)
+
+
+def _prefix_range(keys: np.ndarray, prefix: bytes) -> Tuple[int, int]:
+    """Positions [lo, hi) of the sorted byte keys starting with `prefix`"""
+    width = keys.dtype.itemsize
+    if len(prefix) > width:
+        return 0, 0
+    # Search with keys of the array's own dtype; a wider key would make NumPy cast the whole array
+    lo = int(keys.searchsorted(np.array(prefix, dtype=keys.dtype), side='left'))
+    if len(prefix) == width:
+        return lo, int(keys.searchsorted(np.array(prefix, dtype=keys.dtype), side='right'))
+    # 0xFF never occurs in UTF-8, so it sorts after every continuation of the prefix
+    return lo, int(keys.searchsorted(np.array(prefix + b'\xff', dtype=keys.dtype), side='left'))
+
+
+class TickerCatalog:
+    """Symbols and company names with prefix and trigram indexes."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Initialize from index arrays (see build() and load())
+
+        Args:
+            arrays (Dict[str, np.ndarray]): symbols, names, exchanges, symbol_keys/symbol_order,
+                name_keys/name_order, trigrams, offsets and postings
+        """
+        self.symbols = arrays['symbols']
+        self.names = arrays['names']
+        self.exchanges = arrays['exchanges']
+        self._symbol_keys, self._symbol_order = arrays['symbol_keys'], arrays['symbol_order']
+        self._name_keys, self._name_order = arrays['name_keys'], arrays['name_order']
+        self._trigrams, self._offsets, self._postings = arrays['trigrams'], arrays['offsets'], arrays['postings']
+        self._arrays = arrays
+
+    @classmethod
+    def build(cls, symbols: Iterable[str], names: Iterable[str],
+              exchanges: Optional[Iterable[str]] = None) -> "TickerCatalog":
+        """
+        Build the indexes for a set of listings
+
+        Args:
+            symbols (Iterable[str]): Ticker symbols (duplicates keep the first listing)
+            names (Iterable[str]): Company names aligned with `symbols`
+            exchanges (Iterable[str]): Optional exchange codes aligned with `symbols`
+
+        Returns:
+            TickerCatalog: The indexed catalog
+        """
+        frame = pd.DataFrame({'symbol': list(symbols), 'name': list(names)})
+        frame['exchange'] = list(exchanges) if exchanges is not None else ''
+        frame = frame.fillna('').astype(str)
+        frame['symbol'] = frame['symbol'].str.strip().str.upper()
+        frame['name'] = frame['name'].str.strip()
+        frame = frame[frame['symbol'] != ''].drop_duplicates('symbol').reset_index(drop=True)
+
+        symbol_keys = _encode(frame['symbol'].str.lower())
+        name_keys = _encode(frame['name'].str.lower())
+        symbol_order, name_order = np.argsort(symbol_keys, kind='stable'), np.argsort(name_keys, kind='stable')
+
+        postings: Dict[bytes, List[int]] = defaultdict(list)
+        for row, (symbol, name) in enumerate(zip(symbol_keys.tolist(), name_keys.tolist())):
+            for gram in _trigrams(symbol) | _trigrams(name):
+                postings[gram].append(row)
+        grams = sorted(postings)
+        offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(postings[gram]) for gram in grams])
+        flat = np.fromiter((row for gram in grams for row in postings[gram]), dtype=np.int32, count=offsets[-1])
+
+        return cls({
+            'symbols': _encode(frame['symbol']),
+            'names': _encode(frame['name']),
+            'exchanges': _encode(frame['exchange']),
+            'symbol_keys': symbol_keys[symbol_order],
+            'symbol_order': symbol_order.astype(np.int32),
+            'name_keys': name_keys[name_order],
+            'name_order': name_order.astype(np.int32),
+            'trigrams': np.array(grams, dtype='S3'),
+            'offsets': offsets,
+            'postings': flat,
+        })
+
+    @classmethod
+    def from_listing(cls, path: str) -> "TickerCatalog":
+        """
+        Build from a listing CSV with Symbol and Name (and optionally Exchange) columns
+
+        Args:
+            path (str): CSV path
+
+        Returns:
+            TickerCatalog: The indexed catalog
+
+        Raises:
+            ValueError: If the file has no Symbol column
+        """
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        columns = {col.strip().lower(): col for col in frame.columns}
+        symbol = columns.get('symbol') or columns.get('ticker')
+        if symbol is None:
+            raise ValueError(f"Listing {path} has no Symbol column")
+        name = columns.get('name') or columns.get('company') or columns.get('security name')
+        exchange = columns.get('exchange')
+        return cls.build(frame[symbol], frame[name] if name else [''] * len(frame),
+                         frame[exchange] if exchange else None)
+
+    def save(self, path: str) -> None:
+        """Write the catalog and its indexes as an uncompressed NumPy archive (atomically)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, version=np.array(CATALOG_FORMAT_VERSION), **self._arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TickerCatalog":
+        """
+        Load a catalog written by save()
+
+        Raises:
+            ValueError: If the archive was written by another format version
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            if int(archive['version']) != CATALOG_FORMAT_VERSION:
+                raise ValueError(f"Catalog {path} has format version {int(archive['version'])}")
+            return cls({key: archive[key] for key in archive.files if key != 'version'})
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.lookup(symbol) is not None
+
+    def lookup(self, symbol: str) -> Optional[int]:
+        """Row of an exact symbol, or None"""
+        key = symbol.strip().lower().encode('utf-8')
+        lo, hi = _prefix_range(self._symbol_keys, key)
+        if lo < hi and self._symbol_keys[lo] == key:
+            return int(self._symbol_order[lo])
+        return None
+
+    def name(self, symbol: str) -> str:
+        """Company name of a symbol ('' if unknown)"""
+        row = self.lookup(symbol)
+        return self.names[row].decode('utf-8') if row is not None else ''
+
+    def label(self, symbol: str) -> str:
+        """Display label 'Company Name (SYMBOL)'"""
+        row = self.lookup(symbol)
+        if row is None or not self.names[row]:
+            return symbol
+        return f"{self.names[row].decode('utf-8')} ({self.symbols[row].decode('utf-8')})"
+
+    def _substring_rows(self, query: bytes, limit: int, seen: set) -> List[int]:
+        grams = sorted(_trigrams(query))
+        positions = self._trigrams.searchsorted(np.array(grams, dtype=self._trigrams.dtype))
+        lists = []
+        for gram, position in zip(grams, positions):
+            if position >= len(self._trigrams) or self._trigrams[position] != gram:
+                return []
+            lists.append(self._postings[self._offsets[position]:self._offsets[position + 1]])
+        lists.sort(key=len)
+        candidates = lists[0]
+        for other in lists[1:]:
+            if len(candidates) <= limit * 4:
+                break
+            candidates = np.intersect1d(candidates, other, assume_unique=True)
+
+        rows = []
+        for row in candidates.tolist():
+            if row in seen:
+                continue
+            # Trigram hits are only candidates; confirm the whole query occurs
+            name = self.names[row].decode('utf-8').lower().encode('utf-8')
+            if query in self.symbols[row].lower() or query in name:
+                rows.append(row)
+                if len(rows) >= limit:
+                    break
+        return rows
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        """
+        Find symbols by symbol or company name as the user types
+
+        Results are ranked: exact symbol, symbol prefix, company-name prefix, then
+        symbol or name containing the query; shorter matches come first within a rank.
+
+        Args:
+            query (str): Partial symbol or company name (case-insensitive)
+            limit (int): Maximum number of results
+
+        Returns:
+            List[str]: Matching symbols, best first
+        """
+        query = query.strip().lower().encode('utf-8')
+        if not query or not len(self):
+            return []
+
+        ranked: List[Tuple[int, int, int]] = []
+        seen = set()
+
+        def add(rows, rank):
+            for row in rows:
+                if row not in seen and len(ranked) < limit:
+                    seen.add(row)
+                    field = self.symbols[row] if rank <= _SYMBOL_PREFIX else self.names[row]
+                    ranked.append((rank, len(field), row))
+
+        lo, hi = _prefix_range(self._symbol_keys, query)
+        symbol_rows = self._symbol_order[lo:hi]
+        if hi > lo and self._symbol_keys[lo] == query:
+            add([int(symbol_rows[0])], _EXACT)
+        if hi - lo > limit:
+            # Shortest symbols first (e.g. 'A' before 'AA...'); bounded to keep the sort cheap
+            window = symbol_rows[:limit * 20]
+            lengths = np.char.str_len(self.symbols[window])
+            symbol_rows = window[np.argsort(lengths, kind='stable')]
+        add(symbol_rows[:limit].tolist(), _SYMBOL_PREFIX)
+
+        if len(ranked) < limit:
+            lo, hi = _prefix_range(self._name_keys, query)
+            add(self._name_order[lo:min(hi, lo + limit)].tolist(), _NAME_PREFIX)
+
+        if len(ranked) < limit and len(query) >= 3:
+            add(self._substring_rows(query, limit - len(ranked), seen), _SUBSTRING)
+
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [self.symbols[row].decode('utf-8') for _, _, row in ranked]
+
+
+def builtin_catalog() -> TickerCatalog:
+    """Catalog of the dashboard's default tickers, used when no listing file exists"""
+    from apps.utils import STOCK_TICKER_MAP
+
+    names = [label.rsplit(' (', 1)[0] for label in STOCK_TICKER_MAP]
+    return TickerCatalog.build(STOCK_TICKER_MAP.values(), names)
+
+
+def load_catalog(listing: str = TICKER_LISTING, index_path: str = CATALOG_PATH) -> TickerCatalog:
+    """
+    Load the catalog, rebuilding the compact index only when the listing changed
+
+    Args:
+        listing (str): Listing CSV path
+        index_path (str): Compact index path
+
+    Returns:
+        TickerCatalog: The catalog (the built-in tickers if no listing exists)
+    """
+    if not os.path.exists(listing):
+        logger.info(f"No ticker listing at {listing}; using the built-in tickers")
+        return builtin_catalog()
+
+    if os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(listing):
+        try:
+            return TickerCatalog.load(index_path)
+        except Exception as e:
+            logger.warning(f"Rebuilding unreadable ticker catalog {index_path}: {str(e)}")
+
+    catalog = TickerCatalog.from_listing(listing)
+    try:
+        catalog.save(index_path)
+    except OSError as e:
+        logger.warning(f"Could not persist the ticker catalog: {str(e)}")
+    logger.info(f"Indexed {len(catalog)} symbols from {listing}")
+    return catalog
+
+
+_catalog: Optional[TickerCatalog] = None
+_catalog_guard = threading.Lock()
+
+
+def get_ticker_catalog() -> TickerCatalog:
+    """Return the process-wide ticker catalog, loading it on first use"""
+    global _catalog
+    with _catalog_guard:
+        if _catalog is None:
+            try:
+                _catalog = load_catalog()
+            except Exception as e:
+                logger.error(f"Loading the ticker catalog failed: {str(e)}")
+                _catalog = builtin_catalog()
+        return _catalog
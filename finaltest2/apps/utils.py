@@ -2,12 +2,21 @@
 Utility functions for the Stock Market Dashboard
 """
 
+import re
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-from typing import Dict
+import threading
+import logging
+from typing import Dict, Iterable, Optional
 from datetime import datetime, timedelta
 
+from apps.datastore import get_history_cache
+from apps.ticker_catalog import get_ticker_catalog
+from apps.instrumentation import counted_cache
+from apps.resample import DAILY
+
+logger = logging.getLogger(__name__)
+
 # Stock ticker configuration
 STOCK_TICKER_MAP: Dict[str, str] = {
     'GOOGLE (GOOG)': 'GOOG',
@@ -19,31 +28,69 @@ STOCK_TICKER_MAP: Dict[str, str] = {
     'Tesla Inc. (TSLA)': 'TSLA',
 }
 
+# Labels of the default tickers, offered before anything is searched
+DEFAULT_TICKER_LABELS: Dict[str, str] = {ticker: label for label, ticker in STOCK_TICKER_MAP.items()}
+
+# Queries that look like a ticker and may be loaded as typed when the catalog does not list them
+SYMBOL_PATTERN = re.compile(r'^[A-Z0-9^.\-=]{1,12}$')
+
+
 def get_ticker_selection() -> str:
     """
-    Display stock ticker selection widget
+    Display the ticker search and selection widgets
+    
+    The query is matched against the shared ticker catalog by symbol and company
+    name; without a query the default tickers are offered. A query that looks like
+    a ticker but is not listed is offered last, labeled as unlisted, so a typo is
+    never selected (and downloaded) unless the user picks it.
     
     Returns:
         str: The selected stock ticker symbol
     """
-    stocks = tuple(STOCK_TICKER_MAP.keys())
-    selected_stock = st.selectbox(
+    catalog = get_ticker_catalog()
+    query = st.text_input(
+        'Search ticker or company',
+        placeholder='e.g. MSFT or Microsoft',
+        help=f"Searches {len(catalog):,} listed symbols by symbol and company name"
+    ).strip()
+    
+    symbols = catalog.search(query) if query else list(DEFAULT_TICKER_LABELS)
+    if query and not symbols:
+        st.warning(f"No listings match '{query}'")
+        symbols = list(DEFAULT_TICKER_LABELS)
+    unlisted = query.upper() if SYMBOL_PATTERN.match(query.upper()) else None
+    if unlisted in symbols or (unlisted and unlisted in catalog):
+        unlisted = None
+    if unlisted:
+        symbols.append(unlisted)
+    
+    def label(symbol: str) -> str:
+        if symbol == unlisted:
+            return f"{symbol} (unlisted, load as typed)"
+        return DEFAULT_TICKER_LABELS.get(symbol) or catalog.label(symbol)
+    
+    return st.selectbox(
         'Select dataset for analysis',
-        stocks,
+        symbols,
+        format_func=label,
         help="Choose a stock ticker to analyze"
     )
-    return STOCK_TICKER_MAP[selected_stock]
 
 
-@st.cache_data(ttl=3600)
-def load_stock_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+def load_stock_data(ticker: str, start_date: str, end_date: str, interval: str = DAILY) -> pd.DataFrame:
     """
-    Download historical stock data from Yahoo Finance
+    Load historical stock data, served from the shared history cache
+    
+    The full history is kept on disk and in memory per ticker and interval, and
+    only the missing tail is downloaded from Yahoo Finance, so any date range is
+    answered by slicing locally. Intervals that are not downloaded are resampled
+    from a finer one. The returned frame is a view over the cached history.
     
     Args:
         ticker (str): Stock ticker symbol
         start_date (str): Start date in YYYY-MM-DD format
-        end_date (str): End date in YYYY-MM-DD format
+        end_date (str): End date in YYYY-MM-DD format (exclusive)
+        interval (str): Bar interval, e.g. '1m', '1h', '1d' or '1wk'
     
     Returns:
         pd.DataFrame: Historical OHLCV data
@@ -52,16 +99,50 @@ def load_stock_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame
         Exception: If data download fails
     """
     try:
-        data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-        if data.empty:
-            raise ValueError(f"No data found for ticker {ticker}")
-        data.reset_index(inplace=True)
-        return data
+        return get_history_cache().get_range(ticker, start_date, end_date, interval)
     except Exception as e:
         st.error(f"Error loading data for {ticker}: {str(e)}")
         raise
 
 
+def load_universe(tickers: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Warm the price store and history cache for many tickers with batched downloads
+    
+    Histories are shared per ticker through the market data service, so replicas
+    behind a load balancer download each ticker once between them, and a warm
+    call only looks up the tickers this process does not hold yet.
+    
+    Args:
+        tickers (Iterable[str]): Ticker symbols (defaults to every STOCK_TICKER_MAP entry)
+    
+    Returns:
+        Dict[str, pd.DataFrame]: Full history per ticker with a 'Date' column (read-only)
+    """
+    tickers = sorted(set(tickers if tickers is not None else STOCK_TICKER_MAP.values()))
+    return get_history_cache().load_many(tickers)
+
+
+@counted_cache('prefetch_resource', st.cache_resource(show_spinner=False))
+def start_background_prefetch() -> threading.Thread:
+    """
+    Prefetch every configured ticker on a background thread, once per process
+    
+    Returns:
+        threading.Thread: The prefetch worker thread
+    """
+    def _prefetch():
+        try:
+            histories = load_universe()
+            logger.info(f"Prefetched {len(histories)} tickers")
+        except Exception as e:
+            logger.warning(f"Background prefetch failed: {str(e)}")
+
+    worker = threading.Thread(target=_prefetch, name="price-prefetch", daemon=True)
+    worker.start()
+    return worker
+
+
 def calculate_moving_averages(df: pd.DataFrame, periods: list = [20, 50, 200]) -> pd.DataFrame:
     """
     Calculate Exponential Moving Averages (EMA)
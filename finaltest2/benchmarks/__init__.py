@@ -0,0 +1,5 @@
+"""
+Offline performance benchmarks for the Stock Market Dashboard
+
+Run from the finaltest2 folder, e.g. `python -m benchmarks.bench_indicators`.
+"""
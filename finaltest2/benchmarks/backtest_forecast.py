@@ -0,0 +1,88 @@
+"""
+Backtest: fast forecast engines vs Prophet on held-out trading days
+
+Uses the stored price history of the dashboard tickers where available and
+synthetic random walks otherwise.
+
+Usage:
+    python -m benchmarks.backtest_forecast --horizons 30 90 [--no-prophet]
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from apps.datastore import PriceStore
+from apps.fast_forecast import FAST_ENGINES
+from apps.utils import STOCK_TICKER_MAP
+from benchmarks.common import TRADING_DAYS_PER_YEAR, synthetic_ohlcv, print_table
+
+
+def load_histories(years: int) -> Dict[str, pd.DataFrame]:
+    """Date/Close histories from the price store, falling back to synthetic data"""
+    store = PriceStore()
+    histories = {}
+    for seed, ticker in enumerate(STOCK_TICKER_MAP.values()):
+        stored = store.read(ticker)
+        if stored is not None and len(stored) > 2 * TRADING_DAYS_PER_YEAR:
+            histories[ticker] = stored.reset_index()[['Date', 'Close']].dropna()
+        else:
+            histories[f"synthetic-{seed}"] = synthetic_ohlcv(years * TRADING_DAYS_PER_YEAR, seed=seed)[['Date', 'Close']]
+    return histories
+
+
+def prophet_forecast(data: pd.DataFrame, periods: int, yearly_seasonality: bool = True,
+                     weekly_seasonality: bool = True) -> pd.DataFrame:
+    from apps.model_cache import fit_prophet_model
+
+    model = fit_prophet_model(data, yearly_seasonality, weekly_seasonality)
+    return model.predict(model.make_future_dataframe(periods=periods))
+
+
+def score(engine: Callable, history: pd.DataFrame, horizon: int) -> Dict[str, float]:
+    """Fit on all but the last `horizon` bars and score the forecast on those bars"""
+    train, test = history.iloc[:-horizon], history.iloc[-horizon:]
+    periods = (test['Date'].iloc[-1] - train['Date'].iloc[-1]).days
+
+    start = time.perf_counter()
+    forecast = engine(train, periods, True, True)
+    seconds = time.perf_counter() - start
+
+    matched = forecast.set_index('ds').reindex(pd.DatetimeIndex(test['Date']))
+    actual = test['Close'].to_numpy()
+    mape = np.mean(np.abs(matched['yhat'].to_numpy() - actual) / actual) * 100
+    covered = (matched['yhat_lower'].to_numpy() <= actual) & (actual <= matched['yhat_upper'].to_numpy())
+    return {'mape_pct': mape, 'coverage_pct': covered.mean() * 100, 'seconds': seconds}
+
+
+def run(horizons: List[int], years: int, include_prophet: bool) -> list:
+    """Run the backtest and return result rows averaged over tickers"""
+    engines = dict(FAST_ENGINES)
+    if include_prophet:
+        engines['Prophet'] = prophet_forecast
+    histories = load_histories(years)
+
+    rows = []
+    for horizon in horizons:
+        for name, engine in engines.items():
+            scores = pd.DataFrame([score(engine, history, horizon) for history in histories.values()])
+            rows.append({'engine': name, 'horizon': horizon, 'tickers': len(histories),
+                         'mape_pct': scores['mape_pct'].mean(), 'coverage_pct': scores['coverage_pct'].mean(),
+                         'seconds': scores['seconds'].mean()})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--horizons', type=int, nargs='+', default=[30, 90])
+    parser.add_argument('--years', type=int, default=10, help="Length of synthetic histories")
+    parser.add_argument('--no-prophet', action='store_true', help="Skip the (slow) Prophet baseline")
+    args = parser.parse_args()
+    print_table(run(args.horizons, args.years, not args.no_prophet))
+
+
+if __name__ == '__main__':
+    main()
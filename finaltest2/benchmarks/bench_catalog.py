@@ -0,0 +1,78 @@
+"""
+Benchmark: ticker catalog build / load time and search latency at listing scale
+
+Usage:
+    python -m benchmarks.bench_catalog --symbols 50000
+"""
+
+import argparse
+import os
+import string
+import tempfile
+import time
+
+import numpy as np
+
+from apps.ticker_catalog import TickerCatalog
+from benchmarks.common import measure, print_table
+
+WORDS = ['Global', 'American', 'United', 'First', 'National', 'Pacific', 'Capital', 'Energy', 'Health',
+         'Systems', 'Technologies', 'Holdings', 'Financial', 'Industries', 'Resources', 'Bancorp',
+         'Pharmaceuticals', 'Networks', 'Semiconductor', 'Realty', 'Therapeutics', 'Motors', 'Foods']
+SUFFIXES = ['Inc.', 'Corp.', 'Ltd.', 'plc', 'Group', 'Co.', 'ETF', 'Trust']
+
+QUERIES = ['A', 'AA', 'MSF', 'XYZQ', 'glo', 'Global Ener', 'tech', 'pharm', 'holdings inc', 'zzz', 'Realty Tr']
+
+
+def synthetic_listing(n_symbols: int, seed: int = 0) -> tuple:
+    """Random unique symbols (1-5 letters) with multi-word company names"""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_uppercase))
+    symbols = set()
+    while len(symbols) < n_symbols:
+        length = rng.integers(1, 6)
+        symbols.add(''.join(rng.choice(letters, length)))
+    symbols = sorted(symbols)
+    names = [' '.join(rng.choice(WORDS, rng.integers(1, 4))) + ' ' + rng.choice(SUFFIXES) for _ in symbols]
+    return symbols, names
+
+
+def run(n_symbols: int, repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    symbols, names = synthetic_listing(n_symbols)
+    path = os.path.join(tempfile.mkdtemp(), 'catalog.npz')
+
+    build = measure(lambda: TickerCatalog.build(symbols, names), repeat=1)
+    catalog = TickerCatalog.build(symbols, names)
+    catalog.save(path)
+    load = measure(lambda: TickerCatalog.load(path), repeat=repeat)
+    rows = [
+        {'operation': 'build index', 'query': '', 'results': len(catalog), 'ms': build['seconds'] * 1e3,
+         'max_ms': '', 'peak_mb': build['peak_mb']},
+        {'operation': 'load compact index', 'query': '', 'results': len(catalog), 'ms': load['seconds'] * 1e3,
+         'max_ms': '', 'peak_mb': load['peak_mb']},
+    ]
+
+    loaded = TickerCatalog.load(path)
+    for query in QUERIES:
+        timings = []
+        for _ in range(max(repeat, 50)):
+            start = time.perf_counter()
+            results = loaded.search(query)
+            timings.append(time.perf_counter() - start)
+        rows.append({'operation': 'search (p50)', 'query': query, 'results': len(results),
+                     'ms': float(np.median(timings)) * 1e3, 'max_ms': float(np.max(timings)) * 1e3, 'peak_mb': ''})
+    print(f"index file: {os.path.getsize(path) / 1e6:.1f} MB")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--symbols', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print_table(run(args.symbols, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
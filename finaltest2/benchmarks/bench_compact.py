@@ -0,0 +1,54 @@
+"""
+Benchmark: memory per cached ticker and range-serving time, regular vs compact HistoryCache
+
+Usage:
+    python -m benchmarks.bench_compact --years 10 --tickers 7
+"""
+
+import argparse
+import tempfile
+
+from apps.datastore import HistoryCache, PriceStore
+from apps.financeDashboard import calculate_macd
+from benchmarks.common import TRADING_DAYS_PER_YEAR, synthetic_ohlcv, measure, print_table
+
+
+def run(years: int, tickers: int, repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    n_bars = years * TRADING_DAYS_PER_YEAR
+    # Histories as the dashboard used to cache them, including the per-row 'Hist-Color' strings
+    histories = {f"T{i}": calculate_macd(synthetic_ohlcv(n_bars, seed=i)).set_index('Date') for i in range(tickers)}
+    store = PriceStore(root=tempfile.mkdtemp(), history_start="2015-01-01")
+    start, end = "2018-01-01", "2020-01-01"
+
+    rows = []
+    for compact in (False, True):
+        cache = HistoryCache(store, compact=compact)
+        for ticker, history in histories.items():
+            cache.put(ticker, history)
+        report = cache.memory_report()
+        for record in report.to_dict('records'):
+            rows.append({'mode': 'compact' if compact else 'regular', 'ticker': record['ticker'],
+                         'rows': record['rows'], 'resident_mb': record['bytes'] / 1e6,
+                         'expanded_mb': record['expanded_bytes'] / 1e6})
+        timing = measure(lambda: cache.get_range("T0", start, end), repeat=repeat)
+        rows.append({'mode': 'compact' if compact else 'regular', 'ticker': 'total',
+                     'rows': int(report['rows'].sum()), 'resident_mb': report['bytes'].sum() / 1e6,
+                     'expanded_mb': report['expanded_bytes'].sum() / 1e6,
+                     'get_range_s': timing['seconds']})
+    for row in rows:
+        row.setdefault('get_range_s', '')
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--tickers', type=int, default=7)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print_table(run(args.years, args.tickers, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: targeted lxml parsers vs pd.read_html / BeautifulSoup on Home page fixtures
+
+Fixture pages are generated to resemble the Yahoo screener and Google News pages
+(large script blocks, a 100-row table, hundreds of articles); saved real pages
+can be passed instead.
+
+Usage:
+    python -m benchmarks.bench_html_parsing [--yahoo-page most_active.html] [--news-page news.html]
+"""
+
+import argparse
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from apps.home import parse_trend_table, parse_news_headlines
+from benchmarks.common import measure, print_table
+
+
+def yahoo_fixture(n_rows: int = 100, seed: int = 0) -> str:
+    """Screener-like page: heavy head, one large quote table, long footer"""
+    rng = np.random.default_rng(seed)
+    columns = ['Symbol', 'Name', 'Price (Intraday)', 'Change', '% Change', 'Volume',
+               'Avg Vol (3 month)', 'Market Cap', 'PE Ratio (TTM)', '52 Week Range']
+    head = "".join(f"<script>var data{i} = {list(range(200))};</script>" for i in range(50))
+    header = "".join(f"<th><span>{c}</span></th>" for c in columns)
+    rows = []
+    for i in range(n_rows):
+        price = rng.uniform(5, 500)
+        cells = [f"<a href='/quote/T{i}'>T{i}</a>", f"Company {i} Inc.", f"{price:.2f}",
+                 f"{rng.normal():+.2f}", f"{rng.normal():+.2f}%", f"{rng.integers(1e5, 1e8):,}",
+                 f"{rng.integers(1e5, 1e8):,}", f"{rng.uniform(1, 900):.2f}B", f"{rng.uniform(5, 60):.2f}",
+                 f"<div><canvas></canvas>{price * 0.7:.2f} - {price * 1.3:.2f}</div>"]
+        rows.append("<tr>" + "".join(f"<td><fin-streamer>{c}</fin-streamer></td>" for c in cells) + "</tr>")
+    footer = "".join(f"<div class='footer'><p>Link {i}</p><ul><li>a</li><li>b</li></ul></div>" for i in range(2000))
+    return (f"<html><head>{head}</head><body><div id='screener'><table><thead><tr>{header}</tr></thead>"
+            f"<tbody>{''.join(rows)}</tbody></table></div>{footer}</body></html>")
+
+
+def news_fixture(n_articles: int = 300) -> str:
+    """News-like page: many articles with nested markup"""
+    head = "".join(f"<script>window.cfg{i} = '{'x' * 500}';</script>" for i in range(50))
+    articles = "".join(
+        f"<article><div><figure><img src='i{i}.jpg'></figure><h3><a href='./a{i}'>Headline number {i} "
+        f"about markets</a></h3><div><time datetime='2024-01-01'>1 hour ago</time><span>Source {i % 17}</span>"
+        f"</div></div></article>"
+        for i in range(n_articles)
+    )
+    return f"<html><head>{head}</head><body><main>{articles}</main></body></html>"
+
+
+def legacy_parse_trend_table(html: str) -> pd.DataFrame:
+    """Previous parse: every table on the page via pd.read_html"""
+    stocks = pd.read_html(StringIO(html))[0].head(5)
+    stocks.columns = [col.replace(' ', '_').strip() for col in stocks.columns]
+    cols_to_drop = [col for col in stocks.columns if any(x in col for x in ['52_Wk', 'P/E', 'Ratio', 'Range'])]
+    return stocks.drop(columns=cols_to_drop, errors='ignore')
+
+
+def legacy_parse_news_headlines(html: str) -> pd.DataFrame:
+    """Previous parse: full BeautifulSoup tree, every article"""
+    soup = BeautifulSoup(html, 'html.parser')
+    headlines = set()
+    for article in soup.find_all('article'):
+        headline = article.find('h3')
+        if headline:
+            headlines.add(headline.get_text(strip=True))
+    return pd.DataFrame(list(headlines)[:5], columns=['Headlines'])
+
+
+def run(yahoo_html: str, news_html: str, repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    rows = []
+    for page, html, variants in [
+        ('yahoo table', yahoo_html, [('pd.read_html', legacy_parse_trend_table), ('lxml target', parse_trend_table)]),
+        ('google news', news_html, [('BeautifulSoup', legacy_parse_news_headlines), ('lxml target', parse_news_headlines)]),
+    ]:
+        for name, parse in variants:
+            result = measure(lambda: parse(html), repeat=repeat)
+            rows.append({'page': page, 'parser': name, 'page_kb': len(html) // 1024,
+                         'seconds': result['seconds'], 'peak_mb': result['peak_mb']})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--yahoo-page', help="Saved Yahoo screener page")
+    parser.add_argument('--news-page', help="Saved Google News page")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    yahoo_html = open(args.yahoo_page, encoding='utf-8').read() if args.yahoo_page else yahoo_fixture()
+    news_html = open(args.news_page, encoding='utf-8').read() if args.news_page else news_fixture()
+    print_table(run(yahoo_html, news_html, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
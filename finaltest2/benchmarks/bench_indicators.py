@@ -0,0 +1,59 @@
+"""
+Benchmark: fused indicator engine vs calculate_macd / calculate_rsi / calculate_moving_averages
+
+Usage:
+    python -m benchmarks.bench_indicators --years 10 --tickers 500
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from apps.financeDashboard import calculate_macd, calculate_rsi
+from apps.utils import calculate_moving_averages
+from apps.indicators import compute_indicators, compute_indicator_arrays, DEFAULT_INDICATORS
+from benchmarks.common import TRADING_DAYS_PER_YEAR, synthetic_close_matrix, measure, print_table
+
+
+def run(years: int, tickers: int, repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    n_bars = years * TRADING_DAYS_PER_YEAR
+    matrix = synthetic_close_matrix(n_bars, tickers)
+    frames = [pd.DataFrame({'Close': matrix[:, i]}) for i in range(tickers)]
+
+    def legacy():
+        for frame in frames:
+            df = frame.copy()
+            df = calculate_macd(df)
+            df = calculate_rsi(df)
+            calculate_moving_averages(df)
+
+    def engine_per_ticker():
+        for frame in frames:
+            compute_indicators(frame, DEFAULT_INDICATORS)
+
+    def engine_matrix():
+        compute_indicator_arrays(matrix, DEFAULT_INDICATORS)
+
+    rows = []
+    for name, func in [('legacy functions', legacy),
+                       ('engine per ticker', engine_per_ticker),
+                       ('engine date x ticker', engine_matrix)]:
+        result = measure(func, repeat=repeat)
+        rows.append({'variant': name, 'bars': n_bars, 'tickers': tickers,
+                     'seconds': result['seconds'], 'peak_mb': result['peak_mb']})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print_table(run(args.years, args.tickers, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
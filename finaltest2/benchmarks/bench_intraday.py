@@ -0,0 +1,80 @@
+"""
+Benchmark: a week of one-minute bars per ticker through the history cache, resampling and the dashboard figures
+
+Usage:
+    python -m benchmarks.bench_intraday --days 5 --tickers 5
+"""
+
+import argparse
+import tempfile
+
+from apps.datastore import HistoryCache, PriceStore
+from apps.downsample import DEFAULT_POINT_BUDGET
+from apps.figure_cache import figure_to_spec
+from apps.financeDashboard import build_dashboard_figures
+from apps.resample import resample_bars
+from benchmarks.common import synthetic_intraday, measure, print_table
+
+START, END = "2024-03-01", "2024-04-01"
+
+
+def run(days: int, tickers: int, repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    histories = {f"T{i}": synthetic_intraday(days, seed=i).set_index('Date') for i in range(tickers)}
+    cache = HistoryCache(PriceStore(root=tempfile.mkdtemp(), history_start="2015-01-01"))
+
+    def install():
+        for ticker, history in histories.items():
+            cache.put(ticker, history, interval='1m')
+
+    def load(interval):
+        return {ticker: cache.get_range(ticker, START, END, interval=interval) for ticker in histories}
+
+    def resample(interval):
+        return {ticker: resample_bars(data, interval) for ticker, data in load('1m').items()}
+
+    def derive_cold():
+        # Reinstalling the 5-minute source invalidates the cached 30-minute bars
+        for ticker, data in five_minute.items():
+            cache.put(ticker, data.set_index('Date'), interval='5m')
+        return load('30m')
+
+    def render(frames, interval):
+        return [[figure_to_spec(fig) for fig in build_dashboard_figures(ticker, data, DEFAULT_POINT_BUDGET,
+                                                                          interval).values()]
+                for ticker, data in frames.items()]
+
+    install()
+    minute, five_minute = load('1m'), resample('5m')
+    rows = []
+    for stage, func in [
+        ('history cache install (compact)', install),
+        ('get_range 1m', lambda: load('1m')),
+        ('resample_bars 1m -> 5m', lambda: resample('5m')),
+        ('resample_bars 1m -> 1h', lambda: resample('1h')),
+        ('get_range 30m (resampled from cached 5m)', derive_cold),
+        ('get_range 30m (warm)', lambda: load('30m')),
+        ('render 1m: indicators + figures + serialize', lambda: render(minute, '1m')),
+        ('render 5m: indicators + figures + serialize', lambda: render(five_minute, '5m')),
+    ]:
+        result = measure(func, repeat=repeat)
+        rows.append({'stage': stage, 'tickers': tickers, 'seconds': result['seconds'],
+                     'per_ticker_ms': result['seconds'] * 1000 / tickers, 'peak_mb': result['peak_mb']})
+    report = cache.memory_report()
+    for interval, resident in report.groupby('interval')['bytes'].sum().items():
+        rows.append({'stage': f'resident {interval} bars (MB)', 'tickers': tickers, 'seconds': '',
+                     'per_ticker_ms': '', 'peak_mb': resident / 1e6})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--tickers', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print_table(run(args.days, args.tickers, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: live quote path throughput, from ticks into the coalescing buffer to bars and indicators
+
+Usage:
+    python -m benchmarks.bench_live --ticks 200000 --rate 2000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from apps.live import LiveSeries, Tick, TickBuffer
+from benchmarks.common import synthetic_intraday, measure, print_table
+
+
+def make_ticks(n: int, rate: float, start: pd.Timestamp, last_price: float, seed: int = 0) -> list:
+    """`n` ticks of one symbol arriving `rate` times per second on average"""
+    rng = np.random.default_rng(seed)
+    offsets = pd.to_timedelta(np.cumsum(rng.exponential(1.0 / rate, n)), unit='s')
+    prices = last_price * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+    return [Tick('BENCH', start + offset, price, 100.0) for offset, price in zip(offsets, prices)]
+
+
+def run(n_ticks: int, rate: float, repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    history = synthetic_intraday(5)
+    ticks = make_ticks(n_ticks, rate, history['Date'].iloc[-1], float(history['Close'].iloc[-1]))
+    buffer = TickBuffer(capacity=len(ticks))
+
+    def fill():
+        for tick in ticks:
+            buffer.put(tick)
+        return buffer.drain()['BENCH']
+
+    batches = fill()
+
+    def apply():
+        return LiveSeries(history, interval='1m').apply(batches)
+
+    rows = []
+    for stage, func in [
+        ('TickBuffer.put + drain', fill),
+        ('LiveSeries init (1,950 bars)', lambda: LiveSeries(history, interval='1m')),
+        ('LiveSeries init + apply', apply),
+    ]:
+        result = measure(func, repeat=repeat)
+        rows.append({'stage': stage, 'ticks': n_ticks, 'quotes': len(batches),
+                     'seconds': result['seconds'],
+                     'ticks_per_s': n_ticks / result['seconds'] if func is fill else '',
+                     'peak_mb': result['peak_mb']})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=200_000)
+    parser.add_argument('--rate', type=float, default=2000.0, help="Average ticks per second of feed time")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print_table(run(args.ticks, args.rate, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
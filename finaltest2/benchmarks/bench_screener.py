@@ -0,0 +1,73 @@
+"""
+Benchmark: screener pass over a universe of cached histories (target: under a second for 500 tickers)
+
+Usage:
+    python -m benchmarks.bench_screener --tickers 500 --years 10
+"""
+
+import argparse
+import tempfile
+
+import numpy as np
+
+from apps.datastore import HistoryCache, PriceStore, get_price_store
+from apps.screener import align_closes, screen, screen_histories
+from apps.utils import load_universe
+from benchmarks.common import TRADING_DAYS_PER_YEAR, synthetic_close_matrix, synthetic_ohlcv, measure, print_table
+
+
+def synthetic_histories(tickers: int, years: int) -> dict:
+    """Histories indexed by Date; a tenth of the tickers list later or miss a few bars"""
+    n_bars = years * TRADING_DAYS_PER_YEAR
+    frame = synthetic_ohlcv(n_bars).set_index('Date')
+    closes = synthetic_close_matrix(n_bars, tickers)
+    rng = np.random.default_rng(1)
+    histories = {}
+    for i in range(tickers):
+        history = frame.assign(Close=closes[:, i])
+        if i % 10 == 0:
+            history = history.iloc[rng.integers(0, n_bars // 2):]
+            history = history.drop(history.index[rng.integers(0, len(history), 5)])
+        histories[f"T{i:03d}"] = history
+    return histories
+
+
+def run(tickers: int, years: int, repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    histories = synthetic_histories(tickers, years)
+    dates, names, close = align_closes(histories)
+    cache = HistoryCache(PriceStore(root=tempfile.mkdtemp()))
+
+    def install():
+        for ticker, history in histories.items():
+            cache.put(ticker, history)
+
+    # Page path on cached data: the shared service and history cache already hold the universe
+    get_price_store().update_many = lambda tickers, force=False: histories
+    load_universe(list(histories))
+
+    rows = []
+    for stage, func in [
+        ('align closes', lambda: align_closes(histories)),
+        ('indicators + signals', lambda: screen(dates, names, close)),
+        ('screen (align + indicators)', lambda: screen_histories(histories)),
+        ('history cache install (cold)', install),
+        ('page: load_universe + screen (warm)', lambda: screen_histories(load_universe(list(histories)))),
+    ]:
+        result = measure(func, repeat=repeat)
+        rows.append({'stage': stage, 'tickers': tickers, 'bars': close.shape[0],
+                     'seconds': result['seconds'], 'peak_mb': result['peak_mb']})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print_table(run(args.tickers, args.years, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
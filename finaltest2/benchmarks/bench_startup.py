@@ -0,0 +1,73 @@
+"""
+Benchmark: cold-start import time and memory of the dashboard pages, eager vs lazy registration
+
+Each measurement runs in a fresh interpreter, so module caches are cold.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modules app.py imported before lazy registration (every page, for every session)
+EAGER_MODULES = ['multiapp', 'apps.utils', 'apps.home', 'apps.financeDashboard', 'apps.prediction']
+
+# Modules imported at startup with lazy registration
+LAZY_BASE_MODULES = ['multiapp', 'apps.utils']
+
+PAGES = {
+    'Home': 'apps.home',
+    'Finance Dashboard': 'apps.financeDashboard',
+    'Prediction': 'apps.prediction',
+}
+
+PROBE = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+seconds = time.perf_counter() - start
+heavy = [m for m in ('prophet', 'cmdstanpy', 'matplotlib', 'bs4', 'plotly') if m in sys.modules]
+print(json.dumps({'seconds': seconds, 'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  'heavy': heavy}))
+"""
+
+
+def probe(modules: List[str], repeat: int) -> Dict[str, object]:
+    """Import modules in fresh interpreters; report best time, peak RSS and heavy libraries loaded"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', PROBE, *modules], cwd=root, check=True,
+                                capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run['seconds'])
+    return {'seconds': best['seconds'], 'rss_mb': best['rss_mb'], 'heavy': ','.join(best['heavy']) or '-'}
+
+
+def run(repeat: int) -> list:
+    """Run the benchmark and return result rows"""
+    rows = [{'variant': 'eager: startup, top-level Prophet', **probe(EAGER_MODULES + ['prophet', 'prophet.plot'], repeat)},
+            {'variant': 'eager: startup (all pages)', **probe(EAGER_MODULES, repeat)},
+            {'variant': 'lazy: startup', **probe(LAZY_BASE_MODULES, repeat)}]
+    for title, module in PAGES.items():
+        rows.append({'variant': f'lazy: startup + {title}', **probe(LAZY_BASE_MODULES + [module], repeat)})
+    return rows
+
+
+def main() -> None:
+    from benchmarks.common import print_table
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print_table(run(args.repeat))
+
+
+if __name__ == '__main__':
+    main()
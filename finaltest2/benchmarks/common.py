@@ -0,0 +1,109 @@
+"""
+Shared helpers for benchmarks: synthetic market data and measurement utilities
+"""
+
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 0, start: str = "2015-01-01") -> pd.DataFrame:
+    """
+    Generate a random-walk OHLCV frame shaped like load_stock_data output
+
+    Args:
+        n_bars (int): Number of daily bars
+        seed (int): Random seed
+        start (str): First bar date
+
+    Returns:
+        pd.DataFrame: Frame with Date, Open, High, Low, Close, Adj Close, Volume columns
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n_bars)))
+    open_ = close * (1 + rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, n_bars)))
+    return pd.DataFrame({
+        'Date': pd.bdate_range(start, periods=n_bars),
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Adj Close': close,
+        'Volume': rng.integers(1_000_000, 50_000_000, n_bars),
+    })
+
+
+def synthetic_intraday(days: int, seed: int = 0, start: str = "2024-03-04", open_time: str = "09:30",
+                       bars_per_session: int = 390) -> pd.DataFrame:
+    """
+    Generate random-walk one-minute OHLCV bars shaped like load_stock_data output at interval '1m'
+
+    Args:
+        days (int): Number of trading sessions
+        seed (int): Random seed
+        start (str): First session date
+        open_time (str): Session open (local exchange time)
+        bars_per_session (int): One-minute bars per session (390 for a 6.5 hour session)
+
+    Returns:
+        pd.DataFrame: Frame with Date, Open, High, Low, Close, Adj Close, Volume columns
+    """
+    sessions = pd.bdate_range(start, periods=days)
+    dates = np.concatenate([
+        pd.date_range(f"{day:%Y-%m-%d} {open_time}", periods=bars_per_session, freq='1min').to_numpy()
+        for day in sessions
+    ])
+    frame = synthetic_ohlcv(len(dates), seed=seed)
+    frame['Date'] = dates
+    return frame
+
+
+def synthetic_close_matrix(n_bars: int, n_tickers: int, seed: int = 0) -> np.ndarray:
+    """Random-walk close prices shaped (date x ticker)"""
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.015, (n_bars, n_tickers)), axis=0))
+
+
+def measure(func: Callable, repeat: int = 3) -> Dict[str, float]:
+    """
+    Measure best wall time and traced peak memory of a callable
+
+    Args:
+        func (Callable): Zero-argument callable to measure
+        repeat (int): Number of timed runs (the best is reported)
+
+    Returns:
+        Dict[str, float]: {'seconds': best wall time, 'peak_mb': peak traced allocation}
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(timings), 'peak_mb': peak / 1e6}
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    """Print benchmark rows as an aligned text table"""
+    if not rows:
+        return
+    headers = list(rows[0])
+    cells = [[f"{row[h]:.4f}" if isinstance(row[h], float) else str(row[h]) for h in headers] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
@@ -0,0 +1,424 @@
+"""
+Render harness: headless full-page rerun latency and payload size of the dashboard pages
+
+Pages run under Streamlit's AppTest with yf.download replaced by synthetic
+histories and the HTTP session served from generated Home page fixtures, so no
+network is used. Scripted interactions (opening a page, switching tickers,
+moving dates, generating forecasts) are repeated, and each rerun records its
+wall latency, the page script's own time, and the serialized size of the page's
+elements in AppTest's element tree.
+
+Usage:
+    python -m benchmarks.render_harness --years 1 5 10 --runs 10 --output render.json
+    python -m benchmarks.render_harness --pages "Finance Dashboard" --prophet
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+import textwrap
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from unittest.mock import patch
+
+# Every on-disk cache of the app modules goes to a scratch folder (read when they are imported)
+os.environ["STOCK_DATA_DIR"] = tempfile.mkdtemp(prefix="render-harness-")
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+from apps import batch_forecast, datastore, model_cache
+from apps.home import FEED_SOURCES, GOOGLE_NEWS_FINANCE
+from apps.http_client import get_http_client
+from apps.resample import DAILY, INTERVALS, resample_bars
+from apps.ticker_catalog import get_ticker_catalog
+from apps.utils import DEFAULT_TICKER_LABELS, STOCK_TICKER_MAP
+from benchmarks.bench_html_parsing import news_fixture, yahoo_fixture
+from benchmarks.common import TRADING_DAYS_PER_YEAR, print_table, synthetic_intraday, synthetic_ohlcv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_YEARS = (1, 5, 10)
+
+# Reruns per interaction
+DEFAULT_RUNS = 10
+
+# Seconds a single rerun may take before AppTest gives up (cold runs import Plotly, Prophet, ...)
+RERUN_TIMEOUT = 120
+
+# Streamlit releases whose AppTest script runner _wait_for_run was checked against (see requirements.txt)
+HARNESS_STREAMLIT_VERSIONS = ("1.28.",)
+
+# Session state key the page script reports its measurements under
+STATS_KEY = "_render_harness"
+
+TICKERS = list(STOCK_TICKER_MAP.values())
+
+TICKER_SELECTBOX = 'Select dataset for analysis'
+INTERVAL_SELECTBOX = 'Bar Interval'
+
+# Intervals the dashboard is switched through, and the sessions of intraday bars served for them
+INTERVAL_CYCLE = ['1h', '5m', '1m', '1d']
+INTRADAY_SESSIONS = 5
+
+PAGE_SCRIPT = """
+import time
+import streamlit as st
+from {module} import app
+
+start = time.perf_counter()
+try:
+    app()
+finally:
+    st.session_state["{key}"] = {{"script_ms": (time.perf_counter() - start) * 1000}}
+"""
+
+
+class StubDownload:
+    """Stand-in for yf.download: one seeded synthetic history per ticker and interval, ending yesterday"""
+
+    def __init__(self, n_bars: int):
+        self.n_bars = n_bars
+        self._histories: Dict[tuple, pd.DataFrame] = {}
+
+    def history(self, ticker: str, interval: str = DAILY) -> pd.DataFrame:
+        key = (ticker, interval)
+        if key not in self._histories:
+            seed = zlib.crc32(ticker.encode())
+            if interval == DAILY:
+                first = pd.bdate_range(end=date.today() - timedelta(days=1), periods=self.n_bars)[0]
+                frame = synthetic_ohlcv(self.n_bars, seed=seed, start=first.strftime("%Y-%m-%d"))
+            else:
+                first = pd.bdate_range(end=date.today() - timedelta(days=1), periods=INTRADAY_SESSIONS)[0]
+                frame = synthetic_intraday(INTRADAY_SESSIONS, seed=seed, start=first.strftime("%Y-%m-%d"))
+                frame = frame if interval == '1m' else resample_bars(frame, interval)
+            self._histories[key] = frame.set_index('Date')
+        return self._histories[key]
+
+    def _slice(self, ticker: str, start, end, interval: str) -> pd.DataFrame:
+        history = self.history(ticker, interval)
+        lo = history.index.searchsorted(pd.Timestamp(start)) if start else 0
+        hi = history.index.searchsorted(pd.Timestamp(end)) if end else len(history)
+        return history.iloc[lo:hi].copy()
+
+    def __call__(self, tickers, start=None, end=None, interval: str = DAILY, **kwargs) -> pd.DataFrame:
+        if isinstance(tickers, str):
+            return self._slice(tickers, start, end, interval)
+        return pd.concat({ticker: self._slice(ticker, start, end, interval) for ticker in tickers}, axis=1)
+
+
+class FixtureAdapter(HTTPAdapter):
+    """Transport adapter answering the Home page sources from generated fixture pages"""
+
+    def __init__(self):
+        super().__init__()
+        yahoo, news = yahoo_fixture(), news_fixture()
+        self.pages = {url: news if url == GOOGLE_NEWS_FINANCE else yahoo for url, _ in FEED_SOURCES.values()}
+
+    def send(self, request, **kwargs):
+        body = self.pages.get(request.url)
+        response = requests.Response()
+        response.status_code = 200 if body is not None else 404
+        response._content = (body or "").encode("utf-8")
+        response.headers["Content-Type"] = "text/html; charset=utf-8"
+        response.encoding = "utf-8"
+        response.url, response.request = request.url, request
+        return response
+
+
+def check_streamlit_version() -> None:
+    """
+    Refuse to run on a Streamlit release _wait_for_run was not checked against
+
+    Raises:
+        RuntimeError: If the installed Streamlit is not one of HARNESS_STREAMLIT_VERSIONS
+    """
+    if not st.__version__.startswith(HARNESS_STREAMLIT_VERSIONS):
+        raise RuntimeError(
+            f"The render harness replaces AppTest's completion wait and was checked against Streamlit "
+            f"{', '.join(version + 'x' for version in HARNESS_STREAMLIT_VERSIONS)}, not {st.__version__}; "
+            f"install the versions in requirements.txt")
+
+
+def _wait_for_run(runner, timeout: float = 3) -> None:
+    """AppTest's completion wait, joining the script thread instead of polling every 100 ms"""
+    runner._script_thread.join(timeout)
+    if runner._script_thread.is_alive():
+        runner.request_stop()
+        runner.join()
+        raise RuntimeError(f"AppTest script run timed out after {timeout}s")
+
+
+def _widget(widgets, label: str):
+    """The widget with a given label"""
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No widget labelled '{label}'")
+
+
+@dataclass
+class Interaction:
+    """A scripted user action: `apply(at, i)` sets widgets for the i-th repetition and returns the AppTest to rerun"""
+    name: str
+    apply: Callable[[AppTest, int], AppTest]
+
+
+def new_session(module: str) -> Callable[[AppTest, int], AppTest]:
+    """Open the page in a fresh browser session"""
+    script = textwrap.dedent(PAGE_SCRIPT.format(module=module, key=STATS_KEY))
+    return lambda at, i: AppTest.from_string(script, default_timeout=RERUN_TIMEOUT)
+
+
+# Display labels of the selectboxes that use a format_func
+FORMATTED_SELECTBOXES: Dict[str, Callable[[str], str]] = {
+    TICKER_SELECTBOX: lambda symbol: DEFAULT_TICKER_LABELS.get(symbol) or get_ticker_catalog().label(symbol),
+    INTERVAL_SELECTBOX: INTERVALS.get,
+}
+
+
+def pin_formatted_selections(at: AppTest) -> None:
+    """
+    Resend the current selection of each formatted selectbox as its displayed label
+
+    AppTest 1.28 matches a selectbox's value against the options as formatted by
+    format_func, so an untouched ticker or interval selectbox would fail to report its
+    state. Called before an interaction, which may then select another option.
+    """
+    for box in at.selectbox:
+        if box.label in FORMATTED_SELECTBOXES:
+            box.set_value(FORMATTED_SELECTBOXES[box.label](at.session_state[box.id]))
+
+
+def page_payload(at: AppTest) -> Tuple[int, int]:
+    """
+    Serialized size of the page the browser holds after a rerun
+
+    Args:
+        at (AppTest): The app after a run
+
+    Returns:
+        Tuple[int, int]: Bytes and number of the elements and blocks in the main area and sidebar
+    """
+    protos = [node.proto for block in (at.main, at.sidebar) for node in block if node.proto is not None]
+    return sum(proto.ByteSize() for proto in protos), len(protos)
+
+
+def select_ticker(at: AppTest, i: int) -> AppTest:
+    box = _widget(at.selectbox, TICKER_SELECTBOX)
+    box.select_index((i + 1) % len(box.options))
+    return at
+
+
+def search_ticker(at: AppTest, i: int) -> AppTest:
+    _widget(at.text_input, 'Search ticker or company').set_value(['micro', 'apple', 'tesla', ''][i % 4])
+    return at
+
+
+def move_start_date(at: AppTest, i: int) -> AppTest:
+    # Alternate between a recent window and the full range, so both cache paths are timed
+    start = date.today() - timedelta(days=90 * (1 + i % 4)) if i % 2 == 0 else date(2015, 1, 1)
+    _widget(at.date_input, 'Start Date').set_value(start)
+    return at
+
+
+def switch_interval(at: AppTest, i: int) -> AppTest:
+    box = _widget(at.selectbox, INTERVAL_SELECTBOX)
+    box.select_index(list(INTERVALS).index(INTERVAL_CYCLE[i % len(INTERVAL_CYCLE)]))
+    return at
+
+
+def toggle_full_resolution(at: AppTest, i: int) -> AppTest:
+    _widget(at.checkbox, 'Full-resolution charts').set_value(i % 2 == 0)
+    return at
+
+
+def change_horizon(at: AppTest, i: int) -> AppTest:
+    _widget(at.slider, 'Forecast Period (Months)').set_value(1 + i % 12)
+    return at
+
+
+def generate_forecast(engine: str) -> Callable[[AppTest, int], AppTest]:
+    def apply(at: AppTest, i: int) -> AppTest:
+        _widget(at.radio, 'Forecast Engine').set_value(engine)
+        _widget(at.button, 'Generate Forecast').click()
+        return at
+    return apply
+
+
+def rerun(at: AppTest, i: int) -> AppTest:
+    return at
+
+
+def click_trend(label: str) -> Callable[[AppTest, int], AppTest]:
+    def apply(at: AppTest, i: int) -> AppTest:
+        _widget(at.button, label).click()
+        return at
+    return apply
+
+
+def scenarios(prophet: bool) -> Dict[str, List[Interaction]]:
+    """Interactions per page, run in order on one session (after 'open')"""
+    from apps.fast_forecast import FAST_ENGINES
+
+    prediction = [
+        Interaction('open', new_session('apps.prediction')),
+        Interaction('rerun (no change)', rerun),
+        Interaction('change horizon', change_horizon),
+        *[Interaction(f'forecast: {engine}', generate_forecast(engine)) for engine in FAST_ENGINES],
+        Interaction('switch ticker', select_ticker),
+    ]
+    if prophet:
+        # Served from the precomputed artifacts written by offline_history(), like after the nightly batch
+        prediction.insert(-1, Interaction('forecast: Prophet (precomputed)', generate_forecast('Prophet')))
+    return {
+        'Finance Dashboard': [
+            Interaction('open', new_session('apps.financeDashboard')),
+            Interaction('rerun (no change)', rerun),
+            Interaction('switch ticker', select_ticker),
+            Interaction('search ticker', search_ticker),
+            Interaction('move start date', move_start_date),
+            Interaction('switch bar interval', switch_interval),
+            Interaction('toggle full resolution', toggle_full_resolution),
+        ],
+        'Prediction': prediction,
+        'Home': [
+            Interaction('open', new_session('apps.home')),
+            Interaction('most active', click_trend('🔥 Most Active')),
+            Interaction('top gainers', click_trend('📈 Top Gainers')),
+        ],
+    }
+
+
+@contextmanager
+def offline_history(n_bars: int, prophet: bool) -> Iterator[None]:
+    """
+    Serve synthetic histories of n_bars and fixture pages to the app, with stores in their own folder
+
+    Args:
+        n_bars (int): Bars per ticker
+        prophet (bool): Also precompute the Prophet forecasts of the first ticker, as the nightly batch would
+    """
+    root = os.path.join(datastore.DATA_DIR, f"bars{n_bars}")
+    session = get_http_client().session
+    with patch.object(datastore.yf, 'download', StubDownload(n_bars)), \
+            patch.dict(session.adapters, {'https://': FixtureAdapter(), 'http://': FixtureAdapter()}), \
+            patch.object(batch_forecast, 'DATA_DIR', root), \
+            patch.object(datastore, '_store', datastore.PriceStore(root=root)), \
+            patch.object(model_cache, '_cache', model_cache.ProphetModelCache(root=root)):
+        with patch.object(datastore, '_history_cache', datastore.HistoryCache(datastore._store)):
+            if prophet:
+                batch_forecast.precompute_forecast(TICKERS[0], True, True, batch_forecast.MAX_FORECAST_MONTHS * 30,
+                                                   datetime.now().strftime("%Y-%m-%d"), data_dir=root)
+            yield
+
+
+def run_page(page: str, interactions: List[Interaction], runs: int) -> List[Dict[str, object]]:
+    """
+    Run every interaction of a page `runs` times on one session
+
+    Args:
+        page (str): Page title
+        interactions (List[Interaction]): Interactions; the first opens the session
+        runs (int): Repetitions of each interaction
+
+    Returns:
+        List[Dict[str, object]]: One row per interaction with latency percentiles and payload size
+    """
+    samples = {interaction.name: [] for interaction in interactions}
+    at = None
+    for i in range(runs):
+        for interaction in interactions:
+            if at is not None and STATS_KEY in at.session_state:
+                pin_formatted_selections(at)
+            at = interaction.apply(at, i)
+            start = time.perf_counter()
+            at.run()
+            wall_ms = (time.perf_counter() - start) * 1000
+            if len(at.exception) or len(at.error):
+                failure = at.exception[0].message if len(at.exception) else at.error[0].value
+                raise RuntimeError(f"{page} / {interaction.name}: {failure}")
+            payload_bytes, elements = page_payload(at)
+            samples[interaction.name].append({'wall_ms': wall_ms, 'payload_bytes': payload_bytes,
+                                              'elements': elements, **at.session_state[STATS_KEY]})
+
+    rows = []
+    for name, records in samples.items():
+        wall = np.array([record['wall_ms'] for record in records])
+        script = np.array([record['script_ms'] for record in records])
+        rows.append({
+            'page': page,
+            'interaction': name,
+            'runs': len(records),
+            'p50_ms': float(np.percentile(wall, 50)),
+            'p95_ms': float(np.percentile(wall, 95)),
+            'script_p50_ms': float(np.percentile(script, 50)),
+            'payload_kb': float(np.mean([record['payload_bytes'] for record in records]) / 1024),
+            'elements': int(np.median([record['elements'] for record in records])),
+        })
+    return rows
+
+
+def run(years: List[int], runs: int, pages: Optional[List[str]] = None, prophet: bool = False) -> List[Dict[str, object]]:
+    """
+    Run the scenarios for every history length
+
+    Args:
+        years (List[int]): History lengths in years
+        runs (int): Repetitions of each interaction
+        pages (List[str]): Page titles to run (defaults to all)
+        prophet (bool): Include the Prophet forecast interaction (fits one model per history length)
+
+    Returns:
+        List[Dict[str, object]]: Result rows with a 'bars' column
+    """
+    check_streamlit_version()
+    rows = []
+    with patch.object(local_script_runner, 'require_widgets_deltas', _wait_for_run):
+        for n_years in years:
+            n_bars = n_years * TRADING_DAYS_PER_YEAR
+            with offline_history(n_bars, prophet):
+                for page, interactions in scenarios(prophet).items():
+                    if pages and page not in pages:
+                        continue
+                    for row in run_page(page, interactions, runs):
+                        rows.append({'bars': n_bars, **row})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, nargs='+', default=list(DEFAULT_YEARS), help="History lengths in years")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="Reruns per interaction")
+    parser.add_argument('--pages', nargs='+', help="Page titles to run (default: all)")
+    parser.add_argument('--prophet', action='store_true', help="Include a Prophet forecast (precomputed per history length)")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    # Streamlit warns about every element used outside `streamlit run`
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    # cmdstanpy installs its own INFO handler on first use unless the logger already has one
+    cmdstanpy_logger = logging.getLogger('cmdstanpy')
+    cmdstanpy_logger.addHandler(logging.NullHandler())
+    cmdstanpy_logger.setLevel(logging.WARNING)
+
+    rows = run(args.years, args.runs, args.pages, args.prophet)
+    print_table(rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({'settings': vars(args), 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+"""
+Benchmark suite: offline timings of the data and compute pipeline, with a regression check against a baseline
+
+Everything runs on synthetic OHLCV data (fixed seeds) with yfinance stubbed out
+and on generated or saved HTML pages, so results are reproducible without
+network access. Each case is measured at several history lengths.
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.5
+    python -m benchmarks.suite --years 1 5 10 --write-baseline benchmarks/baseline.json
+
+Timings depend on the machine, so the baseline should be written on the machine
+(or CI runner) it is compared on.
+"""
+
+import gc
+import os
+import sys
+import json
+import logging
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from apps import datastore
+from apps.datastore import HistoryCache, PriceStore
+from apps.downsample import DEFAULT_POINT_BUDGET
+from apps.figure_cache import figure_to_spec
+from apps.financeDashboard import calculate_macd, calculate_rsi, plot_candlestick, plot_macd_subplot, plot_rsi_subplot
+from apps import home
+from apps.home import GOOGLE_NEWS_FINANCE, YAHOO_MOST_ACTIVE, get_latest_news, parse_yahoo_finance
+from apps.utils import calculate_moving_averages, load_stock_data
+from benchmarks.bench_html_parsing import news_fixture, yahoo_fixture
+from benchmarks.common import TRADING_DAYS_PER_YEAR, synthetic_ohlcv, measure, print_table
+
+DEFAULT_YEARS = (1, 5, 10)
+
+# A case slower than baseline * (1 + threshold) is a regression
+DEFAULT_THRESHOLD = 0.5
+
+# Slowdowns smaller than this are timer noise on sub-millisecond cases, never regressions
+MIN_REGRESSION_SECONDS = 0.002
+
+# Prophet fits take seconds, so they are timed once per history length
+PROPHET_REPEAT = 1
+
+TICKER = "BENCH"
+
+
+class StubDownload:
+    """Stand-in for yf.download serving one synthetic history, as yfinance would (Date index)"""
+
+    def __init__(self, history: pd.DataFrame):
+        self.history = history.set_index('Date')
+        self.calls = 0
+
+    def __call__(self, tickers, start=None, end=None, **kwargs) -> pd.DataFrame:
+        self.calls += 1
+        index = self.history.index
+        lo = index.searchsorted(pd.Timestamp(start)) if start else 0
+        hi = index.searchsorted(pd.Timestamp(end)) if end else len(index)
+        return self.history.iloc[lo:hi].copy()
+
+
+def _install_cache(root: str) -> HistoryCache:
+    """Point the process-wide store and history cache at an empty folder"""
+    datastore._store = PriceStore(root=root)
+    datastore._history_cache = HistoryCache(datastore._store)
+    return datastore._history_cache
+
+
+def measure_quiet(func: Callable, repeat: int) -> Dict[str, float]:
+    """measure() with garbage collection paused, as timeit does, so collections of earlier cases do not land in a timing"""
+    gc.collect()
+    gc.disable()
+    try:
+        return measure(func, repeat=repeat)
+    finally:
+        gc.enable()
+
+
+def data_cases(n_bars: int, root: str) -> List[Tuple[str, Callable, int]]:
+    """
+    Cases over one history length
+
+    Args:
+        n_bars (int): Number of daily bars
+        root (str): Scratch folder for the price store
+
+    Returns:
+        List[Tuple[str, Callable, int]]: (case, zero-argument function, repeat override or 0)
+    """
+    history = synthetic_ohlcv(n_bars, seed=n_bars)
+    start = history['Date'].iloc[0].strftime("%Y-%m-%d")
+    end = (history['Date'].iloc[-1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    stub = StubDownload(history)
+    store_root = os.path.join(root, str(n_bars))
+
+    with patch.object(datastore.yf, 'download', stub):
+        warm_cache = _install_cache(os.path.join(store_root, "warm"))
+        load_stock_data(TICKER, start, end)
+
+    def load_cold():
+        # Empty store and cache: stubbed download, Parquet write and cache install
+        with patch.object(datastore.yf, 'download', stub):
+            _install_cache(os.path.join(store_root, f"cold{stub.calls}"))
+            return load_stock_data(TICKER, start, end)
+
+    def load_warm():
+        datastore._history_cache = warm_cache
+        return load_stock_data(TICKER, start, end)
+
+    frame = history.copy()
+    indicators = calculate_rsi(calculate_macd(history.copy()))
+    figures = {
+        'candlestick': plot_candlestick(history, TICKER, DEFAULT_POINT_BUDGET),
+        'macd': plot_macd_subplot(indicators, DEFAULT_POINT_BUDGET),
+        'rsi': plot_rsi_subplot(indicators, DEFAULT_POINT_BUDGET),
+    }
+
+    def prophet():
+        from apps.prediction import create_prophet_forecast
+        return create_prophet_forecast(history, periods=90)
+
+    return [
+        ('load_stock_data (cold, stubbed yfinance)', load_cold, 0),
+        ('load_stock_data (warm)', load_warm, 0),
+        ('calculate_macd', lambda: calculate_macd(frame), 0),
+        ('calculate_rsi', lambda: calculate_rsi(frame), 0),
+        ('calculate_moving_averages', lambda: calculate_moving_averages(frame), 0),
+        ('plot_candlestick', lambda: plot_candlestick(history, TICKER, DEFAULT_POINT_BUDGET), 0),
+        ('plot_macd_subplot', lambda: plot_macd_subplot(indicators, DEFAULT_POINT_BUDGET), 0),
+        ('plot_rsi_subplot', lambda: plot_rsi_subplot(indicators, DEFAULT_POINT_BUDGET), 0),
+        ('figure serialization (3 figures)', lambda: [figure_to_spec(fig) for fig in figures.values()], 0),
+        ('create_prophet_forecast (90 days)', prophet, PROPHET_REPEAT),
+    ]
+
+
+class StubPages:
+    """Stand-in for the shared HTTP client serving saved pages by URL"""
+
+    class Response:
+        def __init__(self, text: str):
+            self.text = text
+
+        def raise_for_status(self) -> None:
+            pass
+
+    def __init__(self, pages: Dict[str, str]):
+        self.pages = pages
+
+    def get(self, url: str, **kwargs) -> "StubPages.Response":
+        return self.Response(self.pages[url])
+
+
+def html_cases(pages_dir: Optional[str]) -> List[Tuple[str, Callable, int]]:
+    """
+    Fetch-and-parse cases over saved pages (most_active.html, news.html in pages_dir) or generated fixtures
+
+    Args:
+        pages_dir (str): Folder of saved pages, or None for the generated fixtures
+
+    Returns:
+        List[Tuple[str, Callable, int]]: (case, zero-argument function, repeat override or 0)
+    """
+    yahoo_html, news_html = yahoo_fixture(), news_fixture()
+    if pages_dir:
+        with open(os.path.join(pages_dir, "most_active.html"), encoding="utf-8") as f:
+            yahoo_html = f.read()
+        with open(os.path.join(pages_dir, "news.html"), encoding="utf-8") as f:
+            news_html = f.read()
+    client = StubPages({YAHOO_MOST_ACTIVE: yahoo_html, GOOGLE_NEWS_FINANCE: news_html})
+
+    def served(func: Callable, url: str) -> Callable:
+        def call():
+            with patch.object(home, 'get_http_client', return_value=client):
+                return func(url)
+        return call
+
+    return [
+        ('parse_yahoo_finance (Yahoo screener page)', served(parse_yahoo_finance, YAHOO_MOST_ACTIVE), 0),
+        ('get_latest_news (Google News page)', served(get_latest_news, GOOGLE_NEWS_FINANCE), 0),
+    ]
+
+
+def run(years: List[int], repeat: int, pages_dir: Optional[str] = None, prophet: bool = True) -> List[Dict[str, object]]:
+    """
+    Run every case and return result rows
+
+    Args:
+        years (List[int]): History lengths in years
+        repeat (int): Timed runs per case (the best is reported)
+        pages_dir (str): Folder of saved HTML pages (defaults to generated fixtures)
+        prophet (bool): Include the Prophet forecast cases
+
+    Returns:
+        List[Dict[str, object]]: Rows with case, bars, seconds and peak_mb
+    """
+    rows = []
+    saved = datastore._store, datastore._history_cache
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            for n_years in years:
+                n_bars = n_years * TRADING_DAYS_PER_YEAR
+                for case, func, case_repeat in data_cases(n_bars, root):
+                    if not prophet and case.startswith('create_prophet_forecast'):
+                        continue
+                    result = measure_quiet(func, case_repeat or repeat)
+                    rows.append({'case': case, 'bars': n_bars, 'seconds': result['seconds'], 'peak_mb': result['peak_mb']})
+    finally:
+        datastore._store, datastore._history_cache = saved
+    for case, func, case_repeat in html_cases(pages_dir):
+        result = measure_quiet(func, case_repeat or repeat)
+        rows.append({'case': case, 'bars': 0, 'seconds': result['seconds'], 'peak_mb': result['peak_mb']})
+    return rows
+
+
+def environment() -> Dict[str, str]:
+    """Versions and machine details stored next to the results"""
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': str(os.cpu_count()),
+    }
+
+
+def compare(results: List[Dict[str, object]], baseline: List[Dict[str, object]],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, object]]:
+    """
+    Compare results with a baseline, case by case
+
+    Args:
+        results (List[Dict]): Rows from run()
+        baseline (List[Dict]): Rows of the baseline run
+        threshold (float): Allowed relative slowdown before a case counts as a regression
+
+    Returns:
+        List[Dict[str, object]]: Rows with case, bars, baseline and current seconds, ratio and status
+            ('regression', 'improved', 'ok', or 'new' when the baseline lacks the case)
+    """
+    reference = {(row['case'], row['bars']): row['seconds'] for row in baseline}
+    rows = []
+    for row in results:
+        before = reference.get((row['case'], row['bars']))
+        if before is None:
+            rows.append({'case': row['case'], 'bars': row['bars'], 'baseline_s': float('nan'),
+                         'seconds': row['seconds'], 'ratio': float('nan'), 'status': 'new'})
+            continue
+        ratio = row['seconds'] / before if before else float('inf')
+        if abs(row['seconds'] - before) < MIN_REGRESSION_SECONDS:
+            status = 'ok'
+        else:
+            status = 'regression' if ratio > 1 + threshold else 'improved' if ratio < 1 / (1 + threshold) else 'ok'
+        rows.append({'case': row['case'], 'bars': row['bars'], 'baseline_s': before,
+                     'seconds': row['seconds'], 'ratio': ratio, 'status': status})
+    return rows
+
+
+def write_results(path: str, rows: List[Dict[str, object]], settings: Dict[str, object]) -> None:
+    """Write results with their environment and settings as JSON"""
+    with open(path, "w") as f:
+        json.dump({'environment': environment(), 'settings': settings, 'results': rows}, f, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, nargs='+', default=list(DEFAULT_YEARS), help="History lengths in years")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--pages', help="Folder with saved most_active.html and news.html pages")
+    parser.add_argument('--no-prophet', action='store_true', help="Skip the Prophet forecast cases")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against this results file; exits 1 on a regression")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--write-baseline', help="Write the results as the new baseline")
+    args = parser.parse_args()
+
+    # Streamlit warns about every element used outside `streamlit run`
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    # cmdstanpy installs its own INFO handler on first use unless the logger already has one
+    cmdstanpy_logger = logging.getLogger('cmdstanpy')
+    cmdstanpy_logger.addHandler(logging.NullHandler())
+    cmdstanpy_logger.setLevel(logging.WARNING)
+
+    rows = run(args.years, args.repeat, args.pages, prophet=not args.no_prophet)
+    print_table(rows)
+    settings = {'years': args.years, 'repeat': args.repeat, 'pages': args.pages or 'generated fixtures'}
+    for path in (args.output, args.write_baseline):
+        if path:
+            write_results(path, rows, settings)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        comparison = compare(rows, baseline, args.threshold)
+        print()
+        print_table(comparison)
+        regressions = [row for row in comparison if row['status'] == 'regression']
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
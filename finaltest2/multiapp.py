@@ -3,12 +3,53 @@ Multi-Page Framework for Streamlit Applications
 """
 
 import streamlit as st
-from typing import List, Callable, Dict
+from typing import List, Callable, Dict, Optional, Union
+import importlib
 import logging
 
+from apps.instrumentation import DEV_PANEL, export_metrics, render_dev_panel, trace_rerun
+
 logger = logging.getLogger(__name__)
 
 
+class LazyPage:
+    """Page function given as a dotted path, imported on first call so unused pages cost nothing."""
+    
+    def __init__(self, target: str):
+        """
+        Initialize a lazily imported page
+        
+        Args:
+            target (str): "package.module" (uses its app function) or "package.module:function"
+        """
+        module_name, _, attr = target.partition(":")
+        if not module_name or not all(part.isidentifier() for part in module_name.split(".")):
+            raise ValueError(f"Invalid page module path: '{target}'")
+        if attr and not attr.isidentifier():
+            raise ValueError(f"Invalid page function name: '{target}'")
+        
+        self.module_name = module_name
+        self.attr = attr or "app"
+        self._func: Optional[Callable] = None
+    
+    def resolve(self) -> Callable:
+        """Import the page module (once) and return its page function"""
+        if self._func is None:
+            module = importlib.import_module(self.module_name)
+            func = getattr(module, self.attr)
+            if not callable(func):
+                raise TypeError(f"{self.module_name}:{self.attr} is not callable")
+            self._func = func
+            logger.info(f"Loaded page module: {self.module_name}")
+        return self._func
+    
+    def __call__(self):
+        return self.resolve()()
+    
+    def __repr__(self) -> str:
+        return f"LazyPage('{self.module_name}:{self.attr}')"
+
+
 class MultiApp:
     """Framework for combining multiple Streamlit applications into a single app."""
     
@@ -16,17 +57,21 @@ class MultiApp:
         """Initialize the MultiApp framework"""
         self.apps: List[Dict[str, str | Callable]] = []
     
-    def add_app(self, title: str, func: Callable) -> None:
+    def add_app(self, title: str, func: Union[Callable, str]) -> None:
         """
         Add a new application page
         
         Args:
             title (str): Title of the app page
-            func (Callable): The Python function to render this app
+            func (Callable | str): The Python function to render this app, or a dotted path
+                ("apps.home" or "apps.home:app") imported the first time the page is selected
         """
         if not title or not isinstance(title, str):
             raise ValueError("Title must be a non-empty string")
         
+        if isinstance(func, str):
+            func = LazyPage(func)
+        
         if not callable(func):
             raise ValueError(f"Function for '{title}' must be callable")
         
@@ -54,11 +99,18 @@ class MultiApp:
         
         selected_app = st.sidebar.selectbox("Navigate to", self.apps, format_func=lambda app: app['title'], help="Select a page to view")
         
+        # st.stop() and st.rerun() raise BaseExceptions, so the panel and export run in finally
+        trace = None
         try:
-            selected_app['function']()
+            with trace_rerun(selected_app['title']) as trace:
+                selected_app['function']()
         except Exception as e:
             logger.error(f"Error running app '{selected_app['title']}': {str(e)}")
             st.error(f"❌ An error occurred: {str(e)}")
+        finally:
+            if DEV_PANEL:
+                render_dev_panel(trace)
+            export_metrics()
         
         st.sidebar.markdown("---")
         st.sidebar.markdown("📊 **Stock Market Dashboard** v2.0  \nBuilt with Streamlit & Prophet")
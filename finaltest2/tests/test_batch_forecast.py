@@ -0,0 +1,64 @@
+import json
+import pandas as pd
+import numpy as np
+import pytest
+from functools import partial
+from unittest.mock import patch
+
+from finaltest2.apps.datastore import PriceStore
+from finaltest2.apps.batch_forecast import precompute_forecast, load_precomputed_forecast, artifact_paths
+from finaltest2.apps.model_cache import ProphetModelCache
+from finaltest2.apps.prediction import load_precomputed_forecast_with_model, plot_forecast_components
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    rng = np.random.default_rng(4)
+    dates = pd.bdate_range('2015-01-02', periods=150, name='Date')
+    close = 100 + np.cumsum(rng.normal(0, 1, len(dates)))
+    PriceStore(root=str(tmp_path)).write("GOOG", pd.DataFrame({'Close': close}, index=dates),
+                                         covered_from="2015-01-01")
+    return str(tmp_path)
+
+
+def test_artifact_serves_every_shorter_horizon(data_dir):
+    precompute_forecast("GOOG", True, False, 90, "2030-01-01", data_dir)
+    trained_through = pd.bdate_range('2015-01-02', periods=150)[-1].strftime("%Y-%m-%d")
+
+    for periods in (30, 90):
+        forecast = load_precomputed_forecast("GOOG", periods, trained_through, True, False, data_dir)
+        assert len(forecast) == 150 + periods
+        assert forecast['yhat'].dtype == np.float64
+
+    assert load_precomputed_forecast("GOOG", 120, trained_through, True, False, data_dir) is None
+
+
+def test_stale_or_missing_artifacts_are_not_served(data_dir):
+    precompute_forecast("GOOG", True, True, 30, "2030-01-01", data_dir)
+    trained_through = pd.bdate_range('2015-01-02', periods=150)[-1].strftime("%Y-%m-%d")
+
+    assert load_precomputed_forecast("GOOG", 30, "2099-01-01", True, True, data_dir) is None
+    assert load_precomputed_forecast("GOOG", 30, trained_through, False, True, data_dir) is None
+
+    _, meta_path = artifact_paths("GOOG", True, True, data_dir)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta["created_at"] = "2000-01-01T00:00:00"
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    assert load_precomputed_forecast("GOOG", 30, trained_through, True, True, data_dir) is None
+
+
+def test_artifact_is_served_without_a_loaded_model(data_dir):
+    precompute_forecast("GOOG", True, True, 30, "2030-01-01", data_dir)
+    data = PriceStore(root=data_dir).read("GOOG").reset_index()
+
+    # A fresh process: the model is only on disk, and loading Prophet is not allowed
+    with patch('finaltest2.apps.prediction.load_precomputed_forecast', partial(load_precomputed_forecast, data_dir=data_dir)), \
+            patch('finaltest2.apps.prediction.get_model_cache', return_value=ProphetModelCache(root=data_dir)), \
+            patch('finaltest2.apps.model_cache.load_prophet', side_effect=AssertionError("Prophet imported")):
+        model, forecast = load_precomputed_forecast_with_model("GOOG", data, 30, True, True)
+
+    assert model is None and len(forecast) == len(data) + 30
+    components = plot_forecast_components(forecast)
+    assert [trace.name for trace in components.data] == ['trend', 'yearly', 'weekly']
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from finaltest2.apps.compact import CompactFrame, frame_nbytes
+from finaltest2.apps.datastore import HistoryCache, PriceStore
+from finaltest2.tests.test_datastore import fake_download
+
+
+def make_frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2020-01-01', periods=n),
+        'Open': close * 1.001, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(1, 50_000, n) * 100,
+        'Hist-Color': np.where(rng.random(n) < 0.5, 'red', 'green'),
+    })
+
+
+def test_round_trip_rounds_prices_and_keeps_everything_else_exact():
+    frame = make_frame()
+    packed = CompactFrame.from_frame(frame)
+    restored = packed.to_frame()
+
+    assert packed.columns['Close'].values.dtype == np.float32
+    pd.testing.assert_series_equal(restored['Close'], frame['Close'].round(4))
+    pd.testing.assert_series_equal(restored['Volume'], frame['Volume'])
+    pd.testing.assert_series_equal(restored['Date'], frame['Date'])
+    assert (restored['Hist-Color'] == frame['Hist-Color']).all()
+    assert packed.nbytes < frame_nbytes(frame) / 3
+
+
+def test_volumes_are_scaled_and_widened_only_when_needed():
+    frame = make_frame()
+    column = CompactFrame.from_frame(frame).columns['Volume']
+    assert (column.scale, column.values.dtype) == (100, np.int32)
+
+    frame['Volume'] = frame['Volume'] * 10 ** 6 + 1
+    column = CompactFrame.from_frame(frame).columns['Volume']
+    assert (column.scale, column.values.dtype) == (1, np.int64)
+    pd.testing.assert_series_equal(CompactFrame.from_frame(frame).to_frame()['Volume'], frame['Volume'])
+
+
+def test_large_prices_keep_cents_or_fall_back_to_float64():
+    frame = make_frame()
+    frame['Close'] = 123456.789 + np.arange(len(frame)) * 0.01
+    column = CompactFrame.from_frame(frame).columns['Close']
+    assert (column.values.dtype, column.decimals) == (np.float32, 2)
+    np.testing.assert_array_equal(column.expand(), frame['Close'].round(2).to_numpy())
+
+    frame['Close'] = 12345678.91 + np.arange(len(frame))
+    column = CompactFrame.from_frame(frame).columns['Close']
+    assert column.values.dtype == np.float64
+    np.testing.assert_array_equal(column.expand(), frame['Close'].to_numpy())
+
+
+def test_intraday_dates_and_searchsorted():
+    daily = CompactFrame.from_frame(make_frame(10))
+    assert daily.date_unit == 'D'
+    assert daily.searchsorted(pd.Timestamp('2020-01-02')) == 1
+    assert daily.searchsorted(pd.Timestamp('2020-01-02 09:30')) == 2
+
+    frame = make_frame(10)
+    frame['Date'] = pd.date_range('2024-01-02 09:30', periods=10, freq='5min')
+    intraday = CompactFrame.from_frame(frame)
+    assert intraday.date_unit == 'ns'
+    assert intraday.searchsorted(pd.Timestamp('2024-01-02 09:40')) == 2
+    pd.testing.assert_series_equal(intraday.slice(2, 4).to_frame()['Date'], frame['Date'].iloc[2:4].reset_index(drop=True))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(root=str(tmp_path), history_start="2024-01-01")
+
+
+def test_compact_history_cache_matches_regular_ranges(store):
+    regular, compact = HistoryCache(store), HistoryCache(store, compact=True)
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download):
+        expected = regular.get_range("GOOG", "2024-01-10", "2024-02-01")
+        actual = compact.get_range("GOOG", "2024-01-10", "2024-02-01")
+
+    pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True), check_dtype=False)
+    assert len(compact.get_history("GOOG")) == len(regular.get_history("GOOG"))
+
+    report = compact.memory_report()
+    assert report['ticker'].tolist() == ['GOOG']
+    assert bool(report['compact'].iloc[0])
+    assert report['bytes'].iloc[0] < report['expanded_bytes'].iloc[0]
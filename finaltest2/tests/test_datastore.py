@@ -0,0 +1,195 @@
+import json
+import pandas as pd
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from finaltest2.apps.datastore import PriceStore
+
+
+def make_bars(start, end):
+    """Build a fake yf.download frame with business-day bars in [start, end)."""
+    index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name='Date')
+    close = np.linspace(100, 200, len(index))
+    return pd.DataFrame({
+        'Open': close - 1, 'High': close + 2, 'Low': close - 2,
+        'Close': close, 'Adj Close': close, 'Volume': np.full(len(index), 1000),
+    }, index=index)
+
+
+def fake_download(ticker, start=None, end=None, progress=False, **kwargs):
+    return make_bars(start, end or "2024-03-01")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(root=str(tmp_path), history_start="2024-01-01")
+
+
+def test_first_load_fetches_full_history_and_persists(store):
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download) as mock_download:
+        data = store.get_range("^GSPC", "2024-01-01", "2024-03-01")
+
+    mock_download.assert_called_once()
+    assert data['Date'].iloc[0] == pd.Timestamp("2024-01-01")
+    assert store.read("^GSPC") is not None
+    assert store.read_meta("^GSPC")["covered_from"] == "2024-01-01"
+
+
+def test_range_changes_are_served_locally(store):
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download) as mock_download:
+        store.get_range("MSFT", "2024-01-01", "2024-03-01")
+        narrow = store.get_range("MSFT", "2024-02-01", "2024-02-15")
+
+    assert mock_download.call_count == 1
+    assert narrow['Date'].min() >= pd.Timestamp("2024-02-01")
+    assert narrow['Date'].max() < pd.Timestamp("2024-02-15")
+
+
+def test_stale_store_fetches_only_the_tail(store):
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download):
+        store.get_range("AAPL", "2024-01-01", "2024-03-01")
+
+    store.refresh_interval = timedelta(0)
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download) as mock_download:
+        store.update("AAPL")
+
+    assert mock_download.call_count == 1
+    assert mock_download.call_args.kwargs['start'] == "2024-02-29"
+
+
+def test_backfill_does_not_hide_a_stale_tail(store):
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download):
+        store.update("NVDA")
+
+    # Age the stored tail past the refresh interval
+    meta_path = store._meta_path("NVDA")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta["fetched_at"] = (datetime.now() - store.refresh_interval * 2).isoformat(timespec="seconds")
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download) as mock_download:
+        data = store.update("NVDA", start="2023-12-01")
+
+    assert mock_download.call_count == 2
+    assert [call.kwargs['start'] for call in mock_download.call_args_list] == ["2023-12-01", "2024-02-29"]
+    assert data.index.min() == pd.Timestamp("2023-12-01")
+
+
+def test_refresh_failure_serves_stored_history(store):
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download):
+        stored = store.update("TSLA")
+
+    store.refresh_interval = timedelta(0)
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=ConnectionError("offline")):
+        served = store.update("TSLA")
+
+    assert len(served) == len(stored)
+
+
+def test_unknown_ticker_raises(store):
+    with patch('finaltest2.apps.datastore.yf.download', return_value=pd.DataFrame()):
+        with pytest.raises(ValueError):
+            store.update("NOPE")
+
+
+def fake_batch_download(tickers, start=None, end=None, group_by='column', **kwargs):
+    frames = {ticker: make_bars(start, "2024-03-01") for ticker in tickers}
+    return pd.concat(frames, axis=1)
+
+
+def test_update_many_uses_one_batched_request(store):
+    tickers = ["GOOG", "MSFT", "AAPL"]
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_batch_download) as mock_download:
+        histories = store.update_many(tickers)
+
+    mock_download.assert_called_once()
+    assert mock_download.call_args.args[0] == tickers
+    assert set(histories) == set(tickers)
+    for ticker in tickers:
+        assert len(store.read(ticker)) == len(histories[ticker])
+
+
+def test_update_many_skips_fresh_tickers(store):
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_batch_download):
+        store.update_many(["GOOG"])
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_batch_download) as mock_download:
+        store.update_many(["GOOG", "TSLA"])
+
+    assert mock_download.call_args.args[0] == ["TSLA"]
+
+
+def test_history_cache_serves_sub_ranges_from_memory(store):
+    from finaltest2.apps.datastore import HistoryCache
+
+    cache = HistoryCache(store)
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download):
+        full = cache.get_range("GOOG", "2024-01-01", "2024-03-01")
+
+    with patch.object(store, 'update') as mock_update:
+        first = cache.get_range("GOOG", "2024-01-10", "2024-02-01")
+        second = cache.get_range("GOOG", "2024-01-10", "2024-02-02")
+
+    mock_update.assert_not_called()
+    assert len(second) == len(first) + 1
+    assert np.shares_memory(first['Close'].to_numpy(), full['Close'].to_numpy())
+
+
+def test_history_cache_slices_are_safe_to_extend(store):
+    from finaltest2.apps.datastore import HistoryCache
+
+    cache = HistoryCache(store)
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download):
+        data = cache.get_range("GOOG", "2024-01-01", "2024-03-01")
+    data['RSI'] = 50.0
+
+    assert 'RSI' not in cache.get_range("GOOG", "2024-01-01", "2024-03-01").columns
+
+
+def fake_intraday_download(ticker, start=None, end=None, interval='1d', **kwargs):
+    """Five-minute bars for the last three sessions before today, as yfinance returns them (tz-aware)"""
+    sessions = pd.bdate_range(end=pd.Timestamp.now().normalize() - pd.Timedelta(days=1), periods=3)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{day:%Y-%m-%d} 09:30", periods=78, freq='5min').to_numpy() for day in sessions
+    ]), name='Datetime').tz_localize('America/New_York')
+    close = np.linspace(100, 110, len(index))
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1,
+        'Close': close, 'Adj Close': close, 'Volume': np.full(len(index), 500),
+    }, index=index)
+
+
+def test_intraday_bars_get_their_own_partition(store, tmp_path):
+    store.history_start = "2015-01-01"
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_intraday_download) as mock_download:
+        history = store.update("MSFT", interval='5m')
+
+    assert mock_download.call_args.kwargs['interval'] == '5m'
+    assert mock_download.call_args.kwargs['start'] == store.earliest_start('5m') > "2015-01-01"
+    assert (tmp_path / "prices" / "5m" / "MSFT.parquet").exists()
+    assert store.read("MSFT") is None
+    assert history.index.tz is None and history.index[0].strftime("%H:%M") == "09:30"
+    with pytest.raises(ValueError):
+        store.partition_path("MSFT", '15m')
+
+
+def test_history_cache_resamples_derived_intervals_once(store):
+    from finaltest2.apps.datastore import HistoryCache
+
+    store.history_start = "2015-01-01"
+    cache = HistoryCache(store)
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_intraday_download) as mock_download:
+        five = cache.get_range("MSFT", "2015-01-01", "2100-01-01", interval='5m')
+        hourly = cache.get_range("MSFT", "2015-01-01", "2100-01-01", interval='30m')
+
+    mock_download.assert_called_once()
+    assert len(hourly) == len(five) // 6
+    assert hourly['Volume'].sum() == five['Volume'].sum()
+    report = cache.memory_report().set_index('interval')
+    assert report.loc['5m', 'compact'] and report.loc['30m', 'compact']
+
+    with patch('finaltest2.apps.datastore.resample_bars') as mock_resample:
+        cache.get_range("MSFT", "2015-01-01", "2100-01-01", interval='30m')
+    mock_resample.assert_not_called()
@@ -0,0 +1,68 @@
+import pandas as pd
+import numpy as np
+
+from finaltest2.apps.downsample import lttb, lttb_indices, resample_ohlcv, downsample_ohlcv
+
+
+def make_bars(n):
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2015-01-01', periods=n),
+        'Open': open_,
+        'High': np.maximum(open_, close) + 1,
+        'Low': np.minimum(open_, close) - 1,
+        'Close': close,
+        'Volume': rng.integers(1, 1000, n),
+    })
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[437] = 5.0
+
+    keep = lttb_indices(x, y, 100)
+
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 437 in keep
+
+
+def test_lttb_drops_missing_values_and_respects_budget():
+    dates = pd.bdate_range('2015-01-01', periods=500).to_numpy()
+    y = np.linspace(0, 1, 500)
+    y[:20] = np.nan
+
+    x_out, y_out = lttb(dates, y, None)
+    assert len(y_out) == 480 and x_out[0] == dates[20]
+
+    x_out, y_out = lttb(dates, y, 50)
+    assert len(y_out) == 50 and x_out.dtype == dates.dtype
+
+
+def test_weekly_candles_aggregate_ohlcv():
+    bars = make_bars(60)
+    weekly = resample_ohlcv(bars, 'W')
+
+    first_week = bars[bars['Date'] < weekly['Date'].iloc[1]]
+    row = weekly.iloc[0]
+    assert row['Open'] == first_week['Open'].iloc[0]
+    assert row['Close'] == first_week['Close'].iloc[-1]
+    assert row['High'] == first_week['High'].max()
+    assert row['Low'] == first_week['Low'].min()
+    assert row['Volume'] == first_week['Volume'].sum()
+    assert weekly['Volume'].sum() == bars['Volume'].sum()
+
+
+def test_downsample_ohlcv_picks_finest_frequency_within_budget():
+    bars = make_bars(2500)
+
+    assert downsample_ohlcv(bars, None)[1] == 'Daily'
+    assert downsample_ohlcv(bars, 3000)[1] == 'Daily'
+    candles, frequency = downsample_ohlcv(bars, 800)
+    assert frequency == 'Weekly' and len(candles) <= 800
+    candles, frequency = downsample_ohlcv(bars, 200)
+    assert frequency == 'Monthly' and len(candles) <= 200
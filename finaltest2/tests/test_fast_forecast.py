@@ -0,0 +1,35 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from finaltest2.apps.fast_forecast import FAST_ENGINES, linear_fourier_forecast
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2018-01-01', periods=600)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, len(dates))))
+    return pd.DataFrame({'Date': dates, 'Close': close})
+
+
+@pytest.mark.parametrize('engine', list(FAST_ENGINES))
+def test_engines_return_prophet_shaped_forecasts(engine, data):
+    forecast = FAST_ENGINES[engine](data, 90, True, True)
+
+    assert list(forecast.columns) == ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+    assert len(forecast) == len(data) + 90
+    assert forecast['ds'].iloc[len(data)] == data['Date'].iloc[-1] + pd.Timedelta(days=1)
+    assert not forecast.isna().any().any()
+    assert (forecast['yhat_lower'] <= forecast['yhat']).all()
+    assert (forecast['yhat'] <= forecast['yhat_upper']).all()
+
+
+def test_linear_fourier_recovers_a_linear_trend():
+    dates = pd.date_range('2020-01-01', periods=400, freq='D')
+    days = np.arange(400, dtype=float)
+    data = pd.DataFrame({'Date': dates, 'Close': 50 + 0.25 * days})
+
+    forecast = linear_fourier_forecast(data, 30, yearly_seasonality=False, weekly_seasonality=False)
+
+    np.testing.assert_allclose(forecast['yhat'].to_numpy(), 50 + 0.25 * np.arange(430), atol=1e-6)
@@ -0,0 +1,62 @@
+import json
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from finaltest2.apps.figure_cache import FigureCache, data_version, figure_to_spec
+from finaltest2.apps.financeDashboard import plot_rsi_subplot
+from finaltest2.apps.indicators import compute_indicators
+
+
+def test_figures_are_built_once_per_key():
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {'line': go.Figure(go.Scatter(x=np.arange(3), y=np.array([1.0, 2.0, 3.0])))}
+
+    first = cache.get_or_build(('GOOG', 1), build)
+    second = cache.get_or_build(('GOOG', 1), build)
+
+    assert len(builds) == 1 and first is second
+    assert json.loads(figure_to_spec(first['line']))['data'][0]['y'] == [1.0, 2.0, 3.0]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get_or_build(('MSFT', 1), build)
+    cache.get_or_build(('AAPL', 1), build)
+    cache.get_or_build(('GOOG', 1), build)
+    assert len(builds) == 4
+
+
+def test_data_version_tracks_new_and_revised_bars():
+    data = pd.DataFrame({'Date': pd.bdate_range('2024-01-01', periods=3), 'Close': [1.0, 2.0, 3.0]})
+    revised = data.assign(Close=[1.0, 2.0, 3.5])
+    extended = pd.concat([data, pd.DataFrame({'Date': [pd.Timestamp('2024-01-04')], 'Close': [3.0]})])
+
+    assert data_version(data) == data_version(data.copy())
+    assert data_version(revised) != data_version(data)
+    assert data_version(extended) != data_version(data)
+    assert data_version(data.iloc[:0]) == (0, None, None)
+
+
+def test_rsi_axis_falls_back_when_the_range_is_too_short():
+    data = pd.DataFrame({'Date': pd.date_range('2024-01-01', periods=20, freq='W-MON'),
+                         'Close': np.linspace(100, 120, 20)})
+    data = pd.concat([data, compute_indicators(data)], axis=1)
+
+    fig = plot_rsi_subplot(data)
+
+    assert list(fig.layout.yaxis.range) == [25, 75]
+
+
+
+def test_spec_matches_what_st_plotly_chart_sends():
+    from streamlit.elements.plotly_chart import marshall
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart
+
+    fig = go.Figure(go.Scatter(x=pd.bdate_range('2024-01-01', periods=3), y=np.array([1.0, 2.0, 3.0])))
+    proto = PlotlyChart()
+    marshall(proto, fig, True, "streamlit", False)
+
+    assert json.loads(figure_to_spec(fig)) == json.loads(proto.figure.spec)
@@ -0,0 +1,55 @@
+import time
+import pandas as pd
+import numpy as np
+import pytest
+
+from finaltest2.apps.forecast_jobs import ForecastJobQueue
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(2)
+    dates = pd.bdate_range('2022-01-03', periods=120)
+    return pd.DataFrame({'Date': dates, 'Close': 100 + np.cumsum(rng.normal(0, 1, len(dates)))})
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = ForecastJobQueue(max_workers=1, data_dir=str(tmp_path))
+    yield queue
+    queue.shutdown()
+
+
+def wait_for(queue, job_id, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = queue.status(job_id)
+        if status.state in ('done', 'failed'):
+            return status
+        time.sleep(0.2)
+    raise TimeoutError(job_id)
+
+
+def test_job_runs_in_worker_and_returns_model_and_forecast(queue, history):
+    job_id = queue.submit("GOOG", history, periods=15)
+    status = wait_for(queue, job_id)
+
+    assert status.state == 'done', status.error
+    model, forecast = queue.result(job_id)
+    assert model is not None
+    assert len(forecast) == len(history) + 15
+    assert {'ds', 'yhat', 'yhat_lower', 'yhat_upper'} <= set(forecast.columns)
+
+
+def test_identical_requests_share_one_job(queue, history):
+    first = queue.submit("GOOG", history, periods=30)
+    second = queue.submit("GOOG", history.copy(), periods=30)
+    other = queue.submit("GOOG", history, periods=30, weekly_seasonality=False)
+
+    assert first == second
+    assert other != first
+    assert queue.status(first).state in ('queued', 'running', 'done')
+
+
+def test_unknown_job_status(queue):
+    assert queue.status("missing").state == 'unknown'
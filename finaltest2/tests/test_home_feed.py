@@ -0,0 +1,118 @@
+import time
+import threading
+import pandas as pd
+from unittest.mock import patch
+
+from finaltest2.apps.home_feed import HomeFeed
+from finaltest2.apps.home import get_latest_news, parse_news_headlines, parse_trend_table, parse_yahoo_finance
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        if self.text == 'error':
+            raise RuntimeError('upstream down')
+
+
+class FakeSession:
+    """Session stand-in returning canned pages after a delay"""
+
+    def __init__(self, pages, delay=0.2):
+        self.pages = pages
+        self.delay = delay
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append(url)
+        self.gate.wait()
+        time.sleep(self.delay)
+        return FakeResponse(self.pages[url])
+
+
+def parse_text(text):
+    return pd.DataFrame({'value': [text]}) if text else None
+
+
+def make_feed(pages, **kwargs):
+    sources = {name: (name, parse_text) for name in pages}
+    return HomeFeed(sources, session=FakeSession(pages, **kwargs))
+
+
+def test_all_sources_are_fetched_concurrently():
+    feed = make_feed({'a': 'A', 'b': 'B', 'c': 'C', 'd': 'D'}, delay=0.3)
+
+    start = time.perf_counter()
+    feed.refresh()
+    assert feed.wait(timeout=5)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.9
+    assert feed.snapshot('c').value['value'].iloc[0] == 'C'
+
+
+def test_stale_values_are_served_while_revalidating():
+    feed = make_feed({'a': 'old'}, delay=0.0)
+    feed.refresh()
+    feed.wait(timeout=5)
+
+    feed.ttl = 0
+    feed.session.pages['a'] = 'new'
+    feed.session.gate.clear()
+    assert feed.snapshot('a').value['value'].iloc[0] == 'old'
+    assert len(feed.refresh()) == 1
+
+    feed.session.gate.set()
+    feed.wait(timeout=5)
+    assert feed.snapshot('a').value['value'].iloc[0] == 'new'
+
+
+def test_failed_or_empty_refreshes_keep_the_last_value():
+    feed = make_feed({'a': 'first'}, delay=0.0)
+    feed.refresh()
+    feed.wait(timeout=5)
+
+    feed.session.pages['a'] = 'error'
+    feed.refresh(force=True)
+    feed.wait(timeout=5)
+    snapshot = feed.snapshot('a')
+    assert snapshot.value['value'].iloc[0] == 'first'
+    assert snapshot.error == 'upstream down'
+    assert feed.refresh() == []
+
+    feed.session.pages['a'] = ''
+    feed.refresh(force=True)
+    feed.wait(timeout=5)
+    assert feed.snapshot('a').error == 'No data found'
+
+
+def test_page_parsers():
+    table = "<table><tr><th>Symbol</th><th>52 Wk Range</th></tr><tr><td>GOOG</td><td>1-2</td></tr></table>"
+    stocks = parse_trend_table(table)
+    assert list(stocks.columns) == ['Symbol']
+    assert parse_trend_table("<p>no tables</p>") is None
+
+    news = parse_news_headlines("<article><h3>Markets rally</h3></article><article><p>x</p></article>")
+    assert news['Headlines'].tolist() == ['Markets rally']
+    assert parse_news_headlines("<p></p>") is None
+
+
+def test_url_wrappers_fetch_through_the_shared_client():
+    pages = {
+        'https://finance.yahoo.com/gainers': "<table><tr><th>Symbol</th></tr><tr><td>GOOG</td></tr></table>",
+        'https://news.google.com/finance': "<article><h3>Markets rally</h3></article>",
+        'https://down.example': 'error',
+    }
+    session = FakeSession(pages, delay=0)
+    with patch('finaltest2.apps.home.get_http_client', return_value=session):
+        stocks = parse_yahoo_finance('https://finance.yahoo.com/gainers')
+        news = get_latest_news('https://news.google.com/finance')
+        failed = get_latest_news('https://down.example')
+
+    assert stocks['Symbol'].tolist() == ['GOOG']
+    assert news['Headlines'].tolist() == ['Markets rally']
+    assert failed is None
+    assert session.calls == list(pages)
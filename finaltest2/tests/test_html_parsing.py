@@ -0,0 +1,69 @@
+import pandas as pd
+
+from finaltest2.apps import html_parsing
+from finaltest2.apps.html_parsing import first_table, article_headlines
+
+
+def table_page(n_rows, trailer=""):
+    rows = "".join(f"<tr><td><a>T{i}</a></td><td>{i * 1000:,}</td><td>{i}.5</td></tr>" for i in range(n_rows))
+    return (f"<html><body><table><thead><tr><th>Symbol</th><th><span>Volume</span></th><th>Price</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>{trailer}</body></html>")
+
+
+def test_first_table_matches_read_html():
+    html = table_page(20)
+    expected = pd.read_html(html)[0].head(5)
+    pd.testing.assert_frame_equal(first_table(html), expected)
+
+
+def test_first_table_stops_after_requested_rows(monkeypatch):
+    monkeypatch.setattr(html_parsing, 'FEED_CHUNK_SIZE', 256)
+    fed = []
+    original = html_parsing.etree.HTMLParser
+
+    class CountingParser:
+        def __init__(self, **kwargs):
+            self.parser = original(**kwargs)
+
+        def feed(self, chunk):
+            fed.append(len(chunk))
+            self.parser.feed(chunk)
+
+        def close(self):
+            return self.parser.close()
+
+    monkeypatch.setattr(html_parsing.etree, 'HTMLParser', CountingParser)
+    html = table_page(3, trailer="<div>" + "filler " * 20000 + "</div>")
+    frame = first_table(html, max_rows=2)
+    assert list(frame['Symbol']) == ['T0', 'T1']
+    assert sum(fed) < len(html) / 10
+
+
+def test_first_table_without_header_or_table():
+    frame = first_table("<table><tr><td>a</td><td>1</td></tr><tr><td>b</td></tr></table>")
+    assert list(frame.columns) == [0, 1]
+    assert frame[0].tolist() == ['a', 'b']
+    assert frame[1].iloc[0] == 1 and pd.isna(frame[1].iloc[1])
+    assert first_table("<p>no tables</p>") is None
+
+
+def test_only_the_first_table_is_read():
+    html = table_page(1) + "<table><tr><td>other</td></tr></table>"
+    assert first_table(html, max_rows=5)['Symbol'].tolist() == ['T0']
+
+
+def test_nested_tables_do_not_leak_into_the_outer_one():
+    html = "<table><tr><th>A</th></tr><tr><td>x<table><tr><td>inner</td></tr></table></td></tr></table>"
+    assert first_table(html).iloc[0, 0] == 'xinner'
+
+
+def test_article_headlines_are_distinct_and_in_page_order():
+    html = ("<h3>Outside</h3>"
+            "<article><h3><a>Second  story</a></h3></article>"
+            "<article><div><h3>First story</h3></div></article>"
+            "<article><h3>Second story</h3></article>"
+            "<article><p>no headline</p></article>"
+            "<article><h3>Third</h3></article>")
+    assert article_headlines(html) == ['Second story', 'First story', 'Third']
+    assert article_headlines(html, max_headlines=2) == ['Second story', 'First story']
+    assert article_headlines("<p></p>") == []
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from finaltest2.apps.http_client import HttpClient, CircuitBreaker, CircuitOpenError, create_session
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local upstream with flaky, rate-limited, cacheable and failing endpoints"""
+    hits = Counter()
+    active = Counter()
+    peak = Counter()
+    guard = threading.Lock()
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        with self.guard:
+            self.hits[path] += 1
+            hits = self.hits[path]
+            self.active[path] += 1
+            self.peak[path] = max(self.peak[path], self.active[path])
+        try:
+            if path == '/flaky' and hits <= 2:
+                self.reply(503)
+            elif path == '/limited' and hits == 1:
+                self.reply(429, headers={'Retry-After': '0'})
+            elif path == '/etag':
+                if self.headers.get('If-None-Match') == '"v1"':
+                    self.reply(304)
+                else:
+                    self.reply(200, b'cached body', headers={'ETag': '"v1"'})
+            elif path == '/down':
+                self.reply(500)
+            elif path == '/slow':
+                time.sleep(0.1)
+                self.reply(200, b'slow')
+            else:
+                self.reply(200, path.encode())
+        finally:
+            with self.guard:
+                self.active[path] -= 1
+
+    def reply(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StubHandler.hits.clear()
+    StubHandler.peak.clear()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def make_client(**kwargs):
+    return HttpClient(session=create_session(backoff_factor=0.01, **kwargs))
+
+
+def test_retries_5xx_and_429_with_retry_after(server):
+    client = make_client()
+
+    assert client.get(f"{server}/flaky").text == '/flaky'
+    assert StubHandler.hits['/flaky'] == 3
+
+    assert client.get(f"{server}/limited").status_code == 200
+    assert StubHandler.hits['/limited'] == 2
+
+
+def test_conditional_get_reuses_body_on_304(server):
+    client = make_client()
+
+    first = client.get(f"{server}/etag")
+    second = client.get(f"{server}/etag")
+
+    assert StubHandler.hits['/etag'] == 2
+    assert second is first and second.text == 'cached body'
+
+
+def test_circuit_opens_after_repeated_failures(server):
+    client = make_client(retries=0, breaker=CircuitBreaker(threshold=2, reset_timeout=60))
+
+    assert client.get(f"{server}/down").status_code == 500
+    assert client.get(f"{server}/down").status_code == 500
+    with pytest.raises(CircuitOpenError):
+        client.get(f"{server}/ok")
+    assert StubHandler.hits['/down'] == 2 and StubHandler.hits['/ok'] == 0
+
+
+def test_half_open_probe_closes_circuit():
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+    breaker.record_failure('h')
+    assert breaker.allow('h')
+    assert not breaker.allow('h')
+    breaker.record_success('h')
+    assert breaker.allow('h') and not breaker.is_open('h')
+
+
+def test_concurrency_per_host_is_capped(server):
+    client = make_client(max_per_host=2)
+    threads = [threading.Thread(target=client.get, args=(f"{server}/slow",), kwargs={'conditional': False})
+               for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert StubHandler.hits['/slow'] == 6
+    assert StubHandler.peak['/slow'] <= 2
@@ -0,0 +1,51 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+from finaltest2.apps.financeDashboard import calculate_macd, calculate_rsi
+from finaltest2.apps.utils import calculate_moving_averages
+from finaltest2.apps.indicators import (
+    compute_indicators, compute_indicator_arrays, ema, macd, rsi, DEFAULT_INDICATORS
+)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 600))
+    return pd.DataFrame({'Date': pd.bdate_range('2020-01-01', periods=600), 'Close': close})
+
+
+def test_engine_matches_reference_functions(prices):
+    reference = calculate_moving_averages(calculate_rsi(calculate_macd(prices.copy())))
+    result = compute_indicators(prices, DEFAULT_INDICATORS)
+
+    for column in ['MACD', 'Signal', 'Histogram', 'RSI', 'EMA_20', 'EMA_50', 'EMA_200']:
+        np.testing.assert_allclose(result[column], reference[column], rtol=1e-9, atol=1e-9)
+
+
+def test_engine_does_not_modify_input(prices):
+    before = prices.columns.tolist()
+    result = compute_indicators(prices, [macd(), rsi()])
+
+    assert prices.columns.tolist() == before
+    assert result.columns.tolist() == ['MACD', 'Signal', 'Histogram', 'RSI']
+    assert result.index.equals(prices.index)
+
+
+def test_engine_handles_date_by_ticker_matrix(prices):
+    matrix = np.column_stack([prices['Close'], prices['Close'] * 2])
+    result = compute_indicator_arrays(matrix, [ema(20), rsi(7)])
+    single = compute_indicator_arrays(prices['Close'].to_numpy(), [ema(20), rsi(7)])
+
+    assert result['EMA_20'].shape == matrix.shape
+    np.testing.assert_allclose(result['EMA_20'][:, 0], single['EMA_20'])
+    np.testing.assert_allclose(result['RSI_7'][:, 1], single['RSI_7'], equal_nan=True)
+
+
+def test_rsi_constant_prices_matches_reference():
+    df = pd.DataFrame({'Close': np.full(30, 50.0)})
+    reference = calculate_rsi(df.copy())
+    result = compute_indicators(df, [rsi()])
+
+    np.testing.assert_array_equal(np.isnan(result['RSI']), np.isnan(reference['RSI']))
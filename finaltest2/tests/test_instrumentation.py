@@ -0,0 +1,185 @@
+import json
+import socket
+import time
+import urllib.request
+from functools import lru_cache
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from finaltest2.apps import instrumentation
+from finaltest2.apps.instrumentation import Metrics, counted_cache, span, start_metrics_server, trace_rerun
+from finaltest2.multiapp import MultiApp
+
+
+def test_nested_spans_count_their_own_time_once():
+    metrics = Metrics()
+    with trace_rerun('Page', metrics) as trace:
+        with span('load', 'load', metrics):
+            time.sleep(0.02)
+            with span('download', 'load', metrics):
+                time.sleep(0.03)
+        with span('figures', 'figure', metrics):
+            time.sleep(0.01)
+
+    names = [record.name for record in trace.spans]
+    assert names == ['download', 'load', 'figures']
+    download, load, figures = trace.spans
+    assert (download.depth, load.depth, figures.depth) == (1, 0, 0)
+    assert load.duration >= download.duration + 0.02
+    assert load.self_time == pytest.approx(load.duration - download.duration)
+
+    breakdown = trace.breakdown().set_index('Stage')
+    assert list(breakdown.index) == ['load', 'compute', 'figure', 'emit', 'other']
+    assert breakdown.loc['load', 'ms'] == pytest.approx(load.duration * 1000)
+    assert breakdown['ms'].sum() == pytest.approx(trace.duration * 1000)
+
+    spans = {(entry['name'], entry['stage']): entry for entry in metrics.snapshot()['spans']}
+    assert set(spans) == {('download', 'load'), ('load', 'load'), ('figures', 'figure'), ('Page', 'page')}
+    assert spans[('load', 'load')]['count'] == 1
+
+
+def test_spans_outside_a_rerun_only_feed_the_histograms():
+    metrics = Metrics()
+    with span('worker', 'compute', metrics):
+        pass
+    assert instrumentation.current_trace() is None
+    assert metrics.snapshot()['spans'][0]['count'] == 1
+
+
+def test_untraced_blocks_are_left_out_of_the_rerun():
+    metrics = Metrics()
+    with trace_rerun('Live', metrics) as trace:
+        with span('charts', 'emit', metrics):
+            pass
+        with instrumentation.untraced():
+            assert instrumentation.current_trace() is None
+            with span('live.refresh', 'emit', metrics):
+                time.sleep(0.2)
+        with span('after', 'emit', metrics):
+            pass
+
+    assert instrumentation.current_trace() is None
+    assert [record.name for record in trace.spans] == ['charts', 'after']
+    assert trace.duration < 0.1 and trace.spans[-1].start < 0.1
+    spans = {entry['name']: entry for entry in metrics.snapshot()['spans']}
+    assert spans['live.refresh']['count'] == 1
+
+
+def test_rerun_is_recorded_when_the_page_stops_early():
+    class StopPage(BaseException):
+        pass
+
+    metrics = Metrics()
+    with pytest.raises(StopPage):
+        with trace_rerun('Stopped', metrics) as trace:
+            raise StopPage()
+    assert trace.duration is not None
+    assert instrumentation.current_trace() is None
+    assert metrics.snapshot()['spans'][0]['name'] == 'Stopped'
+
+
+def test_counted_cache_counts_hits_and_misses():
+    metrics = Metrics()
+    calls = []
+
+    with patch.object(instrumentation, 'get_metrics', return_value=metrics):
+        @counted_cache('squares', lru_cache(maxsize=None))
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        assert [square(2), square(2), square(3)] == [4, 4, 9]
+
+    assert calls == [2, 3]
+    assert metrics.snapshot()['caches'] == {'squares': {'hits': 1, 'misses': 2}}
+    assert square.__name__ == 'square' and square.clear is not None
+
+
+def test_prometheus_and_json_exports(tmp_path):
+    metrics = Metrics()
+    metrics.observe('dashboard.load_prices', 'load', 0.003)
+    metrics.observe('dashboard.load_prices', 'load', 0.2)
+    metrics.count_cache('figure_specs', hit=True)
+    metrics.count_cache('figure_specs', hit=False)
+    metrics.count_cache('figure_specs', hit=True)
+
+    text = metrics.to_prometheus()
+    labels = 'span="dashboard.load_prices",stage="load"'
+    assert f'stockdash_span_seconds_bucket{{{labels},le="0.001"}} 0' in text
+    assert f'stockdash_span_seconds_bucket{{{labels},le="0.005"}} 1' in text
+    assert f'stockdash_span_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'stockdash_span_seconds_count{{{labels}}} 2' in text
+    assert 'stockdash_cache_requests_total{cache="figure_specs",result="hit"} 2' in text
+
+    path = tmp_path / "metrics.json"
+    metrics.write(str(path))
+    exported = json.loads(path.read_text())
+    assert exported['caches']['figure_specs'] == {'hits': 2, 'misses': 1}
+    assert exported['spans'][0]['sum'] == pytest.approx(0.203)
+
+    frame = metrics.cache_frame()
+    assert frame.loc[0, 'Hit %'] == pytest.approx(200 / 3)
+
+
+def test_metrics_endpoint_serves_both_formats():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+
+    assert start_metrics_server(0) is None
+    server = start_metrics_server(port, host='127.0.0.1')
+    try:
+        instrumentation.get_metrics().count_cache('endpoint_test', hit=True)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert 'cache="endpoint_test",result="hit"' in response.read().decode()
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json", timeout=5) as response:
+            assert json.loads(response.read())['caches']['endpoint_test']['hits'] >= 1
+        assert start_metrics_server(port, host='127.0.0.1') is server
+    finally:
+        server.shutdown()
+        server.server_close()
+        instrumentation._server = None
+
+
+@patch("finaltest2.multiapp.render_dev_panel")
+@patch("finaltest2.multiapp.st")
+def test_multiapp_run_shows_the_rerun_trace(mock_st, mock_panel):
+    app = MultiApp()
+    app.add_app("Page", MagicMock())
+    mock_st.sidebar.selectbox.return_value = app.apps[0]
+
+    with patch("finaltest2.multiapp.DEV_PANEL", True):
+        app.run()
+
+    trace = mock_panel.call_args[0][0]
+    assert trace.page == "Page" and trace.duration is not None
+    assert trace.spans == []
+
+
+@patch("finaltest2.multiapp.export_metrics")
+@patch("finaltest2.multiapp.render_dev_panel")
+@patch("finaltest2.multiapp.st")
+def test_multiapp_run_reports_a_stopped_rerun(mock_st, mock_panel, mock_export):
+    from streamlit.runtime.scriptrunner.script_runner import StopException
+
+    app = MultiApp()
+    app.add_app("Stopped", MagicMock(side_effect=StopException()))
+    mock_st.sidebar.selectbox.return_value = app.apps[0]
+
+    with patch("finaltest2.multiapp.DEV_PANEL", True), pytest.raises(StopException):
+        app.run()
+
+    assert mock_panel.call_args[0][0].page == "Stopped"
+    mock_export.assert_called_once()
+
+    with patch("finaltest2.multiapp.DEV_PANEL", True), pytest.raises(StopException), \
+            patch("finaltest2.multiapp.trace_rerun", side_effect=StopException()):
+        app.run()
+    assert mock_panel.call_args[0][0] is None
+
+
+def test_dev_panel_without_a_trace_renders_nothing():
+    with patch("streamlit.sidebar") as mock_sidebar:
+        instrumentation.render_dev_panel(None)
+    mock_sidebar.expander.assert_not_called()
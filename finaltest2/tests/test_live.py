@@ -0,0 +1,154 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finaltest2.apps.indicators import compute_indicators
+from finaltest2.apps.live import (LiveSeries, ReplaySource, Tick, TickBuffer, load_ticks, make_quote_source,
+                                  render_live_panel)
+
+
+def make_history(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    dates = pd.date_range('2024-03-04 09:30', periods=n, freq='1min')
+    return pd.DataFrame({
+        'Date': dates, 'Open': close, 'High': close + 0.05, 'Low': close - 0.05,
+        'Close': close, 'Volume': np.full(n, 1000.0),
+    })
+
+
+def tick(seconds, price, volume=100.0, symbol='MSFT'):
+    return Tick(symbol, pd.Timestamp('2024-03-04 11:30') + pd.Timedelta(seconds=seconds), price, volume)
+
+
+def test_ticks_within_a_window_are_coalesced():
+    buffer = TickBuffer(window_seconds=1.0)
+    for i, price in enumerate([10.0, 12.0, 9.0, 11.0]):
+        assert buffer.put(tick(i * 0.2, price))
+    buffer.put(tick(1.5, 11.5))
+
+    batches = buffer.drain()['MSFT']
+    assert len(batches) == 2 and len(buffer) == 0
+    first = batches[0]
+    assert (first.open, first.high, first.low, first.close) == (10.0, 12.0, 9.0, 11.0)
+    assert first.volume == 400.0 and first.ticks == 4
+    assert buffer.stats['ticks'] == 5 and buffer.stats['coalesced'] == 3
+
+
+def test_full_buffer_merges_or_drops_instead_of_growing():
+    buffer = TickBuffer(capacity=2)
+    buffer.put(tick(0, 10.0))
+    buffer.put(tick(1, 11.0))
+    assert buffer.put(tick(2, 12.0))
+    assert not buffer.put(tick(2, 50.0, symbol='AAPL'))
+
+    batches = buffer.drain()['MSFT']
+    assert len(batches) == 2
+    assert batches[-1].close == 12.0 and batches[-1].volume == 200.0
+    assert buffer.stats['overflow_merged'] == 1 and buffer.stats['dropped'] == 1
+
+
+def test_blocking_put_waits_for_the_page_to_drain():
+    buffer = TickBuffer(capacity=1)
+    buffer.put(tick(0, 10.0))
+    accepted = []
+    producer = threading.Thread(target=lambda: accepted.append(buffer.put(tick(1, 11.0), timeout=None)))
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()
+
+    buffer.drain()
+    producer.join(1)
+    assert accepted == [True] and len(buffer) == 1
+
+
+def test_live_series_matches_a_full_recomputation():
+    history = make_history()
+    series = LiveSeries(history, interval='1m')
+    buffer = TickBuffer()
+    start = history['Date'].iloc[-1]
+    prices = history['Close'].iloc[-1] * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.001, 300)))
+    for i, price in enumerate(prices):
+        buffer.put(Tick('MSFT', start + pd.Timedelta(seconds=i * 0.7), price, 10.0))
+
+    update = series.apply(buffer.drain()['MSFT'])
+
+    frame = series.frame()
+    assert len(frame) == len(history) + 3
+    assert frame.index[-1] == start + pd.Timedelta(minutes=3)
+    assert len(update.closed) == 3 and update.current['Close'] == prices[-1]
+    expected = compute_indicators(frame.reset_index())
+    for column in ['MACD', 'Signal', 'RSI', 'EMA_20']:
+        np.testing.assert_allclose(frame[column].to_numpy(), expected[column].to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_late_quotes_are_ignored():
+    history = make_history(30)
+    series = LiveSeries(history, interval='1m')
+    late = TickBuffer()
+    late.put(Tick('MSFT', history['Date'].iloc[10], 1.0))
+
+    update = series.apply(late.drain()['MSFT'])
+    assert update.late == 1 and update.closed.empty
+    assert series.frame()['Close'].iloc[-1] == history['Close'].iloc[-1]
+
+
+def test_replay_from_file_feeds_the_buffer(tmp_path):
+    path = tmp_path / "ticks.csv"
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-03-04 09:30', periods=50, freq='500ms'),
+        'symbol': ['msft', 'aapl'] * 25,
+        'price': np.linspace(100, 101, 50),
+        'volume': 10,
+    }).to_csv(path, index=False)
+    assert list(load_ticks(str(path))['symbol'].unique()) == ['MSFT', 'AAPL']
+
+    buffer = TickBuffer(capacity=4)
+    before = pd.Timestamp.now()
+    source = ReplaySource.from_file(str(path), symbols=['MSFT'], speed=0).start(buffer)
+    received = []
+    while source.running or len(buffer):
+        received.extend(buffer.drain().get('MSFT', []))
+        time.sleep(0.01)
+    source.stop()
+
+    assert sum(batch.ticks for batch in received) == 25
+    assert received[0].start_ns >= before.value
+    assert received[-1].close == pytest.approx(np.linspace(100, 101, 50)[-2])
+    with pytest.raises(ValueError):
+        ReplaySource.from_file(str(path), symbols=['TSLA'])
+
+
+def test_make_quote_source_rejects_unknown_specs():
+    assert isinstance(make_quote_source('', 'MSFT', 100.0), ReplaySource)
+    with pytest.raises(ValueError):
+        make_quote_source('kafka://quotes', 'MSFT', 100.0)
+
+
+def test_indicator_charts_get_each_bar_once():
+    history = make_history()
+    ticks = pd.DataFrame({
+        'timestamp': history['Date'].iloc[-1] + pd.to_timedelta(np.arange(10, 150, 10), unit='s'),
+        'symbol': 'MSFT', 'price': np.linspace(100, 101, 14), 'volume': 10.0,
+    })
+    charts = []
+
+    def line_chart(data, height):
+        charts.append((data, MagicMock()))
+        return charts[-1][1]
+
+    with patch('finaltest2.apps.live.st') as mock_st:
+        mock_st.columns.return_value = [MagicMock() for _ in range(4)]
+        mock_st.line_chart.side_effect = line_chart
+        render_live_panel('MSFT', history, '1m', source=ReplaySource(ticks, speed=0, rebase=False),
+                          refresh_seconds=0.01, max_seconds=5)
+
+    seed, chart = charts[1]
+    added = [call.args[0] for call in chart.add_rows.call_args_list]
+    dates = pd.DatetimeIndex(list(seed.index) + [date for frame in added for date in frame.index])
+    assert dates.is_unique and dates.is_monotonic_increasing
+    assert dates[-1] == history['Date'].iloc[-1] + pd.Timedelta(minutes=1)
@@ -0,0 +1,149 @@
+import time
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from finaltest2.apps import market_data
+from finaltest2.apps.market_data import MarketDataService, MemoryBackend, DiskBackend, RedisBackend
+from finaltest2.apps.datastore import HistoryCache, PriceStore
+
+
+class StandInRedis:
+    """Minimal Redis stand-in with get/set(nx, ex)/delete semantics"""
+
+    def __init__(self):
+        self.values = {}
+        self.guard = threading.Lock()
+
+    def get(self, key):
+        item = self.values.get(key)
+        return item[1] if item and item[0] > time.time() else None
+
+    def set(self, key, value, nx=False, ex=None):
+        with self.guard:
+            if nx and self.get(key) is not None:
+                return None
+            self.values[key] = (time.time() + (ex or 1e9), value)
+            return True
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture(params=['memory', 'disk', 'redis'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBackend()
+    if request.param == 'disk':
+        return DiskBackend(root=str(tmp_path))
+    return RedisBackend(client=StandInRedis())
+
+
+def test_values_are_cached_across_calls(backend):
+    service = MarketDataService(backend)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return pd.DataFrame({'Headlines': ['a', 'b']})
+
+    first = service.get_or_fetch("news", fetch, ttl=60)
+    second = service.get_or_fetch("news", fetch, ttl=60)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+@pytest.mark.parametrize('make_backend', [MemoryBackend, lambda: DiskBackend(root=None)])
+def test_expired_values_are_refetched(make_backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(market_data, "DATA_DIR", str(tmp_path))
+    service = MarketDataService(make_backend())
+    calls = []
+
+    service.get_or_fetch("short", lambda: calls.append(1) or 1, ttl=-1)
+    service.get_or_fetch("short", lambda: calls.append(1) or 1, ttl=-1)
+    assert len(calls) == 2
+
+
+def test_none_results_are_not_cached_and_rejected_values_are_refetched(backend):
+    service = MarketDataService(backend)
+    assert service.get_or_fetch("empty", lambda: None, ttl=60) is None
+    assert service.get_or_fetch("empty", lambda: 1, ttl=60) == 1
+
+    service.get_or_fetch("history", lambda: ("short", "2020-01-01"), ttl=60)
+    value = service.get_or_fetch("history", lambda: ("long", "2015-01-01"), ttl=60,
+                                 accept=lambda v: v[1] <= "2015-01-01")
+    assert value == ("long", "2015-01-01")
+
+
+def test_concurrent_misses_share_one_fetch_across_replicas(tmp_path, monkeypatch):
+    monkeypatch.setattr(market_data, "FETCH_POLL_INTERVAL", 0.01)
+    shared = StandInRedis()
+    replicas = [MarketDataService(RedisBackend(client=shared)) for _ in range(3)]
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return "prices"
+
+    results = []
+    threads = [threading.Thread(target=lambda s=s: results.append(s.get_or_fetch("prices:GOOG", fetch, ttl=60)))
+               for s in replicas for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["prices"] * 12
+
+
+def test_stale_disk_locks_are_taken_over(tmp_path):
+    backend = DiskBackend(root=str(tmp_path))
+    assert backend.acquire("key", ttl=60)
+    assert not backend.acquire("key", ttl=60)
+    assert backend.acquire("key", ttl=-1)
+    backend.release("key")
+    assert backend.acquire("key", ttl=60)
+
+
+def test_memory_backend_drops_expired_values(monkeypatch):
+    monkeypatch.setattr(market_data, "MEMORY_SWEEP_INTERVAL", 0.0)
+    backend = MemoryBackend()
+    backend.set("old", 1, ttl=-1)
+    backend.set("gone", 2, ttl=-1)
+    assert backend.get("old") is None and "old" not in backend._values
+
+    backend.set("new", 3, ttl=60)
+    assert list(backend._values) == ["new"]
+
+
+def fake_batch_download(tickers, start=None, **kwargs):
+    index = pd.bdate_range(start, "2024-02-29", name='Date')
+    close = np.linspace(100, 200, len(index))
+    bars = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Adj Close': close, 'Volume': np.full(len(index), 1000)}, index=index)
+    return pd.concat({ticker: bars for ticker in tickers}, axis=1)
+
+
+def test_universe_is_shared_per_ticker_and_held_once(tmp_path):
+    store = PriceStore(root=str(tmp_path), history_start="2024-01-01")
+    backend = MemoryBackend()
+    cache = HistoryCache(store, service=MarketDataService(backend))
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_batch_download) as mock_download:
+        histories = cache.load_many(["GOOG", "MSFT"])
+    mock_download.assert_called_once()
+
+    # The service and the cache hold the same frame, under one key per ticker
+    assert sorted(key for key in backend._values if key.startswith("prices:")) == ["prices:GOOG", "prices:MSFT"]
+    assert backend.get("prices:GOOG")[0] is histories["GOOG"]
+    assert "Date" in histories["GOOG"] and len(histories["GOOG"]) == len(store.read("GOOG"))
+
+    # Another replica reads the tickers it lacks one by one and only downloads the new one
+    replica = HistoryCache(store, service=MarketDataService(backend))
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_batch_download) as mock_download:
+        shared = replica.load_many(["GOOG", "MSFT", "TSLA"])
+    assert mock_download.call_args.args[0] == ["TSLA"]
+    assert shared["MSFT"] is histories["MSFT"] and set(shared) == {"GOOG", "MSFT", "TSLA"}
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from finaltest2.apps.datastore import HistoryCache, PriceStore
+from finaltest2.apps.financeDashboard import (
+    calculate_macd, calculate_rsi, plot_candlestick, plot_macd_subplot, plot_rsi_subplot,
+)
+from finaltest2.apps.mmap_store import MmapPriceStore, PriceArrays
+from finaltest2.tests.test_datastore import fake_download, make_bars
+
+
+@pytest.fixture
+def mmap_store(tmp_path):
+    return MmapPriceStore(str(tmp_path))
+
+
+def test_written_history_maps_back_read_only(mmap_store):
+    history = make_bars("2024-01-01", "2024-03-01")
+    header = mmap_store.write("GOOG", history, covered_from="2024-01-01")
+    arrays, _ = mmap_store.open("GOOG")
+
+    assert header["rows"] == len(history) == len(arrays)
+    np.testing.assert_array_equal(arrays['Date'], history.index.to_numpy())
+    np.testing.assert_array_equal(arrays['Close'], history['Close'].to_numpy())
+    assert arrays['Volume'].dtype == np.int64
+    assert not arrays['Close'].flags.writeable
+
+
+def test_rewrites_replace_the_file_without_breaking_open_mappings(mmap_store):
+    old = mmap_store.write("BRK", make_bars("2024-01-01", "2024-02-01"), "2024-01-01")
+    mmap_store.write("BRK-B", make_bars("2024-01-01", "2024-02-01"), "2024-01-01")
+    before, _ = mmap_store.open("BRK")
+
+    mmap_store.write("BRK", make_bars("2024-01-01", "2024-03-01"), "2024-01-01")
+    after, header = mmap_store.open("BRK")
+
+    assert header["file"] != old["file"]
+    assert len(after) > len(before) and before['Close'][0] == after['Close'][0]
+    assert mmap_store.open("BRK-B") is not None
+
+
+def test_ranges_are_zero_copy_views(mmap_store):
+    mmap_store.write("GOOG", make_bars("2024-01-01", "2024-03-01"), "2024-01-01")
+    arrays, _ = mmap_store.open("GOOG")
+    january = arrays.get_range("2024-01-01", "2024-02-01")
+
+    assert len(january) == len(pd.bdate_range("2024-01-01", "2024-01-31"))
+    assert np.shares_memory(january['Close'], arrays['Close'])
+    assert np.shares_memory(january.to_frame()['Close'].to_numpy(), arrays['Close'])
+
+
+def test_indicators_and_plots_accept_price_arrays(mmap_store):
+    history = make_bars("2023-01-01", "2024-03-01")
+    mmap_store.write("GOOG", history, "2023-01-01")
+    arrays, _ = mmap_store.open("GOOG")
+
+    reference = calculate_rsi(calculate_macd(history.reset_index()))
+    computed = calculate_rsi(calculate_macd(arrays.slice(0, len(arrays))))
+    for column in ['MACD', 'Signal', 'Histogram', 'RSI']:
+        np.testing.assert_allclose(computed[column], reference[column].to_numpy(), equal_nan=True)
+    assert 'MACD' not in arrays
+
+    candles = plot_candlestick(arrays, 'GOOG', max_points=50)
+    assert len(candles.data[0].x) <= 50
+    assert len(plot_macd_subplot(computed).data) == 3
+    assert len(plot_rsi_subplot(computed).data[0].x) == len(arrays) - 30
+
+
+def test_price_arrays_reject_misaligned_columns():
+    arrays = PriceArrays({'Close': np.arange(3.0)})
+    with pytest.raises(ValueError):
+        arrays['RSI'] = np.arange(4.0)
+
+
+def test_history_cache_serves_mapped_ranges_across_processes(tmp_path):
+    store = PriceStore(root=str(tmp_path), history_start="2024-01-01")
+    first = HistoryCache(store, mmap_store=MmapPriceStore(str(tmp_path)))
+    with patch('finaltest2.apps.datastore.yf.download', side_effect=fake_download):
+        data = first.get_range("GOOG", "2024-01-10", "2024-02-01")
+
+    # Another process: maps the column file written by the first one without reading the store
+    second = HistoryCache(store, mmap_store=MmapPriceStore(str(tmp_path)))
+    with patch.object(store, 'update') as mock_update:
+        other = second.get_range("GOOG", "2024-01-10", "2024-02-01")
+    mock_update.assert_not_called()
+
+    pd.testing.assert_frame_equal(data, other)
+    assert isinstance(np.asarray(other['Close']).base, np.ndarray)
+    assert not other['Close'].to_numpy().flags.writeable
+    report = second.memory_report()
+    assert bool(report['mapped'].iloc[0])
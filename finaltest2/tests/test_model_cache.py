@@ -0,0 +1,45 @@
+import pandas as pd
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from finaltest2.apps.model_cache import ProphetModelCache, ModelKey, get_or_fit_model
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(1)
+    dates = pd.bdate_range('2022-01-03', periods=120)
+    return pd.DataFrame({'Date': dates, 'Close': 100 + np.cumsum(rng.normal(0, 1, len(dates)))})
+
+
+def test_fitted_model_is_reused_from_disk(tmp_path, history):
+    cache = ProphetModelCache(root=str(tmp_path))
+    model = get_or_fit_model("GOOG", history, cache=cache)
+
+    fresh_cache = ProphetModelCache(root=str(tmp_path))
+    with patch('finaltest2.apps.model_cache.fit_prophet_model') as mock_fit:
+        reused = get_or_fit_model("GOOG", history, cache=fresh_cache)
+
+    mock_fit.assert_not_called()
+    future = reused.make_future_dataframe(periods=10)
+    np.testing.assert_allclose(reused.predict(future)['trend'], model.predict(future)['trend'])
+
+
+def test_new_bar_warm_starts_from_previous_model(tmp_path, history):
+    cache = ProphetModelCache(root=str(tmp_path))
+    get_or_fit_model("GOOG", history.iloc[:-1], cache=cache)
+
+    with patch('finaltest2.apps.model_cache.fit_prophet_model') as mock_fit, patch.object(cache, 'put'):
+        get_or_fit_model("GOOG", history, cache=cache)
+
+    init = mock_fit.call_args.kwargs['init']
+    assert set(init) == {'k', 'm', 'sigma_obs', 'delta', 'beta'}
+
+
+def test_seasonality_flags_are_part_of_the_key(tmp_path):
+    cache = ProphetModelCache(root=str(tmp_path))
+    key = ModelKey("GOOG", "2024-01-02", True, True)
+
+    assert cache.get(key) is None
+    assert key.filename != key._replace(weekly_seasonality=False).filename
@@ -1,7 +1,8 @@
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 
-from finaltest2.multiapp import MultiApp
+from finaltest2.multiapp import MultiApp, LazyPage
 
 def test_multiapp_init():
     app = MultiApp()
@@ -48,3 +49,20 @@ def test_multiapp_run(mock_sidebar):
     # Verify the selected app's function was called
     mock_func1.assert_not_called()
     mock_func2.assert_called_once()
+
+def test_multiapp_add_app_lazy_module():
+    app = MultiApp()
+
+    app.add_app("Lazy", "json:dumps")
+
+    page = app.apps[0]["function"]
+    assert isinstance(page, LazyPage)
+    assert page._func is None
+    assert page.resolve() is json.dumps
+
+def test_multiapp_lazy_module_defaults_to_app_function():
+    page = LazyPage("finaltest2.apps.fast_forecast")
+    assert (page.module_name, page.attr) == ("finaltest2.apps.fast_forecast", "app")
+
+    with pytest.raises(ValueError):
+        MultiApp().add_app("Bad", "not a module")
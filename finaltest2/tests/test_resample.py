@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finaltest2.apps.downsample import downsample_ohlcv
+from finaltest2.apps.resample import bucket_starts, coarser_intervals, resample_bars
+
+
+def make_minute_bars(days=5, start='2024-03-04', open_time='09:30', seed=0):
+    """One-minute bars for `days` 390-minute sessions"""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range(start, periods=days)
+    dates = np.concatenate([
+        pd.date_range(f"{day:%Y-%m-%d} {open_time}", periods=390, freq='1min').to_numpy() for day in sessions
+    ])
+    n = len(dates)
+    close = 100 + np.cumsum(rng.normal(0, 0.05, n))
+    open_ = close + rng.normal(0, 0.02, n)
+    return pd.DataFrame({
+        'Date': dates,
+        'Open': open_,
+        'High': np.maximum(open_, close) + 0.01,
+        'Low': np.minimum(open_, close) - 0.01,
+        'Close': close,
+        'Volume': rng.integers(100, 10_000, n),
+    })
+
+
+def test_hourly_buckets_start_at_the_session_open():
+    bars = make_minute_bars(days=2)
+    hourly = resample_bars(bars, '1h')
+
+    # 09:30 .. 15:30 per session, the last one holding 30 minutes
+    assert len(hourly) == 14
+    assert hourly['Date'].iloc[0] == pd.Timestamp('2024-03-04 09:30')
+    assert hourly['Date'].iloc[6] == pd.Timestamp('2024-03-04 15:30')
+
+    first = bars.iloc[:60]
+    row = hourly.iloc[0]
+    assert row['Open'] == first['Open'].iloc[0]
+    assert row['High'] == first['High'].max()
+    assert row['Low'] == first['Low'].min()
+    assert row['Close'] == first['Close'].iloc[-1]
+    assert row['Volume'] == first['Volume'].sum()
+    assert hourly['Volume'].sum() == bars['Volume'].sum()
+
+
+def test_chained_resampling_matches_direct_resampling():
+    bars = make_minute_bars(days=3, open_time='09:15')
+
+    chained = resample_bars(resample_bars(resample_bars(bars, '5m'), '15m'), '1h')
+    direct = resample_bars(bars, '1h')
+
+    pd.testing.assert_frame_equal(chained, direct)
+    daily = resample_bars(direct, '1d')
+    assert list(daily['Date']) == list(pd.bdate_range('2024-03-04', periods=3))
+
+
+def test_weeks_start_on_monday_and_months_on_the_first():
+    dates = pd.to_datetime(['2024-02-28', '2024-03-01', '2024-03-04', '2024-03-10']).to_numpy()
+
+    weeks = bucket_starts(dates, '1wk').astype('datetime64[ns]')
+    months = bucket_starts(dates, '1mo').astype('datetime64[ns]')
+
+    assert list(pd.DatetimeIndex(weeks).strftime('%Y-%m-%d')) == ['2024-02-26', '2024-02-26', '2024-03-04', '2024-03-04']
+    assert list(pd.DatetimeIndex(months).strftime('%Y-%m-%d')) == ['2024-02-01', '2024-03-01', '2024-03-01', '2024-03-01']
+
+
+def test_unknown_interval_raises():
+    with pytest.raises(ValueError):
+        coarser_intervals('3m')
+    with pytest.raises(ValueError):
+        resample_bars(make_minute_bars(days=1), '2h')
+
+
+def test_a_week_of_minute_bars_is_drawn_as_the_finest_candles_within_budget():
+    bars = make_minute_bars(days=5)
+
+    candles, label = downsample_ohlcv(bars, 800, interval='1m')
+    assert label == '5-Minute' and len(candles) == 5 * 78
+    candles, label = downsample_ohlcv(bars, 60, interval='1m')
+    assert label == 'Hourly' and len(candles) == 5 * 7
+    assert downsample_ohlcv(bars, None, interval='1m')[1] == '1-Minute'
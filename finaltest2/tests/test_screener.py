@@ -0,0 +1,81 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finaltest2.apps.indicators import compute_indicators, DEFAULT_INDICATORS
+from finaltest2.apps.screener import align_closes, apply_signals, read_universe, screen, screen_histories
+
+
+def history(close, start='2024-01-01'):
+    index = pd.bdate_range(start, periods=len(close), name='Date')
+    return pd.DataFrame({'Close': np.asarray(close, dtype=float)}, index=index)
+
+
+def test_read_universe_normalizes_symbols():
+    csv = io.StringIO("Name,Symbol\nApple,aapl\nBerkshire,BRK.B\nApple again,AAPL\nBlank,\n")
+    assert read_universe(csv) == ['AAPL', 'BRK-B']
+    assert read_universe(io.StringIO("code\nMSFT\n")) == ['MSFT']
+    with pytest.raises(ValueError):
+        read_universe(io.StringIO("Symbol\n\n"))
+
+
+def test_align_closes_leaves_gaps_unfilled():
+    full = history([1, 2, 3, 4, 5])
+    gappy = full.drop(full.index[2]).assign(Close=[10, 20, 40, 50])
+    late = full.iloc[3:].assign(Close=[7, 8])
+    dates, tickers, close = align_closes({'A': full, 'B': gappy, 'C': late, 'EMPTY': full.iloc[:0]})
+
+    assert tickers == ['A', 'B', 'C']
+    assert len(dates) == 5
+    np.testing.assert_array_equal(close[:, 1], [10, 20, np.nan, 40, 50])
+    np.testing.assert_array_equal(close[:, 2], [np.nan, np.nan, np.nan, 7, 8])
+
+
+def test_screen_matches_single_ticker_indicators():
+    rng = np.random.default_rng(0)
+    histories = {f'T{i}': history(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))) for i in range(5)}
+    results = screen_histories(histories).set_index('Ticker')
+
+    for ticker, frame in histories.items():
+        expected = compute_indicators(frame, DEFAULT_INDICATORS).iloc[-1]
+        assert results.loc[ticker, 'RSI'] == pytest.approx(expected['RSI'])
+        assert results.loc[ticker, 'MACD'] == pytest.approx(expected['MACD'])
+        assert results.loc[ticker, 'EMA_200'] == pytest.approx(expected['EMA_200'])
+
+
+def test_mixed_calendars_are_screened_on_their_own_bars():
+    rng = np.random.default_rng(1)
+    us = history(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400))))
+    # Another exchange: closed on different days, and its last bar is a day older
+    india = history(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400))), start='2023-12-29')
+    india = india.drop(india.index[5::7])
+    histories = {'US': us, 'US2': us.assign(Close=us['Close'] * 2), '^NSEI': india}
+    results = screen_histories(histories).set_index('Ticker')
+
+    for ticker, frame in histories.items():
+        expected = compute_indicators(frame, DEFAULT_INDICATORS)
+        assert results.loc[ticker, 'Close'] == frame['Close'].iloc[-1]
+        assert results.loc[ticker, 'Change %'] == pytest.approx(frame['Close'].pct_change().iloc[-1] * 100)
+        assert results.loc[ticker, 'RSI'] == pytest.approx(expected['RSI'].iloc[-1])
+        assert results.loc[ticker, 'Histogram'] == pytest.approx(expected['Histogram'].iloc[-1])
+
+
+def test_cross_signals_fire_only_on_the_crossing_day():
+    falling_then_jump = np.r_[np.linspace(200, 100, 300), 130.0]
+    steady = np.linspace(100, 200, 301)
+    dates, tickers, close = align_closes({'JUMP': history(falling_then_jump), 'STEADY': history(steady)})
+    results = screen(dates, tickers, close).set_index('Ticker')
+
+    assert results.loc['JUMP', 'MACD Bullish Cross']
+    assert not results.loc['STEADY', 'MACD Bullish Cross']
+    assert not results[['MACD Bearish Cross', 'Golden Cross', 'Death Cross']].any().any()
+
+    crossed = apply_signals(results.reset_index(), ['MACD bullish cross today'])
+    assert crossed['Ticker'].tolist() == ['JUMP']
+    assert len(apply_signals(results.reset_index(), [])) == 2
+
+
+def test_screen_of_an_empty_universe():
+    assert screen_histories({}).empty
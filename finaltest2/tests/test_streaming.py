@@ -0,0 +1,128 @@
+import os
+import pandas as pd
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from finaltest2.apps.financeDashboard import calculate_macd, calculate_rsi
+from finaltest2.apps.datastore import PriceStore
+from finaltest2.apps.streaming import IndicatorState, IndicatorLedger
+from finaltest2.apps.indicators import macd, rsi, ema
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))
+    return pd.DataFrame({'Date': pd.bdate_range('2021-01-01', periods=400), 'Close': close})
+
+
+def reference(history):
+    return calculate_rsi(calculate_macd(history.copy()))
+
+
+def test_chunked_updates_match_reference(history):
+    state = IndicatorState([macd(), rsi()])
+    chunks = [state.update(part) for part in np.array_split(history['Close'].to_numpy(), 7)]
+    result = {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+
+    expected = reference(history)
+    for column in ['MACD', 'Signal', 'Histogram', 'RSI']:
+        np.testing.assert_allclose(result[column], expected[column], rtol=1e-9, atol=1e-9)
+
+
+def test_state_round_trips_through_dict(history):
+    close = history['Close'].to_numpy()
+    state = IndicatorState([macd(), rsi(), ema(50)])
+    state.update(close[:300])
+
+    restored = IndicatorState.from_dict(state.to_dict())
+    resumed = restored.update(close[300:])
+    continued = state.update(close[300:])
+
+    for column in continued:
+        np.testing.assert_allclose(resumed[column], continued[column])
+
+
+def test_ledger_processes_only_new_bars(tmp_path, history):
+    store = PriceStore(root=str(tmp_path))
+    ledger = IndicatorLedger(store, [macd(), rsi()])
+    ledger.sync("GOOG", history.iloc[:350])
+
+    # A fresh ledger resumes from disk; the provisional last bar was revised
+    revised = history.copy()
+    revised.loc[349, 'Close'] += 5
+    resumed = IndicatorLedger(store, [macd(), rsi()])
+    with patch('finaltest2.apps.streaming.IndicatorState.update', autospec=True,
+               side_effect=IndicatorState.update) as mock_update:
+        series = resumed.sync("GOOG", revised)
+
+    processed = sum(len(call.args[1]) for call in mock_update.call_args_list)
+    assert processed == 51
+
+    expected = reference(revised)
+    for column in ['MACD', 'Signal', 'Histogram', 'RSI']:
+        np.testing.assert_allclose(series[column].to_numpy(), expected[column], rtol=1e-9, atol=1e-9)
+
+
+def test_ledger_rebuilds_when_history_is_rewritten(tmp_path, history):
+    store = PriceStore(root=str(tmp_path))
+    ledger = IndicatorLedger(store, [rsi()])
+    ledger.sync("GOOG", history.iloc[100:])
+
+    series = ledger.sync("GOOG", history)
+
+    assert len(series) == len(history)
+    np.testing.assert_allclose(series['RSI'].to_numpy(), reference(history)['RSI'], rtol=1e-9)
+
+
+def test_ledger_appends_only_new_rows_and_resumes_after_restart(tmp_path, history):
+    store = PriceStore(root=str(tmp_path))
+    ledger = IndicatorLedger(store, [macd(), rsi()])
+    for end in range(350, 356):
+        ledger.sync("GOOG", history.iloc[:end])
+
+    segment_dir, _ = ledger._paths("GOOG")
+    segments = sorted(name for name in os.listdir(segment_dir) if name.endswith('.parquet'))
+    assert len(segments) == 6
+    # Each append rewrites the previously provisional bar and adds the new one
+    assert len(pd.read_parquet(os.path.join(segment_dir, segments[-1]))) == 2
+
+    resumed = IndicatorLedger(store, [macd(), rsi()])
+    with patch('finaltest2.apps.streaming.IndicatorState.update', autospec=True,
+               side_effect=IndicatorState.update) as mock_update:
+        series = resumed.sync("GOOG", history.iloc[:355])
+    mock_update.assert_not_called()
+
+    expected = reference(history.iloc[:355])
+    for column in ['MACD', 'Signal', 'Histogram', 'RSI']:
+        np.testing.assert_allclose(series[column].to_numpy(), expected[column], rtol=1e-9, atol=1e-9)
+
+
+def test_ledger_compacts_its_segments(tmp_path, history):
+    store = PriceStore(root=str(tmp_path))
+    ledger = IndicatorLedger(store, [rsi()])
+    with patch('finaltest2.apps.streaming.LEDGER_MAX_SEGMENTS', 3):
+        for end in range(350, 355):
+            ledger.sync("GOOG", history.iloc[:end])
+
+    segment_dir, _ = ledger._paths("GOOG")
+    assert len([name for name in os.listdir(segment_dir) if name.endswith('.parquet')]) == 2
+    series = IndicatorLedger(store, [rsi()]).sync("GOOG", history.iloc[:354])
+    np.testing.assert_allclose(series['RSI'].to_numpy(), reference(history.iloc[:354])['RSI'], rtol=1e-9)
+
+
+def test_ledgers_of_several_processes_take_turns(tmp_path, history):
+    store = PriceStore(root=str(tmp_path))
+    first, second = IndicatorLedger(store, [rsi()]), IndicatorLedger(store, [rsi()])
+    with patch('finaltest2.apps.streaming.LEDGER_MAX_SEGMENTS', 3):
+        # The second process compacts while the first still holds the segments it last saw
+        for ledger, end in zip([first, first, second, second, first], range(353, 358)):
+            ledger.sync("GOOG", history.iloc[:end])
+
+    # The committed state still points at existing segments, so nothing is recomputed
+    with patch('finaltest2.apps.streaming.IndicatorState.update', autospec=True,
+               side_effect=IndicatorState.update) as mock_update:
+        series = IndicatorLedger(store, [rsi()]).sync("GOOG", history.iloc[:357])
+    mock_update.assert_not_called()
+    np.testing.assert_allclose(series['RSI'].to_numpy(), reference(history.iloc[:357])['RSI'], rtol=1e-9)
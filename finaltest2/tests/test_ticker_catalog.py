@@ -0,0 +1,101 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from finaltest2.apps.ticker_catalog import TickerCatalog, load_catalog
+
+LISTING = [
+    ('A', 'Agilent Technologies Inc.'),
+    ('AA', 'Alcoa Corp.'),
+    ('AAPL', 'Apple Inc.'),
+    ('APLE', 'Apple Hospitality REIT'),
+    ('MSFT', 'Microsoft Corporation'),
+    ('MU', 'Micron Technology'),
+    ('NESN', 'Nestlé S.A.'),
+    ('GOOG', 'Alphabet Inc. (Google)'),
+]
+
+
+@pytest.fixture
+def catalog():
+    symbols, names = zip(*LISTING)
+    return TickerCatalog.build(symbols, names)
+
+
+def test_ranking_exact_then_symbol_prefix_then_name_prefix_then_substring(catalog):
+    assert catalog.search('a')[:3] == ['A', 'AA', 'AAPL']
+    assert catalog.search('apple') == ['AAPL', 'APLE']
+    assert catalog.search('APL') == ['APLE', 'AAPL']
+    assert catalog.search('google') == ['GOOG']
+    assert catalog.search('technolog') == ['MU', 'A']
+    assert catalog.search('zzz') == [] and catalog.search('  ') == []
+
+
+def test_search_limit_and_unicode_names(catalog):
+    assert len(catalog.search('a', limit=2)) == 2
+    assert catalog.search('nestlé') == ['NESN']
+    assert catalog.label('nesn') == 'Nestlé S.A. (NESN)'
+    assert catalog.label('UNKNOWN') == 'UNKNOWN'
+    assert 'msft' in catalog and 'MS' not in catalog
+
+
+def test_long_queries_do_not_match_shorter_keys(catalog):
+    assert catalog.search('microsoft corporation of america') == []
+    assert catalog.lookup('AAPLX') is None
+
+
+def test_compact_index_round_trip(catalog, tmp_path):
+    path = str(tmp_path / 'catalog.npz')
+    catalog.save(path)
+    loaded = TickerCatalog.load(path)
+    assert len(loaded) == len(catalog)
+    assert loaded.search('micro') == catalog.search('micro') == ['MU', 'MSFT']
+    assert loaded.symbols.dtype.kind == 'S'
+
+
+def test_load_catalog_rebuilds_only_when_the_listing_changes(tmp_path):
+    listing, index = str(tmp_path / 'listing.csv'), str(tmp_path / 'catalog.npz')
+    with open(listing, 'w') as f:
+        f.write("Symbol,Security Name,Exchange\nIBM,International Business Machines,NYSE\n")
+
+    assert load_catalog(listing, index).search('ibm') == ['IBM']
+    with patch.object(TickerCatalog, 'from_listing') as mock_build:
+        assert load_catalog(listing, index).name('IBM') == 'International Business Machines'
+    mock_build.assert_not_called()
+
+    with open(listing, 'a') as f:
+        f.write("ORCL,Oracle Corporation,NYSE\n")
+    os.utime(listing, (os.path.getmtime(index) + 10,) * 2)
+    assert load_catalog(listing, index).search('oracle') == ['ORCL']
+
+    assert 'AAPL' in load_catalog(str(tmp_path / 'missing.csv'), index)
+
+
+def test_ticker_selection_searches_the_catalog(catalog):
+    from finaltest2.apps import utils
+
+    st = MagicMock()
+    st.text_input.return_value = 'micro'
+    st.selectbox.side_effect = lambda label, options, **kwargs: options[0]
+    with patch.object(utils, 'st', st), patch.object(utils, 'get_ticker_catalog', return_value=catalog):
+        assert utils.get_ticker_selection() == 'MU'
+        options = st.selectbox.call_args.args[1]
+        assert options == ['MU', 'MSFT', 'MICRO']
+        format_func = st.selectbox.call_args.kwargs['format_func']
+        assert format_func('MICRO') == 'MICRO (unlisted, load as typed)'
+
+        # A typo matching nothing is offered after the defaults, never preselected
+        st.text_input.return_value = 'msftt'
+        assert utils.get_ticker_selection() == 'GOOG'
+        assert st.selectbox.call_args.args[1] == list(utils.STOCK_TICKER_MAP.values()) + ['MSFTT']
+        st.warning.assert_called_once()
+
+        st.text_input.return_value = 'not a ticker!'
+        utils.get_ticker_selection()
+        assert st.selectbox.call_args.args[1] == list(utils.STOCK_TICKER_MAP.values())
+
+        st.text_input.return_value = ''
+        utils.get_ticker_selection()
+        assert st.selectbox.call_args.args[1] == list(utils.STOCK_TICKER_MAP.values())